@@ -0,0 +1 @@
+# Benchmark suites; run with `python -m benchmarks.<suite>` from the repo root.
@@ -0,0 +1,119 @@
+# common.py
+# Shared helpers for the benchmark suites: synthetic inputs, percentiles,
+# peak RSS, JSON reports and baseline comparison.
+import json
+import math
+import os
+import platform
+import resource
+import sys
+from typing import Dict, Iterable, List
+
+# How much worse than the baseline a number may get before the run fails
+DEFAULT_TOLERANCE = 0.25
+
+
+def synthetic_urls(n: int, orgs: int = 50) -> List[str]:
+    """
+    n model URLs in URL-file order. Every 10th model is preceded by a dataset
+    and a GitHub line, like the hand-written urls.txt.
+    """
+    lines = []
+    for i in range(n):
+        org = f"bench-org{i % orgs}"
+        if i % 10 == 0:
+            lines.append(f"https://huggingface.co/datasets/{org}/data-{i},https://github.com/{org}/repo-{i},"
+                         f"https://huggingface.co/{org}/model-{i}")
+        else:
+            lines.append(f",,https://huggingface.co/{org}/model-{i}")
+    return lines
+
+
+def write_url_file(path: str, n: int) -> str:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(synthetic_urls(n)) + "\n")
+    return path
+
+
+def percentile(values: Iterable[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0..100); 0.0 for no values."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return float(ordered[rank - 1])
+
+
+def summarize(values: Iterable[float]) -> Dict[str, float]:
+    values = list(values)
+    return {
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": float(max(values)) if values else 0.0,
+    }
+
+
+def rss_mb(maxrss: int) -> float:
+    """ru_maxrss in MB (Linux reports KB, macOS bytes)."""
+    return round(maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def peak_rss_mb() -> float:
+    return rss_mb(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def save_report(report: dict, path: str):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(json.dumps(report, indent=2, sort_keys=True) + "\n")
+
+
+def write_report(report: dict, path: str = None):
+    """Print the report to stdout, and save it to path when given."""
+    if path:
+        save_report(report, path)
+    print(json.dumps(report, indent=2, sort_keys=True))
+
+
+def load_baseline(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], checks: Dict[str, str],
+            tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """
+    Regressions of results against baseline, one message each.
+    checks maps a dotted metric path to "higher" (bigger is better) or "lower".
+    Scenarios or metrics missing from either side are skipped.
+    """
+    regressions = []
+    for scenario, result in results.items():
+        base = baseline.get(scenario)
+        if base is None:
+            continue
+        for path, better in checks.items():
+            now, then = _lookup(result, path), _lookup(base, path)
+            if now is None or then is None or then == 0:
+                continue
+            if better == "higher" and now < then * (1 - tolerance):
+                regressions.append(f"{scenario} {path}: {now} < baseline {then} (-{tolerance:.0%} allowed)")
+            elif better == "lower" and now > then * (1 + tolerance):
+                regressions.append(f"{scenario} {path}: {now} > baseline {then} (+{tolerance:.0%} allowed)")
+    return regressions
+
+
+def _lookup(obj, path: str):
+    for part in path.split("."):
+        if not isinstance(obj, dict) or part not in obj:
+            return None
+        obj = obj[part]
+    return obj
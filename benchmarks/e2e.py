@@ -0,0 +1,179 @@
+# e2e.py
+# End-to-end benchmark of the batch scoring path against the local stub server.
+#
+# For every size it scores a synthetic URL file twice:
+#   scorecard-N  in-process, through batch_runner / ScoreCard
+#   cli-N        as a subprocess running `python -m src.run FILE`, like ./run
+# and reports models/sec, per-metric latency percentiles (from the *_latency
+# fields of the NDJSON), HTTP calls per route (counted by the stub) and peak RSS.
+#
+#   python -m benchmarks.e2e                                   # 10 and 1000 models
+#   python -m benchmarks.e2e --sizes 10 1000 10000 --out report.json
+#   python -m benchmarks.e2e --baseline benchmarks/baseline.json   # exit 1 on regression
+#   python -m benchmarks.e2e --write-baseline benchmarks/baseline.json
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+
+from benchmarks.common import (DEFAULT_TOLERANCE, compare, environment, load_baseline, peak_rss_mb,
+                               rss_mb, save_report, summarize, write_report, write_url_file)
+
+DEFAULT_SIZES = [10, 1000]
+DEFAULT_JOBS = 16
+# Smaller runs are reported but too noisy to fail a build on
+MIN_GATED_MODELS = 100
+
+# The stub has no rate limits to respect and the caches would hide the work being measured
+BENCH_ENV = {
+    "GEN_AI_STUDIO_API_KEY": "stub",
+    "HTTP_CACHE": "",
+    "LLM_CACHE": "",
+    "LLM_RPM": "0",
+    "LLM_MAX_CONCURRENCY": "64",
+    "LOG_LEVEL": "0",
+}
+
+# dotted report path -> which direction is better
+CHECKS = {
+    "models_per_sec": "higher",
+    "latency_ms.net_score.p95": "lower",
+    "http_calls_per_model": "lower",
+    "peak_rss_mb": "lower",
+}
+
+
+def _result(lines, seconds: float, calls: Counter, rss: float) -> dict:
+    latencies = defaultdict(list)
+    models = 0
+    for line in lines:
+        record = json.loads(line)
+        models += 1
+        for key, value in record.items():
+            if key.endswith("_latency"):
+                latencies[key[:-len("_latency")]].append(value)
+    total = sum(calls.values())
+    return {
+        "models": models,
+        "seconds": round(seconds, 3),
+        "models_per_sec": round(models / seconds, 2) if seconds else 0.0,
+        "latency_ms": {metric: summarize(values) for metric, values in sorted(latencies.items())},
+        "http_calls": dict(sorted(calls.items()), total=total),
+        "http_calls_per_model": round(total / models, 2) if models else 0.0,
+        "peak_rss_mb": rss,
+    }
+
+
+def _reset_caches():
+    from src.utils import llm_cache
+    from src.utils.hf_api import METADATA_CACHE
+
+    METADATA_CACHE.clear()
+    llm_cache.get_cache().clear()
+
+
+def run_scorecard(server, urlFile: str, jobs: int) -> dict:
+    from src.utils.batch_runner import iter_models, iter_urls, open_url_file, run_ordered
+
+    _reset_caches()
+    before = Counter(server.counts)
+    lines, failures = [], 0
+    start = time.perf_counter()
+    with open_url_file(urlFile) as stream:
+        for _url, result in run_ordered(iter_models(iter_urls(stream)), jobs=jobs):
+            try:
+                lines.append(result.result())
+            except (Exception, SystemExit):
+                failures += 1
+    seconds = time.perf_counter() - start
+    report = _result(lines, seconds, Counter(server.counts) - before, peak_rss_mb())
+    report["failures"] = failures
+    return report
+
+
+def run_cli(server, urlFile: str, jobs: int) -> dict:
+    env = dict(os.environ, **BENCH_ENV, **server.env())
+    before = Counter(server.counts)
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "-m", "src.run", urlFile, "--jobs", str(jobs)],
+                            stdout=subprocess.PIPE, env=env, text=True)
+    lines = [line for line in proc.stdout if line.strip()]
+    proc.stdout.close()
+    if hasattr(os, "wait4"):
+        _, status, usage = os.wait4(proc.pid, 0)
+        proc.returncode = os.waitstatus_to_exitcode(status)
+    else:
+        proc.wait()
+        usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    seconds = time.perf_counter() - start
+    report = _result(lines, seconds, Counter(server.counts) - before, rss_mb(usage.ru_maxrss))
+    report["exit_code"] = proc.returncode
+    return report
+
+
+def run(sizes, jobs: int, latency: float = 0.0, modes=("scorecard", "cli")) -> dict:
+    """Run every scenario against a fresh stub server and return {scenario: result}."""
+    from src.utils.stub_server import StubServer
+
+    results = {}
+    with StubServer(latency=latency) as server, tempfile.TemporaryDirectory() as tmp:
+        saved = {k: os.environ.get(k) for k in {**BENCH_ENV, **server.env()}}
+        os.environ.update({**BENCH_ENV, **server.env()})
+        try:
+            if "scorecard" in modes:
+                # first-call costs (imports, connection pools, regex compiles) are not what's measured
+                run_scorecard(server, write_url_file(os.path.join(tmp, "warmup.txt"), 3), jobs)
+            for n in sizes:
+                urlFile = write_url_file(os.path.join(tmp, f"urls-{n}.txt"), n)
+                if "scorecard" in modes:
+                    results[f"scorecard-{n}"] = run_scorecard(server, urlFile, jobs)
+                if "cli" in modes:
+                    results[f"cli-{n}"] = run_cli(server, urlFile, jobs)
+        finally:
+            for k, v in saved.items():
+                if v is None:
+                    os.environ.pop(k, None)
+                else:
+                    os.environ[k] = v
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.e2e",
+                                     description="End-to-end scoring benchmark against the local stub server.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="models per URL file")
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS, help="--jobs passed to the batch runner")
+    parser.add_argument("--mode", choices=["scorecard", "cli", "both"], default="both")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="stub server latency per request")
+    parser.add_argument("--out", help="also write the JSON report to this file")
+    parser.add_argument("--baseline", help="fail (exit 1) when a result regresses against this report")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed relative regression (default 0.25)")
+    parser.add_argument("--write-baseline", metavar="FILE", help="store this run as the new baseline")
+    args = parser.parse_args(argv)
+
+    modes = ("scorecard", "cli") if args.mode == "both" else (args.mode,)
+    results = run(args.sizes, args.jobs, latency=args.latency_ms / 1000, modes=modes)
+    report = {"suite": "e2e", "jobs": args.jobs, "environment": environment(), "results": results}
+
+    regressions = []
+    if args.baseline:
+        gated = {k: v for k, v in results.items() if v["models"] >= MIN_GATED_MODELS}
+        regressions = compare(gated, load_baseline(args.baseline).get("results", {}), CHECKS, args.tolerance)
+        report["regressions"] = regressions
+
+    write_report(report, args.out)
+    if args.write_baseline:
+        save_report(report, args.write_baseline)
+    for message in regressions:
+        print(f"REGRESSION {message}", file=sys.stderr)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
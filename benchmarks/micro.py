@@ -0,0 +1,209 @@
+# micro.py
+# Microbenchmarks for the per-URL / per-metric CPU hot paths.
+#
+# Each case runs one function over a large, realistic input built once up front
+# (thousands of URLs, model-index blocks with thousands of results, multi-MB
+# model cards). Time comes from timeit (best of --repeat runs); allocations come
+# from one extra run under tracemalloc. Reported per case:
+#   ns_per_op     one call of the function under test
+#   ns_per_item   ns_per_op / number of input items (URLs, results, KB of card text, ...)
+#   peak_alloc_kb peak memory allocated during one op
+#   retained_kb   memory still held once the op's return value is dropped (caches, leaks)
+#
+#   python -m benchmarks.micro
+#   python -m benchmarks.micro --filter perf --repeat 7 --out micro.json
+#   python -m benchmarks.micro --baseline micro.json    # exit 1 on regression
+import argparse
+import gc
+import sys
+import timeit
+import tracemalloc
+from types import SimpleNamespace
+from typing import Callable, List
+
+from benchmarks.common import DEFAULT_TOLERANCE, compare, environment, load_baseline, write_report
+
+CHECKS = {"ns_per_op": "lower", "peak_alloc_kb": "lower"}
+
+METRIC_NAMES = ["accuracy", "Acc", "top1-acc", "F1-Score", "macro_f1", "rougeL", "ROUGE-L", "sacrebleu",
+                "wer", "CER", "ppl", "exact_match", "pearson", "loss", "custom_score"]
+LICENSE_STRINGS = ["Apache-2.0", "apache_2.0", "MIT", "BSD 3 Clause", "bsd-3", "LGPL-2.1 (or later)",
+                   "CC-BY-NC-4.0", "openrail-m-v1", "Llama 3.1 Community License", "other"]
+AUTHORS = ["Jane Doe <jane@example.com>", "github-actions[bot]", "system", "dependabot",
+           "Ada Lovelace", "<noreply@github.com>", "Linus T <linus@example.org>", None]
+
+
+class Case():
+    def __init__(self, name: str, fn: Callable[[], object], items: int):
+        self.name = name
+        self.fn = fn
+        self.items = items
+
+
+# ---- realistic inputs ----
+
+def model_urls(n: int) -> List[str]:
+    shapes = [
+        "https://huggingface.co/org{i}/model-{i}",
+        "https://huggingface.co/org{i}/model-{i}/tree/main",
+        "https://huggingface.co/datasets/org{i}/data-{i}",
+        "https://huggingface.co/model{i}",
+        "https://www.huggingface.co/org{i}/Model_{i}.v2/blob/main/README.md",
+    ]
+    return [shapes[i % len(shapes)].format(i=i) for i in range(n)]
+
+
+def model_index(results: int) -> list:
+    entries = []
+    for i in range(results):
+        entries.append({
+            "task": {"type": ["text-classification", "summarization", "automatic-speech-recognition"][i % 3]},
+            "dataset": {"name": f"dataset-{i % 200}", "type": f"org/dataset-{i % 200}", "config": "default"},
+            "metrics": [
+                {"type": METRIC_NAMES[(i + k) % len(METRIC_NAMES)], "value": (i * 7 + k) % 100 / (1 if k % 2 else 100)}
+                for k in range(4)
+            ],
+        })
+    return [{"name": "bench-model", "results": entries}]
+
+
+def card_data(entries: int) -> dict:
+    # cardData as found in the wild: nested lists/dicts, a few GitHub/dataset links buried deep
+    return {
+        "license": "apache-2.0",
+        "tags": [f"tag-{i}" for i in range(entries // 10)],
+        "datasets": [f"org/dataset-{i}" for i in range(entries // 10)],
+        "model-index": model_index(entries // 4),
+        "extra": [{"source": f"https://github.com/org/repo-{i}", "data": f"https://huggingface.co/datasets/org/d-{i}"}
+                  for i in range(entries // 100)],
+    }
+
+
+def model_card_text(megabytes: float) -> str:
+    block = (
+        "## Usage\n\nInstall the package and load the model with `from_pretrained`. "
+        "Training code lives at https://github.com/org/repo and the data at "
+        "https://huggingface.co/datasets/org/data. | metric | value |\n|---|---|\n| accuracy | 0.91 |\n"
+        + "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 20 + "\n\n"
+    )
+    return block * max(1, int(megabytes * 1024 * 1024 / len(block)))
+
+
+# ---- cases ----
+
+def build_cases() -> List[Case]:
+    from src.classes import License as license_module
+    from src.classes import PerformanceClaims as perf
+    from src.utils import get_metadata
+    from src.utils.hf_api import freeze, hfAPI
+
+    api = hfAPI()
+    urls = model_urls(10000)
+    modelUrls = [u for u in urls if "/datasets/" not in u and "/tree/" not in u and "/blob/" not in u
+                 and u.count("/") >= 4]
+    authors = AUTHORS * 1250
+    pairs = [(METRIC_NAMES[i % len(METRIC_NAMES)], (i % 100) / 100) for i in range(10000)]
+    names = [name for name, _ in pairs]
+    licenses = LICENSE_STRINGS * 1000
+    # frozen like every hfAPI payload (tuples and mappingproxies), as evaluate() sees them
+    index = freeze(model_index(5000))
+    resp = freeze({"data": {"cardData": {"model-index": model_index(5000)}}})
+    claims = perf.PerformanceClaims.__new__(perf.PerformanceClaims)
+    info = SimpleNamespace(cardData=card_data(20000))
+    smallCard = SimpleNamespace(text="")
+    bigCard = SimpleNamespace(text=model_card_text(4))
+    emptyInfo = SimpleNamespace(cardData=None)
+    url = "https://huggingface.co/org/model"
+
+    def parse_all():
+        for u in urls:
+            api.parse_hf_url(u)
+
+    return [
+        Case("hf_api.parse_hf_url", parse_all, len(urls)),
+        Case("get_metadata._repo_id_from_url", lambda: [get_metadata._repo_id_from_url(u) for u in modelUrls],
+             len(modelUrls)),
+        Case("get_metadata._normalize_author", lambda: [get_metadata._normalize_author(a) for a in authors],
+             len(authors)),
+        Case("find_github_links walk (20k-entry cardData)",
+             lambda: get_metadata.find_github_links(url, info=info, card=smallCard), 20000),
+        Case("find_github_links README scan (4 MB card)",
+             lambda: get_metadata.find_github_links(url, info=emptyInfo, card=bigCard), len(bigCard.text) // 1024),
+        Case("find_dataset_links walk (20k-entry cardData)",
+             lambda: get_metadata.find_dataset_links(url, info=info, card=smallCard), 20000),
+        Case("find_dataset_links README scan (4 MB card)",
+             lambda: get_metadata.find_dataset_links(url, info=emptyInfo, card=bigCard), len(bigCard.text) // 1024),
+        Case("PerformanceClaims._canon", lambda: [perf._canon(n) for n in names], len(names)),
+        Case("PerformanceClaims._normalize_metric", lambda: [perf._normalize_metric(n, v) for n, v in pairs],
+             len(pairs)),
+        Case("PerformanceClaims._iter_model_index (5k results)", lambda: list(perf._iter_model_index(resp)),
+             5000 * 4),
+        # evaluate() passes the bare model-index from context.hf_info, not the whole response
+        Case("PerformanceClaims.score_model_performance (5k results)",
+             lambda: claims.score_model_performance(index), 5000 * 4),
+        Case("License._norm", lambda: [license_module._norm(s) for s in licenses], len(licenses)),
+    ]
+
+
+# ---- measurement ----
+
+def measure(case: Case, repeat: int) -> dict:
+    timer = timeit.Timer(case.fn)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number)) / number
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        result = case.fn()
+        _, peak = tracemalloc.get_traced_memory()
+        del result
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "items": case.items,
+        "ns_per_op": round(best * 1e9),
+        "ns_per_item": round(best * 1e9 / max(1, case.items), 1),
+        "peak_alloc_kb": round((peak - before) / 1024, 1),
+        "retained_kb": round((after - before) / 1024, 1),
+    }
+
+
+def run(repeat: int = 5, pattern: str = None) -> dict:
+    results = {}
+    for case in build_cases():
+        if pattern and pattern.lower() not in case.name.lower():
+            continue
+        results[case.name] = measure(case, repeat)
+        print(f"{case.name:60s} {results[case.name]['ns_per_item']:>12,.1f} ns/item", file=sys.stderr)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.micro",
+                                     description="Microbenchmarks for parsing and normalization hot paths.")
+    parser.add_argument("--repeat", type=int, default=5, help="timeit repeats; the best one is reported")
+    parser.add_argument("--filter", help="only run cases whose name contains this text")
+    parser.add_argument("--out", help="also write the JSON report to this file")
+    parser.add_argument("--baseline", help="fail (exit 1) when a case regresses against this report")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    results = run(args.repeat, args.filter)
+    report = {"suite": "micro", "environment": environment(), "results": results}
+    regressions = []
+    if args.baseline:
+        regressions = compare(results, load_baseline(args.baseline).get("results", {}), CHECKS, args.tolerance)
+        report["regressions"] = regressions
+
+    write_report(report, args.out)
+    for message in regressions:
+        print(f"REGRESSION {message}", file=sys.stderr)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,7 +10,7 @@ class AvailableDatasetAndCode(Metric):
         super().__init__(metricName, 0, metricWeighting)
         
     
-    def score_dataset_availability(self, url: str, datasetURL) -> float:
+    def score_dataset_availability(self, url: str, datasetURL, context=None) -> float:
         """
         Returns a score between 0 and 1 for dataset availability in a Hugging Face model.
         0 = no datasets mentioned
@@ -19,6 +19,8 @@ class AvailableDatasetAndCode(Metric):
         """
         if datasetURL:
             dataset_links = [datasetURL]
+        elif context is not None:
+            dataset_links = context.dataset_links
         else:
             dataset_links = find_dataset_links(url)
 
@@ -33,7 +35,7 @@ class AvailableDatasetAndCode(Metric):
         # If datasets mentioned but not on HF, partial score
         return 0.5
     
-    def score_code_availability(self, url: str, githubURL) -> float:
+    def score_code_availability(self, url: str, githubURL, context=None) -> float:
         """
         Returns a score between 0 and 1 for code availability in a Hugging Face model.
         0   = no GitHub (or external code) links
@@ -42,6 +44,8 @@ class AvailableDatasetAndCode(Metric):
         """
         if githubURL:
             github_links = [githubURL]
+        elif context is not None:
+            github_links = context.github_links
         else:
             github_links = find_github_links(url)
 
@@ -60,7 +64,7 @@ class AvailableDatasetAndCode(Metric):
         return 0.5
 
 
-    def score_dataset_and_code_availability(self, url: str, datasetURL, githubURL) -> float:
+    def score_dataset_and_code_availability(self, url: str, datasetURL, githubURL, context=None) -> float:
         """
         Combine dataset and code availability scores into a single score (0–1).
         
@@ -71,8 +75,8 @@ class AvailableDatasetAndCode(Metric):
         - Otherwise returns a value in between
         """
         t0 = time.perf_counter_ns()
-        dataset_score = self.score_dataset_availability(url, datasetURL)
-        code_score = self.score_code_availability(url, githubURL)
+        dataset_score = self.score_dataset_availability(url, datasetURL, context)
+        code_score = self.score_code_availability(url, githubURL, context)
 
         total_score = 0.5 * dataset_score + 0.5 * code_score
         dt_ms = (time.perf_counter_ns() - t0) // 1_000_000
@@ -13,10 +13,12 @@ class BusFactor(Metric):
     def __init__(self, metricName="Bus Factor", metricWeighting = 0.1):
         super().__init__(metricName, 0, metricWeighting)
 
-    def setNumContributors(self, url, githubURL):
+    def setNumContributors(self, url, githubURL, context=None):
         t0 = time.perf_counter_ns()
         if githubURL:
             links = [githubURL]
+        elif context is not None:
+            links = context.github_links
         else:
             links = find_github_links(url)
         if links:
@@ -26,6 +28,8 @@ class BusFactor(Metric):
             groupsize = 1 - math.exp((-1.0 / avg) / saturation_coeff)
             self.NumContributors = len(authors)
             self.metricScore = round(evenness * groupsize, 3)
+        elif context is not None and context.assessed("bus_factor") is not None:
+            self.metricScore = round(context.assessed("bus_factor"), 3)
         else:
             api = llmAPI()
             prompt = "Given this link to a HuggingFace model repository, can you assess the Bus Factor of the model based on size of the organization/members \
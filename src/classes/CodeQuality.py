@@ -29,14 +29,19 @@ class CodeQuality(Metric):
         return 0.0
 
     #computing code quality score and returns score and latency 
-    def evaluate(self, url, githubURL) -> float:
+    def evaluate(self, url, githubURL, context=None) -> float:
         t0 = time.perf_counter_ns()
         if githubURL:
-            links = githubURL
+            links = [githubURL]
+        elif context is not None:
+            links = context.github_links
         else:
             links = find_github_links(url)
             
-        if links:
+        assessed = context.assessed("code_quality") if (context is not None and links) else None
+        if assessed is not None:
+            score = assessed
+        elif links:
             prompt = _PROMPT + str(links)
             response = self.llm.main(prompt)
             PAT = re.compile(r'\b(?:1\.0|0\.5|0\.0)\b')
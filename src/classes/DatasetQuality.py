@@ -5,7 +5,6 @@ from src.utils.hf_api import hfAPI
 from src.utils.get_metadata import find_dataset_links
 import re
 import math
-import json
 import time
 from typing import Tuple
 
@@ -55,7 +54,7 @@ class DatasetQuality(Metric):
 
         return round(min(total_score, 1.0), 3)
 
-    def computeDatasetQuality(self, url: str, datasetURL: str) -> Tuple[float, int]:
+    def computeDatasetQuality(self, url: str, datasetURL: str, context=None) -> Tuple[float, int]:
         """
         For a Hugging Face model URL:
         - Find dataset links mentioned in the model card
@@ -65,6 +64,8 @@ class DatasetQuality(Metric):
         t0 = time.perf_counter_ns()
         if datasetURL:
             dataset_links = [datasetURL]
+        elif context is not None:
+            dataset_links = context.dataset_links
         else:
             dataset_links = find_dataset_links(url)
         if not dataset_links:
@@ -73,8 +74,7 @@ class DatasetQuality(Metric):
         scores = []
         api = hfAPI()
         for link in dataset_links:
-            dataset_info_str = api.get_info(link, printCLI=False)
-            dataset_info = json.loads(dataset_info_str).get("data", {})
+            dataset_info = api.get_info(link, printCLI=False).get("data", {})
             score = self._score_single_dataset(dataset_info)
             scores.append(score)
 
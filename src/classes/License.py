@@ -56,6 +56,7 @@ class License(Metric):
         self.license: float = 0.0     
         self.llm = llmAPI()   
 
+    @staticmethod
     def score_license(license_value: Union[str, Iterable[str], None]) -> float:
         items = [_norm(x) for x in _as_list(license_value)]
         if not items:
@@ -72,10 +73,12 @@ class License(Metric):
         # Default grey area
         return 0.3
 
-    def evaluate(self, url) -> float:
+    def evaluate(self, url, context=None) -> float:
         t0 = time.perf_counter_ns()
-        api = hfAPI()
-        response = api.get_info(url, printCLI=False)
+        if context is not None:
+            response = context.hf_info
+        else:
+            response = hfAPI().get_info(url, printCLI=False)
         try:
             tag_license = response["data"]["tags"]["license"]
         except (KeyError, TypeError):
@@ -86,9 +89,11 @@ class License(Metric):
             cardData_license = None
 
         if tag_license:
-            return self.score_license(tag_license)
+            score = self.score_license(tag_license)
         elif cardData_license:
-            return self.score_license(cardData_license)
+            score = self.score_license(cardData_license)
+        elif context is not None and context.assessed("license") is not None:
+            score = context.assessed("license")
         else:
             #GenAI prompt
             prompt = (
@@ -115,10 +120,10 @@ class License(Metric):
             except Exception as e:
                 logging.exception("License.evaluate GenAI error: %s", e)
 
-            #clamp + store on the metric object
-            score = max(0.0, min(1.0, score))
-            self.license = score
-            self.metricScore = score
+        #clamp + store on the metric object
+        score = max(0.0, min(1.0, score))
+        self.license = score
+        self.metricScore = score
 
         dt_ms = (time.perf_counter_ns() - t0) // 1_000_000
         return score, dt_ms
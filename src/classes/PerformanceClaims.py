@@ -3,9 +3,9 @@ from dataclasses import dataclass
 from src.classes.Metric import Metric
 from src.utils.hf_api import hfAPI
 import math
+from collections.abc import Mapping, Sequence
 from typing import Any, Dict, List, Optional, Tuple
 from src.utils.llm_api import llmAPI
-import json
 import time
 
 # ---- Canonicalization & rules ----
@@ -110,11 +110,15 @@ def _normalize_metric(name: str, value: Any) -> Optional[float]:
 def _iter_model_index(resp: Dict[str, Any]):
         """
         Yields (task, dataset, metric_name, value) from a HF models API response
-        (expects ?expand[]=cardData) or from a dict that is already a model-index.
+        (expects ?expand[]=cardData), from a dict that is already a model-index,
+        or from the model-index list itself (what evaluate passes). hfAPI payloads
+        are frozen (tuples and mappingproxies), so any Sequence / Mapping is accepted.
         """
         # Accept response dict with data.cardData.model-index / model_index
         mi = None
-        if isinstance(resp, dict):
+        if isinstance(resp, Sequence) and not isinstance(resp, str):
+            mi = resp
+        elif isinstance(resp, Mapping):
             data = resp.get("data") or {}
             card = data.get("cardData") or {}
             mi = card.get("model-index") or card.get("model_index") or resp.get("model-index") or resp.get("model_index")
@@ -148,16 +152,21 @@ class PerformanceClaims(Metric):
         self.llm = llmAPI()
         
 
-    def evaluate(self, url: str) -> Tuple[float, int]:
+    def evaluate(self, url: str, context=None) -> Tuple[float, int]:
         t0 = time.perf_counter_ns()
-        api = hfAPI()
-        modelinfo = json.loads(api.get_info(url, printCLI=False))
+        if context is not None:
+            modelinfo = context.hf_info
+        else:
+            modelinfo = hfAPI().get_info(url, printCLI=False)
         try:
             model_index = modelinfo["data"]["model-index"]
         except (KeyError, TypeError):
             model_index = None
 
-        if not model_index:
+        assessed = context.assessed("performance_claims") if (context is not None and not model_index) else None
+        if assessed is not None:
+            score = assessed
+        elif not model_index:
             prompt = _PROMPT + url
             response = self.llm.main(prompt)
             if "1.0" in response:
@@ -39,14 +39,17 @@ class RampUpTime(Metric):
         else:
             return 0.0
 
-    def setRampUpTime(self, readme_text: str):
+    def setRampUpTime(self, readme_text: str, context=None):
         """
         Set ramp-up time score either from:
         - precomputed_score (manual value for testing), or
-        - raw readme_text (evaluated by LLM).
+        - raw readme_text (evaluated by LLM, batched through context when given).
         """
         t0 = time.perf_counter_ns()
-        if readme_text:
+        assessed = context.assessed("ramp_up_time") if (context is not None and readme_text) else None
+        if assessed is not None:
+            self.metricScore = assessed
+        elif readme_text:
             self.metricScore = self._score_readme_with_llm(readme_text)
         else:
             self.metricScore = 0.0
@@ -9,38 +9,175 @@ from src.classes.License import License
 from src.classes.PerformanceClaims import PerformanceClaims
 from src.classes.RampUpTime import RampUpTime
 from src.classes.Size import Size
-from src.utils.get_metadata import get_github_readme
 from src.utils.get_metadata import get_model_metadata
+from src.utils.metric_executor import MetricExecutor
+from src.utils.model_context import ModelContext
+from src.utils import deadline, revision_store, tracing, usage
+import functools
 import time
 import json
 from urllib.parse import urlparse
 
+# NDJSON metric name -> ScoreCard attribute
+METRIC_ATTRS = {
+    "bus_factor": "busFactor",
+    "dataset_quality": "datasetQuality",
+    "size_score": "size",
+    "license": "license",
+    "ramp_up_time": "rampUpTime",
+    "performance_claims": "performanceClaims",
+    "code_quality": "codeQuality",
+    "dataset_and_code_score": "availableDatasetAndCode",
+}
+
 @dataclass
 class ScoreCard:
-    def __init__(self, url):
+    def __init__(self, url, maxWorkers=None, context=None, run=True, store=None, deadlineMs=None,
+                 datasetURL=None, githubURL=None):
         t0 = time.perf_counter_ns()
-        self.datasetURL = None
-        self.githubURL = None
+        # Dataset / code URLs given alongside the model (URL file columns); when unset the metrics
+        # use the links found in the model card. Set before the metrics run so they count.
+        self.datasetURL = datasetURL or None
+        self.githubURL = githubURL or None
         self.modelName = self.getName(url)
+        # Model info, card, links and README are fetched once here and shared by every metric
+        self.context = context if context is not None else ModelContext(url)
         # Each metric is a field; defaults provided so you can construct empty and fill later
         self.busFactor = BusFactor()
-        self.busFactor.setNumContributors(url, self.githubURL)
         self.datasetQuality = DatasetQuality()
-        self.datasetQuality.metricScore, self.datasetQuality.metricLatency = self.datasetQuality.computeDatasetQuality(url, self.datasetURL)
         self.size = Size()
-        self.size.setSize(url)        
         self.license = License()
-        self.license.metricScore, self.license.metricLatency = self.license.evaluate(url)
         self.rampUpTime = RampUpTime()
-        readme_text = get_github_readme(url)
-        self.rampUpTime.setRampUpTime(readme_text=readme_text)
         self.performanceClaims = PerformanceClaims()
-        self.performanceClaims.metricScore, self.performanceClaims.metricLatency = self.performanceClaims.evaluate(url)
         self.codeQuality = CodeQuality()
-        self.codeQuality.metricScore, self.codeQuality.metricLatency = self.codeQuality.evaluate(url, self.githubURL)
         self.availableDatasetAndCode = AvailableDatasetAndCode()
-        self.availableDatasetAndCode.metricScore, self.availableDatasetAndCode.metricLatency = self.availableDatasetAndCode.score_dataset_and_code_availability(url, self.datasetURL, self.githubURL)
-        self.latency = (time.perf_counter_ns() - t0) // 1_000_000
+        self.latency = 0
+        self.usage = None  # per-metric cost counters, set when ./run --usage embeds them
+        # With a RevisionStore (./run --incremental) metrics whose inputs are unchanged are restored, not rerun
+        self.store = store
+        self.revisions = {}
+        self.reused = []
+        # With a deadline (deadlineMs, or ./run --deadline-ms) metrics still running when it
+        # passes are reported with deadline.FALLBACK_SCORE and listed in the record's "timed_out"
+        self.deadlined = False
+        self.timedOut = []
+        if run:
+            with deadline.budget(deadlineMs):
+                tasks = self._pendingTasks(url)
+                # The metrics are independent, so run them side by side; each one still records its own latency
+                finished = MetricExecutor(maxWorkers).run(tasks, timeout=deadline.remaining())
+                self._timeOut(tasks, finished, t0)
+            self._saveResults()
+            self.latency = (time.perf_counter_ns() - t0) // 1_000_000
+
+    @classmethod
+    async def score(cls, url, context=None, engine=None, store=None, deadlineMs=None, datasetURL=None,
+                    githubURL=None):
+        """
+        Async counterpart of ScoreCard(url): the model's data is prefetched on
+        the event loop through engine (an AsyncEngine), then the metrics run.
+        The deadline covers the prefetch too.
+        """
+        from src.utils.async_engine import AsyncEngine
+
+        t0 = time.perf_counter_ns()
+        own_engine = engine is None
+        engine = engine if engine is not None else AsyncEngine()
+        try:
+            card = cls(url, context=context, run=False, store=store, datasetURL=datasetURL, githubURL=githubURL)
+            with deadline.budget(deadlineMs):
+                await engine.prefetch(card.context)
+                tasks = await engine.call(None, card._pendingTasks, url)
+                finished = await engine.run_metrics(tasks, timeout=deadline.remaining())
+                card._timeOut(tasks, finished, t0)
+            if store is not None:
+                await engine.call(None, card._saveResults)
+        finally:
+            if own_engine:
+                engine.close()
+        card.latency = (time.perf_counter_ns() - t0) // 1_000_000
+        return card
+
+    def _metricTasks(self, url):
+        # Each task takes its metric object before doing any work: if it misses the deadline,
+        # _timeOut swaps in a fallback and the abandoned thread only ever writes to the old object
+        def busFactor(metric):
+            metric.setNumContributors(url, self.githubURL, self.context)
+
+        def datasetQuality(metric):
+            metric.metricScore, metric.metricLatency = metric.computeDatasetQuality(url, self.datasetURL, self.context)
+
+        def size(metric):
+            metric.setSize(url, self.context)
+
+        def license(metric):
+            metric.metricScore, metric.metricLatency = metric.evaluate(url, self.context)
+
+        def rampUpTime(metric):
+            readme_text = self.context.github_readme
+            metric.setRampUpTime(readme_text=readme_text, context=self.context)
+
+        def performanceClaims(metric):
+            metric.metricScore, metric.metricLatency = metric.evaluate(url, self.context)
+
+        def codeQuality(metric):
+            metric.metricScore, metric.metricLatency = metric.evaluate(url, self.githubURL, self.context)
+
+        def availableDatasetAndCode(metric):
+            metric.metricScore, metric.metricLatency = metric.score_dataset_and_code_availability(url, self.datasetURL, self.githubURL, self.context)
+
+        tasks = {
+            "bus_factor": busFactor,
+            "dataset_quality": datasetQuality,
+            "size_score": size,
+            "license": license,
+            "ramp_up_time": rampUpTime,
+            "performance_claims": performanceClaims,
+            "code_quality": codeQuality,
+            "dataset_and_code_score": availableDatasetAndCode,
+        }
+        return {name: tracing.traced(name, "metric", usage.attributed(name, deadline.guarded(
+                    functools.partial(fn, self._metric(name))))) for name, fn in tasks.items()}
+
+    def _metric(self, name):
+        return getattr(self, METRIC_ATTRS[name])
+
+    def _metricsByName(self):
+        return {name: self._metric(name) for name in METRIC_ATTRS}
+
+    def _timeOut(self, tasks, finished, t0):
+        """Report each task that didn't finish before the deadline with deadline.FALLBACK_SCORE."""
+        self.deadlined = self.deadlined or deadline.remaining() is not None
+        names = [name for name in tasks if finished.get(name, deadline.TIMED_OUT) is deadline.TIMED_OUT]
+        if not names:
+            return
+        elapsed = (time.perf_counter_ns() - t0) // 1_000_000
+        for name in names:
+            fallback = self._metric(name).__class__()
+            fallback.metricScore = deadline.FALLBACK_SCORE
+            fallback.metricLatency = elapsed
+            setattr(self, METRIC_ATTRS[name], fallback)
+        self.timedOut = list(names)
+
+    def _pendingTasks(self, url):
+        """The metric tasks still to run: all of them, minus those restored from self.store."""
+        tasks = self._metricTasks(url)
+        if self.store is None:
+            return tasks
+        self.revisions = revision_store.revisions(self.context)
+        metrics = self._metricsByName()
+        for name, state in self.store.lookup(self.context.modelId, self.revisions).items():
+            revision_store.restore_state(metrics[name], state)
+            self.reused.append(name)
+        return {name: fn for name, fn in tasks.items() if name not in self.reused}
+
+    def _saveResults(self):
+        if self.store is None:
+            return
+        states = {name: revision_store.metric_state(metric)
+                  for name, metric in self._metricsByName().items()
+                  if name not in self.reused and name not in self.timedOut}
+        self.store.save(self.context.modelId, self.revisions, states)
 
     def setGithubURL(self, url):
         self.githubURL = url
@@ -73,7 +210,7 @@ class ScoreCard:
     def getLatency(self) -> int:
         return self.latency
     
-    def printScores(self):
+    def getRecord(self) -> dict:
         rec = {
             "name":self.modelName,
             "category":"MODEL",  # e.g., "MODEL" | "DATASET" | "CODE"
@@ -106,6 +243,15 @@ class ScoreCard:
             "code_quality":float(self.codeQuality.getMetricScore()),
             "code_quality_latency": int(self.codeQuality.getLatency()),
         }
+        if self.deadlined:
+            rec["timed_out"] = list(self.timedOut)
+        if self.usage is not None:
+            rec["usage"] = self.usage
+        return rec
 
+    def toNDJSON(self) -> str:
         # NDJSON: one JSON object per line (no pretty-printing)
-        print(json.dumps(rec, ensure_ascii=False, separators=(",", ":")))
\ No newline at end of file
+        return json.dumps(self.getRecord(), ensure_ascii=False, separators=(",", ":"))
+
+    def printScores(self):
+        print(self.toNDJSON())
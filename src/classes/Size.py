@@ -4,7 +4,6 @@ from dataclasses import dataclass
 from src.classes.Metric import Metric
 from src.utils.llm_api import llmAPI
 from src.utils.hf_api import hfAPI
-import json
 import time
 import re
 
@@ -53,15 +52,17 @@ class Size(Metric):
             return 0.0
         return 1.0 - (ratio - 0.5)
 
-    def setSize(self, url):
+    def setSize(self, url, context=None):
         """
         Compute size score.
         - If LLM available → ask it to contextualize.
         - Else fallback to rule-based thresholds.
         """
         t0 = time.perf_counter_ns()
-        api = hfAPI()
-        response = json.loads(api.get_info(url, printCLI=False))
+        if context is not None:
+            response = context.hf_info
+        else:
+            response = hfAPI().get_info(url, printCLI=False)
 
         try:
             parameter_size = response["data"]["safetensors"]["total"]
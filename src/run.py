@@ -4,20 +4,10 @@
 # ./run install
 import sys
 import json
-import subprocess
-from src.utils.run_tests import run_testsuite
 import traceback
 import os
-import datetime
-from dotenv import load_dotenv, dotenv_values
-
-# Read environment config
-load_dotenv()
-LOG_FILE = os.getenv("LOG_FILE", "run.log")
-try:
-    LOG_LEVEL = int(os.getenv("LOG_LEVEL", "0"))
-except ValueError:
-    LOG_LEVEL = 0  # fallback
+import functools
+from src.utils import logger
 
 def print_full_exception(e):
     # Full formatted traceback string (multi-line)
@@ -42,36 +32,150 @@ def print_full_exception(e):
 def log(msg, level=1):
     """
     level=1 -> info, level=2 -> debug
+    Queued for the background writer in src/utils/logger.py (LOG_FILE / LOG_LEVEL).
     """
-    if LOG_LEVEL >= level:
-        ts = datetime.utcnow().isoformat()
-        record = {"time": ts, "level": level, "msg": msg}
-        with open(LOG_FILE, "a", encoding="utf-8") as f:
-            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    logger.log(msg, level)
 
 def log_exception(e, url=None):
-    tb_str = "".join(traceback.TracebackException.from_exception(e).format())
-    tb_frames = traceback.extract_tb(e.__traceback__)
-    last = tb_frames[-1] if tb_frames else None
+    logger.log_exception(e, url)
 
-    error_record = {
-        "error_type": e.__class__.__name__,
-        "message": str(e),
-        "filename": getattr(last, "filename", None),
-        "lineno": getattr(last, "lineno", None),
-        "function": getattr(last, "name", None),
-        "code": getattr(last, "line", None),
-        "traceback": tb_str,
-    }
-    if url:
-        error_record["url"] = url
-    if LOG_LEVEL >= 1:  # errors show up if verbosity ≥ info
-        with open(LOG_FILE, "a", encoding="utf-8") as f:
-            f.write(json.dumps(error_record, ensure_ascii=False) + "\n")
+def parse_batch_args(argv):
+    import argparse
+    from src.utils.batch_runner import default_jobs
+
+    parser = argparse.ArgumentParser(prog="./run", description="Score every model listed in URL_FILE.")
+    parser.add_argument("url_file", metavar="URL_FILE", help='file of URLs ("-" for stdin; may be gzipped)')
+    parser.add_argument("--jobs", "-j", type=int, default=default_jobs(),
+                        help="number of models scored at once (default: BATCH_JOBS or 4)")
+    parser.add_argument("--engine", choices=["threads", "async"], default="threads",
+                        help="threads: one worker thread per model; async: models are coroutines on one event loop")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="write a Chrome trace of every URL/metric/HTTP/LLM span to FILE (and OTLP JSON to FILE.otel.json)")
+    parser.add_argument("--usage", action="store_true",
+                        help="add per-metric request/byte/LLM/cache counters to each NDJSON record as \"usage\"")
+    parser.add_argument("--stats", metavar="FILE",
+                        help="write the same counters to FILE, one JSON line per model, leaving the NDJSON unchanged")
+    parser.add_argument("--profile", metavar="DIR",
+                        help="cProfile each model into DIR/*.pstats plus DIR/aggregate.pstats; prints a top-N summary to stderr")
+    parser.add_argument("--profile-memory", action="store_true",
+                        help="with --profile: also report top allocation sites and peak memory (tracemalloc)")
+    parser.add_argument("--profile-top", type=int, default=25, metavar="N",
+                        help="rows in the --profile summaries (default: 25)")
+    parser.add_argument("--incremental", metavar="DB",
+                        help="keep results in the SQLite file DB keyed by model/GitHub/dataset revision; "
+                             "only metrics whose inputs changed since the last run are recomputed")
+    parser.add_argument("--continue-on-error", action="store_true",
+                        help="keep scoring when a model fails: report it as an NDJSON error record, retry transient "
+                             "failures at the end, and exit 3 on partial success")
+    parser.add_argument("--retries", type=int, default=None, metavar="N",
+                        help="with --continue-on-error: retry rounds for transient failures (default: 2)")
+    parser.add_argument("--retry-backoff", type=float, default=None, metavar="SECONDS",
+                        help="with --continue-on-error: delay before the first retry round, doubled each round (default: 2)")
+    parser.add_argument("--error-report", metavar="FILE",
+                        help="with --continue-on-error: write error records and the summary to FILE instead of stderr")
+    parser.add_argument("--deadline-ms", type=float, default=None, metavar="MS",
+                        help="time budget per model; metrics still running when it runs out score 0.0 and are "
+                             "listed in the record's \"timed_out\"")
+    offline = parser.add_mutually_exclusive_group()
+    offline.add_argument("--record", metavar="DIR",
+                         help="save every HTTP/LLM exchange of this run to DIR")
+    offline.add_argument("--replay", metavar="DIR",
+                         help="serve every HTTP/LLM exchange from a DIR saved with --record (no network)")
+    args = parser.parse_args(argv)
+    if args.profile_memory and not args.profile:
+        parser.error("--profile-memory requires --profile DIR")
+    if args.profile and args.engine == "async":
+        parser.error("--profile requires --engine threads")
+    if args.profile:
+        # one cProfile per scoring thread can't run concurrently (ValueError on Python 3.12+)
+        args.jobs = 1
+    if args.deadline_ms is not None and args.deadline_ms <= 0:
+        parser.error("--deadline-ms must be positive")
+    if not args.continue_on_error:
+        for flag, value in (("--retries", args.retries), ("--retry-backoff", args.retry_backoff),
+                            ("--error-report", args.error_report)):
+            if value is not None:
+                parser.error(f"{flag} requires --continue-on-error")
+    return args
+
+def start_offline_mode(args):
+    """Set up --record / --replay before anything touches the network."""
+    from src.utils import recorder
+
+    if not (args.record or args.replay):
+        return
+    # the on-disk caches would hide exchanges from the recording, and have nothing to add to a replay
+    os.environ["HTTP_CACHE"] = ""
+    os.environ["LLM_CACHE"] = ""
+    if args.record:
+        recorder.start_recording(args.record)
+    else:
+        recorder.start_replay(args.replay)
+
+def print_record(url, line, store=None):
+    """Print one model's NDJSON line, and keep it in store (SCORE_DB) if there is one."""
+    print(line, flush=True)
+    if store is not None:
+        store.add(url, line)
+
+def emit_result(url, result, store=None):
+    """Print one finished model's NDJSON line, or log its failure and stop the run."""
+    try:
+        line = result.result()
+    except Exception as e:
+        log_exception(e, url)
+        sys.exit(1)
+    print_record(url, line, store)
+
+def parse_query_args(argv):
+    import argparse
+    from src.utils.score_store import DEFAULT_DB
+
+    parser = argparse.ArgumentParser(prog="./run query",
+                                     description="Read past scores from the SCORE_DB store as NDJSON (newest record per model).")
+    parser.add_argument("--db", metavar="FILE", help=f"score store to read (default: SCORE_DB or {DEFAULT_DB})")
+    parser.add_argument("--top", type=int, metavar="K", help="only the K best models by net_score")
+    parser.add_argument("--name", metavar="PATTERN", help="model name contains PATTERN (a glob if it has * ? or [)")
+    parser.add_argument("--min-score", type=float, metavar="X", help="net_score >= X")
+    parser.add_argument("--max-score", type=float, metavar="X", help="net_score <= X")
+    parser.add_argument("--since", metavar="TIME", help="scored at or after TIME (ISO date/datetime in UTC, or epoch seconds)")
+    parser.add_argument("--until", metavar="TIME", help="scored before TIME")
+    parser.add_argument("--history", metavar="URL_OR_NAME",
+                        help="every stored record of one model, oldest first (--top keeps the newest K)")
+    args = parser.parse_args(argv)
+    from src.utils.score_store import parse_time
+    try:
+        args.since = parse_time(args.since) if args.since else None
+        args.until = parse_time(args.until) if args.until else None
+    except ValueError as e:
+        parser.error(f"bad time: {e}")
+    return args
+
+def run_query(argv):
+    """./run query: print stored records matching the filters, one NDJSON line each."""
+    from src.utils.score_store import ScoreStore, query_path
+
+    args = parse_query_args(argv)
+    path = args.db or query_path()
+    if not os.path.exists(path):
+        print(f"No score store at {path} (score with SCORE_DB={path} first)", file=sys.stderr)
+        return 1
+    store = ScoreStore(path)
+    try:
+        if args.history:
+            rows = store.history(args.history, limit=args.top)
+        else:
+            rows = store.query(top=args.top, name=args.name, minScore=args.min_score, maxScore=args.max_score,
+                               since=args.since, until=args.until)
+        for row in rows:
+            print(json.dumps(row, ensure_ascii=False, separators=(",", ":")))
+    finally:
+        store.close()
+    return 0
 
 def main():
     if len(sys.argv) < 2:
-        print("Usage: ./run [install|test|URL_FILE]")
+        print("Usage: ./run [install|test|query [--top K] [--name P] [--min-score X] [--since T] [--history URL]|URL_FILE [--jobs N] [--engine threads|async] [--record DIR|--replay DIR] [--trace FILE] [--usage] [--stats FILE] [--profile DIR [--profile-memory]] [--incremental DB] [--deadline-ms MS] [--continue-on-error [--retries N] [--error-report FILE]]]")
         sys.exit(1)
 
     command = sys.argv[1]
@@ -79,6 +183,7 @@ def main():
     if command == "install":
         log("Installing dependencies...", level=1)
         # print("Installing dependencies...")
+        import subprocess
         try:
             subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
             sys.exit(0)
@@ -88,6 +193,7 @@ def main():
             sys.exit(1)
            
     elif command == "test":
+        from src.utils.run_tests import run_testsuite
         log("Running tests...", level=1)
         test_args = sys.argv[2:]
         # forward args to your unittest runner
@@ -99,56 +205,120 @@ def main():
             code = 1                 # on exception, fail the run
         sys.exit(code)
 
+    elif command == "query":
+        try:
+            code = run_query(sys.argv[2:])
+        except Exception as e:
+            log_exception(e)
+            print_full_exception(e)
+            code = 1
+        sys.exit(code)
+
     else:
         # assume it's a file with URLs
-        from src.utils.check_url import checkURL
-        from src.classes.ScoreCard import ScoreCard
+        from src.utils.batch_runner import iter_models, iter_urls, open_url_file, run_ordered, score_model
 
-        url_file = command
+        args = parse_batch_args(sys.argv[1:])
         try:
-            urls = []
-            with open(url_file, "r") as f:
-                for line in f:
-                    line = line.strip()
-                    url_list = line.split(",")
-                    for url in url_list:
-                        urls.append(url.strip())
+            start_offline_mode(args)
+        except OSError as e:
+            log_exception(e)
+            sys.exit(1)
+        if args.deadline_ms is not None:
+            from src.utils import deadline
+            deadline.set_default(args.deadline_ms)
+        url_file = args.url_file
+        try:
+            # streamed: models are scored while the rest of the file is still being read
+            stream = open_url_file(url_file)
         except FileNotFoundError as e:
             log_exception(e)
             # print(f"Error: could not find file '{url_file}'", file=sys.stderr)
             sys.exit(1)
+        urls = iter_urls(stream)
 
-        recentGhURL = None
-        recentDatasetURL = None
-        for url in urls:
-            if url and checkURL(url):
-                try:
-                    modelScore = ScoreCard(url)
-                   
-                    if recentDatasetURL:
-                        modelScore.setDatasetURL(recentDatasetURL)
-                    if recentGhURL:
-                        modelScore.setGithubURL(recentGhURL)
-
-                    modelScore.setTotalScore()
-                    modelScore.printScores()
-
-                except Exception as e:
-                    error_record = {
-                        "url": url,
-                        "error": str(e)
-                    }
-                    log_exception(e)
-                    # print(json.dumps(error_record), file=sys.stderr)
-                    # print_full_exception(e)
-                    sys.exit(1)
+        if args.trace:
+            from src.utils import tracing
+            tracing.start_tracing()
+        scorer = score_model
+        profiler = None
+        if args.profile:
+            from src.utils.profiler import RunProfiler
+            # cProfile only sees its own thread, so each model's metrics run inline
+            os.environ["METRIC_WORKERS"] = "1"
+            profiler = RunProfiler(args.profile, memory=args.profile_memory, top=args.profile_top)
+            scorer = profiler.wrap(score_model)
+        import sqlite3
+        from src.utils import revision_store
+        from src.utils.score_store import ScoreStore, db_path
+        scores = None
+        try:
+            if args.incremental:
+                revision_store.open_store(args.incremental)
+            if db_path():
+                # every printed record is also kept for ./run query
+                scores = ScoreStore(db_path())
+        except sqlite3.Error as e:
+            log_exception(e)
+            sys.exit(1)
+        emit = functools.partial(emit_result, store=scores)
+        models = iter_models(urls)
+        report = None
+        errorStream = None
+        if args.continue_on_error:
+            from src.utils.batch_errors import DEFAULT_BACKOFF, DEFAULT_RETRIES, BatchReport
+            try:
+                errorStream = open(args.error_report, "w", encoding="utf-8") if args.error_report else None
+            except OSError as e:
+                log_exception(e)
+                sys.exit(1)
+            report = BatchReport(functools.partial(print_record, store=scores), stream=errorStream,
+                                 retries=DEFAULT_RETRIES if args.retries is None else args.retries,
+                                 backoff=DEFAULT_BACKOFF if args.retry_backoff is None else args.retry_backoff)
+            emit = report.emit
+            models = report.track(models)
+        if args.usage or args.stats:
+            from src.utils import usage
+            try:
+                usage.start_usage(embed=args.usage, statsPath=args.stats)
+            except OSError as e:
+                log_exception(e)
+                sys.exit(1)
+        log(f"Scoring {url_file} (engine={args.engine}, jobs={args.jobs})", level=1)
+
+        def run_batch(items):
+            # Results come back in input order, however many models are in flight
+            if args.engine == "async":
+                from src.utils.async_engine import run_async_batch
+                run_async_batch(items, inFlight=args.jobs, emit=emit)
             else:
-                # Non-HF URLs (GitHub, etc.) handled later
-                if "dataset" in url:
-                    recentDatasetURL = url
-                elif "github" in url:
-                    recentGhURL = url
-        sys.exit(0)
+                for url, result in run_ordered(items, jobs=args.jobs, scorer=scorer):
+                    emit(url, result)
+
+        code = 0
+        try:
+            run_batch(models)
+            if report is not None:
+                # transient failures get another go once the whole file has been through
+                while report.pending_retries():
+                    run_batch(report.next_round())
+                code = report.finish()
+        finally:
+            if profiler is not None:
+                profiler.finish()
+            if args.trace:
+                tracing.write_trace(args.trace)
+            if args.usage or args.stats:
+                usage.stop_usage()
+            if args.incremental:
+                revision_store.close_store()
+            if scores is not None:
+                scores.close()
+            if errorStream is not None:
+                errorStream.close()
+            stream.close()
+        log("Scoring finished", level=1)
+        sys.exit(code)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
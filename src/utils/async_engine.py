@@ -0,0 +1,194 @@
+# async_engine.py
+# asyncio scoring pipeline: many models share one event loop and one bounded
+# I/O executor.
+#
+# Each model is a coroutine, but the I/O itself is not non-blocking:
+# requirements.txt has no async HTTP library, so every request is a blocking
+# requests call on one bounded I/O executor. What the event loop buys is that
+# the thread count stays fixed (ASYNC_IO_THREADS) however many models are
+# queued, so throughput is bounded by that pool and the per-host limits, not
+# by --jobs: raising --jobs past ASYNC_IO_THREADS only queues more coroutines.
+#
+# A model's prefetch (HF metadata and model card, GitHub README, linked dataset
+# metadata) is awaited through small client methods, each gated by a per-host
+# asyncio.Semaphore so one host can't take the whole executor. Then the metrics
+# run on the same executor and produce the same NDJSON as
+# ScoreCard.printScores. Their own LLM and GitHub calls are made from those
+# threads, so the same per-host limits are also enforced in http_client
+# (HostLimits) for every request made from a call the engine runs.
+import asyncio
+import contextvars
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Optional
+
+from src.utils import deadline, http_client, llm_scheduler, logger, revision_store, tracing, usage
+from src.utils.config import DEFAULT_ASYNC_IO_THREADS, get_config
+from src.utils.hf_api import hfAPI
+
+HF_HOST = "huggingface.co"
+GITHUB_HOST = "api.github.com"
+
+# Max concurrent calls per host
+DEFAULT_HOST_LIMITS = {
+    HF_HOST: 32,
+    GITHUB_HOST: 16,
+}
+DEFAULT_HOST_LIMIT = 16
+DEFAULT_IO_THREADS = DEFAULT_ASYNC_IO_THREADS
+
+
+class AsyncEngine():
+    def __init__(self, hostLimits: Optional[Dict[str, int]] = None, ioThreads: Optional[int] = None):
+        self.hostLimits = dict(DEFAULT_HOST_LIMITS if hostLimits is None else hostLimits)
+        self.ioThreads = ioThreads if ioThreads is not None else get_config().asyncIOThreads
+        self.executor = ThreadPoolExecutor(max_workers=self.ioThreads, thread_name_prefix="async-io")
+        self.limits = http_client.HostLimits(self.hostLimits, DEFAULT_HOST_LIMIT)
+        self._semaphores = {}
+
+    def _semaphore(self, host: str) -> asyncio.Semaphore:
+        sem = self._semaphores.get(host)
+        if sem is None:
+            sem = asyncio.Semaphore(self.hostLimits.get(host, DEFAULT_HOST_LIMIT))
+            self._semaphores[host] = sem
+        return sem
+
+    async def call(self, host: Optional[str], fn: Callable, *args):
+        """Run a blocking call on the I/O executor, holding host's semaphore if given."""
+        loop = asyncio.get_running_loop()
+        # run_in_executor does not carry contextvars over; copy them so tracing spans nest.
+        # Every request fn makes, metric-level LLM and GitHub calls included, takes a host slot.
+        ctx = contextvars.copy_context()
+        ctx.run(http_client.limit_hosts, self.limits)
+        run = ctx.run
+        try:
+            if host is None:
+                return await loop.run_in_executor(self.executor, run, fn, *args)
+            async with self._semaphore(host):
+                return await loop.run_in_executor(self.executor, run, fn, *args)
+        except SystemExit as e:
+            # hfAPI exits on HTTP errors; raised in a task that would stop the whole event loop, not just this model
+            raise RuntimeError(f"{e.__context__ or 'exited'} (exit status {e.code})") from e
+
+    # ---- async clients ----
+
+    async def hf_info(self, context):
+        return await self.call(HF_HOST, lambda: context.hf_info)
+
+    async def model_card(self, context):
+        return await self.call(HF_HOST, lambda: context.card)
+
+    async def dataset_info(self, link: str):
+        # lands in hf_api.METADATA_CACHE, where DatasetQuality picks it up
+        return await self.call(HF_HOST, hfAPI().get_info, link, False)
+
+    async def github_readme(self, context) -> str:
+        return await self.call(GITHUB_HOST, lambda: context.github_readme)
+
+    # ---- pipeline ----
+
+    async def prefetch(self, context):
+        """Load everything a model's metrics read from its ModelContext."""
+        await asyncio.gather(self.hf_info(context), self.model_card(context))
+        fetches = [self.github_readme(context)]
+        fetches += [self.dataset_info(link) for link in context.dataset_links]
+        await asyncio.gather(*fetches)
+
+    async def run_metrics(self, tasks: Dict[str, Callable[[], object]],
+                          timeout: Optional[float] = None) -> Dict[str, object]:
+        """
+        Run every metric on the executor and return name -> result, like MetricExecutor.run:
+        with a timeout, metrics still running when it expires are left out (their threads are
+        abandoned, not awaited), and the first failure in submission order is re-raised.
+        """
+        futures = {name: asyncio.ensure_future(self.call(None, fn)) for name, fn in tasks.items()}
+        if not futures:
+            return {}
+        await asyncio.wait(futures.values(), timeout=None if timeout is None else max(0.0, timeout))
+        late = [fut for fut in futures.values() if not fut.done()]
+        for fut in late:
+            fut.cancel()
+        return {name: fut.result() for name, fut in futures.items() if fut not in late}
+
+    async def score_line(self, url: str, datasetURL: Optional[str], githubURL: Optional[str]) -> str:
+        """Async counterpart of batch_runner.score_model."""
+        from src.classes.ScoreCard import ScoreCard
+        from src.utils.check_url import checkURL
+        from src.utils.model_context import ModelContext
+
+        with tracing.span(url, "url", url=url), usage.scope(url) as cost, logger.correlation(url), \
+                deadline.budget(deadline.default_ms()):
+            logger.log("scoring", logger.DEBUG, datasetURL=datasetURL, githubURL=githubURL)
+            context = ModelContext(url)
+            # loads the metadata prefetch would have loaded first anyway
+            if not await self.call(HF_HOST, checkURL, url, context):
+                raise ValueError(f"Not a Hugging Face model URL: {url}")
+            modelScore = await ScoreCard.score(url, context=context, engine=self, store=revision_store.active(),
+                                               deadlineMs=deadline.default_ms(), datasetURL=datasetURL,
+                                               githubURL=githubURL)
+            modelScore.setTotalScore()
+            if cost is not None and usage.embedding():
+                modelScore.usage = cost.to_dict()
+            logger.log("scored", logger.DEBUG, net_score=modelScore.getTotalScore(),
+                       latency_ms=modelScore.getLatency(), reused=modelScore.reused)
+            return modelScore.toNDJSON()
+
+    async def score_ordered(self, items: Iterable[tuple], inFlight: int, emit: Callable[[str, asyncio.Task], None]):
+        """
+        Score every (url, datasetURL, githubURL) item with up to inFlight models
+        running at once and call emit(url, task) with each finished task in input order.
+        Items are read on their own thread: a slow input blocks neither the event
+        loop nor the emission of models that have already finished.
+        """
+        loop = asyncio.get_running_loop()
+        reader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="async-input")
+        slots = asyncio.Semaphore(inFlight)
+        started = asyncio.Queue()
+
+        async def positioned(position, item):
+            # runs in the task's own context: this model's LLM prompts queue by its input position
+            llm_scheduler.set_position(position)
+            return await self.score_line(*item)
+
+        async def feed():
+            try:
+                it = iter(items)
+                for position in itertools.count():
+                    await slots.acquire()
+                    item = await loop.run_in_executor(reader, next, it, None)
+                    if item is None:
+                        break
+                    started.put_nowait((item[0], asyncio.ensure_future(positioned(position, item))))
+            finally:
+                started.put_nowait(None)
+
+        feeder = asyncio.ensure_future(feed())
+        try:
+            while True:
+                entry = await started.get()
+                if entry is None:
+                    break
+                url, task = entry
+                await asyncio.wait([task])
+                emit(url, task)
+                slots.release()
+            await feeder  # re-raises a failure reading the input
+        finally:
+            feeder.cancel()
+            reader.shutdown(wait=False, cancel_futures=True)
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def run_async_batch(items: Iterable[tuple], inFlight: int, emit: Callable[[str, asyncio.Task], None]):
+    """Blocking entry point for ./run --engine async."""
+    engine = AsyncEngine()
+
+    async def _main():
+        try:
+            await engine.score_ordered(items, max(1, inFlight), emit)
+        finally:
+            engine.close()
+
+    asyncio.run(_main())
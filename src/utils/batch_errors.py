@@ -0,0 +1,143 @@
+# batch_errors.py
+# ./run URL_FILE --continue-on-error [--retries N] [--retry-backoff S] [--error-report FILE]
+#
+# By default the first model that fails ends the run (exit 1). With
+# --continue-on-error a failed model becomes one NDJSON error record (on
+# stderr, or in --error-report FILE) and the batch keeps going. Failures that
+# look transient are queued and retried after the main pass. These are
+# connection errors, timeouts (including an open circuit, see resilience.py),
+# HTTP 408/429/5xx and GitHub rate limits, including those hfAPI
+# turns into sys.exit. Each retry round waits an exponentially growing,
+# jittered delay and runs through the same engine. A retried model's record
+# is printed when it succeeds, so it comes after the main pass, out of input
+# order. The run ends with a summary record and exits:
+#   0  every model scored
+#   3  partial success (some models failed for good)
+#   1  no model could be scored
+import json
+import random
+import sys
+import time
+from collections import Counter, deque
+from typing import Callable, Iterable, Iterator, Optional, TextIO
+
+import requests
+
+from src.utils import logger
+from src.utils.recorder import ReplayMiss
+from src.utils.resilience import TRANSIENT_STATUS, is_rate_limited
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_PARTIAL = 3
+
+DEFAULT_RETRIES = 2
+DEFAULT_BACKOFF = 2.0
+MAX_BACKOFF = 60.0
+
+
+def is_transient(exc: BaseException) -> bool:
+    """True when exc, or an exception it was raised from, is worth retrying later."""
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        if isinstance(exc, ReplayMiss):
+            return False  # the recording won't change between attempts
+        if isinstance(exc, requests.HTTPError):
+            response = exc.response
+            return response is not None and (response.status_code in TRANSIENT_STATUS or is_rate_limited(response))
+        if isinstance(exc, (requests.ConnectionError, requests.Timeout, ConnectionError, TimeoutError)):
+            return True
+        exc = exc.__cause__ or exc.__context__
+    return False
+
+
+def _describe(exc: BaseException) -> str:
+    if isinstance(exc, SystemExit) and exc.__context__ is not None:
+        return f"{exc.__context__.__class__.__name__}: {exc.__context__}"  # hfAPI exits after printing why
+    return str(exc)
+
+
+class BatchReport():
+    def __init__(self, onScored: Callable[[str, str], None], stream: Optional[TextIO] = None,
+                 retries: int = DEFAULT_RETRIES, backoff: float = DEFAULT_BACKOFF):
+        self.onScored = onScored
+        self.stream = stream if stream is not None else sys.stderr
+        self.retries = max(0, retries)
+        self.backoff = backoff
+        self.counts = Counter()
+        self.round = 0
+        self._inflight = deque()  # (item, attempt), in the order the engine emits them
+        self._retry = []
+
+    def track(self, items: Iterable[tuple], attempt: int = 1) -> Iterator[tuple]:
+        """Pass items through to the engine, remembering each so a failure can be retried."""
+        for item in items:
+            self._inflight.append((item, attempt))
+            yield item
+
+    def emit(self, url: str, result):
+        """emit callback for run_ordered / run_async_batch."""
+        item, attempt = self._inflight.popleft()
+        try:
+            line = result.result()
+        except KeyboardInterrupt:
+            raise
+        except BaseException as e:
+            self._failed(item, attempt, e)
+            return
+        self.counts["scored"] += 1
+        if attempt > 1:
+            self.counts["recovered"] += 1
+        self.onScored(url, line)
+
+    def _failed(self, item: tuple, attempt: int, exc: BaseException):
+        url = item[0]
+        transient = is_transient(exc)
+        retry = transient and attempt <= self.retries
+        logger.log_exception(exc, url)
+        self._write({
+            "url": url,
+            "error_type": exc.__class__.__name__,
+            "message": _describe(exc),
+            "transient": transient,
+            "attempt": attempt,
+            "will_retry": retry,
+        })
+        if retry:
+            self._retry.append((item, attempt + 1))
+        else:
+            self.counts["failed"] += 1
+
+    def _write(self, record: dict):
+        self.stream.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self.stream.flush()
+
+    def pending_retries(self) -> bool:
+        return bool(self._retry)
+
+    def next_round(self) -> Iterator[tuple]:
+        """Wait out the backoff for the next retry round, then return its items (tracked)."""
+        queued, self._retry = self._retry, []
+        self.round += 1
+        self.counts["retried"] += len(queued)
+        delay = min(MAX_BACKOFF, self.backoff * 2 ** (self.round - 1)) * random.uniform(0.5, 1.0)
+        logger.log(f"Retrying {len(queued)} models in {delay:.1f}s (round {self.round})")
+        time.sleep(delay)
+        return self._track_attempts(queued)
+
+    def _track_attempts(self, queued) -> Iterator[tuple]:
+        for item, attempt in queued:
+            self._inflight.append((item, attempt))
+            yield item
+
+    def finish(self) -> int:
+        """Write the summary record and return the exit status."""
+        scored, failed = self.counts["scored"], self.counts["failed"]
+        summary = {"models": scored + failed, "scored": scored, "failed": failed,
+                   "retried": self.counts["retried"], "recovered": self.counts["recovered"]}
+        self._write({"summary": summary})
+        logger.log("Batch summary", **summary)
+        if failed == 0:
+            return EXIT_OK
+        return EXIT_PARTIAL if scored else EXIT_FAILED
@@ -0,0 +1,169 @@
+# batch_runner.py
+# Scores many models at once while keeping NDJSON output in input order.
+#
+# The URL file is streamed: open_url_file -> iter_urls -> iter_models is a
+# chain of generators, and run_ordered only pulls a few items ahead of the
+# workers, so memory stays flat and results start printing right away however
+# long the input is. The input is read on its own thread, so a slow pipe never
+# holds back results that are already finished.
+import contextvars
+import gzip
+import io
+import itertools
+import queue
+import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, Optional, TextIO, Tuple
+
+from src.utils import deadline, llm_scheduler, logger, revision_store, tracing, usage
+from src.utils.config import DEFAULT_BATCH_JOBS, get_config
+
+DEFAULT_JOBS = DEFAULT_BATCH_JOBS
+
+
+def default_jobs() -> int:
+    """Worker count from BATCH_JOBS (falls back to DEFAULT_JOBS)."""
+    return get_config().batchJobs
+
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+def open_url_file(path: str) -> TextIO:
+    """
+    Open a URL file for streaming: "-" is stdin, and gzip input (by content,
+    not extension) is decompressed on the fly. Raises FileNotFoundError up front.
+    """
+    raw = sys.stdin.buffer if path == "-" else open(path, "rb")
+    if not hasattr(raw, "peek"):
+        raw = io.BufferedReader(raw)
+    if raw.peek(2)[:2] == GZIP_MAGIC:
+        raw = gzip.GzipFile(fileobj=raw)
+    return io.TextIOWrapper(raw, encoding="utf-8", errors="replace")
+
+
+def iter_urls(lines: Iterable[str]) -> Iterator[str]:
+    """Every comma-separated entry of every line, stripped (empty entries included)."""
+    for line in lines:
+        for url in line.strip().split(","):
+            yield url.strip()
+
+
+def iter_models(urls: Iterable[str]) -> Iterator[Tuple[str, Optional[str], Optional[str]]]:
+    """
+    Yield (modelURL, datasetURL, githubURL) for every model URL.
+    The most recent dataset and GitHub URLs seen before a model become its context.
+    """
+    from src.utils.check_url import is_model_url
+
+    recentGhURL = None
+    recentDatasetURL = None
+    for url in urls:
+        if not url:
+            continue
+        if is_model_url(url):
+            yield url, recentDatasetURL, recentGhURL
+        elif "dataset" in url:
+            recentDatasetURL = url
+        elif "github" in url:
+            recentGhURL = url
+
+
+def score_model(url: str, datasetURL: Optional[str], githubURL: Optional[str]) -> str:
+    """Score one model and return its NDJSON line."""
+    from src.utils.check_url import checkURL
+    from src.classes.ScoreCard import ScoreCard
+    from src.utils.model_context import ModelContext
+
+    with tracing.span(url, "url", url=url), usage.scope(url) as cost, logger.correlation(url), \
+            deadline.budget(deadline.default_ms()):
+        logger.log("scoring", logger.DEBUG, datasetURL=datasetURL, githubURL=githubURL)
+        context = ModelContext(url)
+        if not checkURL(url, context):
+            raise ValueError(f"Not a Hugging Face model URL: {url}")
+        modelScore = ScoreCard(url, context=context, store=revision_store.active(),
+                               datasetURL=datasetURL, githubURL=githubURL)
+        modelScore.setTotalScore()
+        if cost is not None and usage.embedding():
+            modelScore.usage = cost.to_dict()
+        logger.log("scored", logger.DEBUG, net_score=modelScore.getTotalScore(),
+                   latency_ms=modelScore.getLatency(), reused=modelScore.reused)
+        return modelScore.toNDJSON()
+
+
+def _completed(fn, *args) -> Future:
+    fut = Future()
+    try:
+        fut.set_result(fn(*args))
+    except BaseException as e:
+        fut.set_exception(e)
+    return fut
+
+
+_END = object()
+
+
+def _read_ahead(items: Iterable[tuple], submit: Callable[[tuple], Future], ready: queue.Queue,
+                slots: threading.Semaphore, stop: threading.Event):
+    """run_ordered's input thread: submit every item as it is read, taking a reorder slot first."""
+    try:
+        it = iter(items)
+        while True:
+            slots.acquire()
+            if stop.is_set():
+                return
+            item = next(it, _END)
+            if item is _END:
+                break
+            ready.put((item[0], submit(item)))
+    except BaseException as e:
+        ready.put((_END, e))
+        return
+    ready.put((_END, None))
+
+
+def run_ordered(items: Iterable[tuple], jobs: int = 1,
+                scorer: Callable[..., str] = score_model) -> Iterator[Tuple[str, Future]]:
+    """
+    Run scorer(*item) for every item on `jobs` workers and yield (url, future)
+    in input order; each yielded future is already done. Items are read on a
+    separate thread, so a finished result is yielded as soon as everything
+    before it is, even while the input is blocked. At most 2 * jobs items are
+    read ahead of the output, so huge inputs never pile up in memory.
+    """
+    if jobs <= 1:
+        for item in items:
+            yield item[0], _completed(scorer, *item)
+        return
+
+    pool = ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="batch")
+    slots = threading.Semaphore(2 * jobs)
+    stop = threading.Event()
+    ready = queue.Queue()
+    positions = itertools.count()
+
+    def submit(item):
+        # each model's LLM prompts queue by its input position: output waits on the earliest one
+        ctx = contextvars.copy_context()
+        ctx.run(llm_scheduler.set_position, next(positions))
+        return pool.submit(ctx.run, scorer, *item)
+
+    # the reader runs in a copy of this context, so every scorer sees the caller's contextvars
+    reader = threading.Thread(target=contextvars.copy_context().run, name="batch-input", daemon=True,
+                              args=(_read_ahead, items, submit, ready, slots, stop))
+    reader.start()
+    try:
+        while True:
+            url, fut = ready.get()
+            if url is _END:
+                if fut is not None:
+                    raise fut  # the input itself failed
+                return
+            fut.exception()  # wait without raising
+            yield url, fut
+            slots.release()
+    finally:
+        stop.set()
+        slots.release()  # wake the reader if it is waiting for a slot
+        pool.shutdown(wait=False, cancel_futures=True)
@@ -5,9 +5,16 @@
 
 from src.utils.hf_api import hfAPI
 
-def checkURL(url):
-    if "github" in url or "datasets" in url:
+def is_model_url(url):
+    # anything that isn't a GitHub or dataset link is taken for a model; checkURL then verifies it
+    return "github" not in url and "datasets" not in url
+
+def checkURL(url, context=None):
+    if not is_model_url(url):
         return False
+    elif context is not None:
+        context.hf_info  # loads (and caches) the metadata; exits like get_info on a bad repo
+        return True
     else:
         api = hfAPI()
         api.get_info(url, False)
@@ -0,0 +1,126 @@
+# config.py
+# Process-wide settings, read once.
+#
+# load_env() loads .env into os.environ the first time it is called, and does
+# nothing after that. It used to run at import and then again on every LLM
+# prompt and collaborator lookup. Variables already set in the environment
+# win over .env.
+#
+# get_config() parses every tuning setting (logging, HTTP pool, retries and
+# cache, the metadata and LLM caches, the LLM scheduler, worker counts) into
+# one Config, with the defaults kept here. The Config is cached per set of
+# values, so it is only rebuilt when one of its variables changes (./run
+# --replay, tests patching os.environ). Endpoints and credentials (HF_ENDPOINT,
+# GITHUB_API_URL, tokens) are still read where they are used.
+import functools
+import os
+from typing import NamedTuple, Optional
+
+
+@functools.lru_cache(maxsize=None)
+def load_env() -> bool:
+    """Load .env once per process (python-dotenv is imported here, not at startup); True if one was found."""
+    from dotenv import load_dotenv
+
+    return load_dotenv()
+
+
+DEFAULT_LOG_FILE = "run.log"
+DEFAULT_LOG_LEVEL = 0
+DEFAULT_LOG_MAX_KB = 10 * 1024
+DEFAULT_LOG_BACKUPS = 3
+DEFAULT_HTTP_POOL_SIZE = 16
+DEFAULT_HTTP_CACHE_MAX_MB = 256
+DEFAULT_HTTP_CACHE_TTL = 3600
+DEFAULT_HF_METADATA_CACHE_SIZE = 512
+DEFAULT_HF_METADATA_CACHE_TTL = 600.0
+DEFAULT_LLM_CACHE_SIZE = 1024
+DEFAULT_LLM_CACHE_TTL = 7 * 24 * 3600
+DEFAULT_LLM_CACHE_MAX_MB = 64
+DEFAULT_LLM_MAX_CONCURRENCY = 4
+DEFAULT_LLM_RPM = 120
+DEFAULT_LLM_DEADLINE = 120.0
+DEFAULT_METRIC_WORKERS = 8
+DEFAULT_BATCH_JOBS = 4
+DEFAULT_ASYNC_IO_THREADS = 32
+
+
+class Config(NamedTuple):
+    logFile: str = DEFAULT_LOG_FILE
+    logLevel: int = DEFAULT_LOG_LEVEL
+    logMaxBytes: int = DEFAULT_LOG_MAX_KB * 1024  # rotate LOG_FILE past this size; 0 never rotates
+    logBackups: int = DEFAULT_LOG_BACKUPS
+    httpPoolSize: int = DEFAULT_HTTP_POOL_SIZE  # keep-alive connections per host
+    httpRetries: Optional[int] = None  # overrides every host's RetryPolicy.retries when set
+    httpCache: Optional[str] = None  # SQLite file for the HTTP cache; None turns it off
+    httpCacheMaxBytes: int = DEFAULT_HTTP_CACHE_MAX_MB * 1024 * 1024
+    httpCacheTTL: float = DEFAULT_HTTP_CACHE_TTL  # for hosts without their own TTL
+    hfMetadataCacheSize: int = DEFAULT_HF_METADATA_CACHE_SIZE
+    hfMetadataCacheTTL: float = DEFAULT_HF_METADATA_CACHE_TTL
+    llmCache: Optional[str] = None  # SQLite file for the LLM disk tier; None keeps memory only
+    llmCacheSize: int = DEFAULT_LLM_CACHE_SIZE  # memory tier entries; 0 turns it off
+    llmCacheTTL: float = DEFAULT_LLM_CACHE_TTL
+    llmCacheMaxBytes: int = DEFAULT_LLM_CACHE_MAX_MB * 1024 * 1024
+    llmMaxConcurrency: int = DEFAULT_LLM_MAX_CONCURRENCY
+    llmRPM: float = DEFAULT_LLM_RPM
+    llmDeadline: Optional[float] = DEFAULT_LLM_DEADLINE  # None waits for a slot forever
+    metricWorkers: int = DEFAULT_METRIC_WORKERS
+    batchJobs: int = DEFAULT_BATCH_JOBS
+    asyncIOThreads: int = DEFAULT_ASYNC_IO_THREADS
+
+
+# Every variable get_config() reads; a change to any of them builds a new Config
+ENV_VARS = (
+    "LOG_FILE", "LOG_LEVEL", "LOG_MAX_KB", "LOG_BACKUPS",
+    "HTTP_POOL_SIZE", "HTTP_RETRIES", "HTTP_CACHE", "HTTP_CACHE_MAX_MB", "HTTP_CACHE_TTL",
+    "HF_METADATA_CACHE_SIZE", "HF_METADATA_CACHE_TTL",
+    "LLM_CACHE", "LLM_CACHE_SIZE", "LLM_CACHE_TTL", "LLM_CACHE_MAX_MB",
+    "LLM_MAX_CONCURRENCY", "LLM_RPM", "LLM_DEADLINE",
+    "METRIC_WORKERS", "BATCH_JOBS", "ASYNC_IO_THREADS",
+)
+
+
+def _number(env: dict, name: str, default, cast=int, minimum=None):
+    """env[name] as cast (at least minimum); default when unset or not a number."""
+    value = env.get(name)
+    if value is None:
+        return default
+    try:
+        value = cast(value)
+    except ValueError:
+        return default
+    return value if minimum is None else max(minimum, value)
+
+
+def get_config() -> Config:
+    load_env()
+    return _build(tuple(os.environ.get(name) for name in ENV_VARS))
+
+
+@functools.lru_cache(maxsize=8)
+def _build(values: tuple) -> Config:
+    env = dict(zip(ENV_VARS, values))
+    llmDeadline = _number(env, "LLM_DEADLINE", DEFAULT_LLM_DEADLINE, float)
+    return Config(
+        logFile=DEFAULT_LOG_FILE if env["LOG_FILE"] is None else env["LOG_FILE"],
+        logLevel=_number(env, "LOG_LEVEL", DEFAULT_LOG_LEVEL),
+        logMaxBytes=_number(env, "LOG_MAX_KB", DEFAULT_LOG_MAX_KB, minimum=0) * 1024,
+        logBackups=_number(env, "LOG_BACKUPS", DEFAULT_LOG_BACKUPS, minimum=0),
+        httpPoolSize=_number(env, "HTTP_POOL_SIZE", DEFAULT_HTTP_POOL_SIZE, minimum=1),
+        httpRetries=_number(env, "HTTP_RETRIES", None, minimum=0),
+        httpCache=env["HTTP_CACHE"] or None,
+        httpCacheMaxBytes=int(_number(env, "HTTP_CACHE_MAX_MB", DEFAULT_HTTP_CACHE_MAX_MB, float) * 1024 * 1024),
+        httpCacheTTL=_number(env, "HTTP_CACHE_TTL", DEFAULT_HTTP_CACHE_TTL, float),
+        hfMetadataCacheSize=_number(env, "HF_METADATA_CACHE_SIZE", DEFAULT_HF_METADATA_CACHE_SIZE),
+        hfMetadataCacheTTL=_number(env, "HF_METADATA_CACHE_TTL", DEFAULT_HF_METADATA_CACHE_TTL, float),
+        llmCache=env["LLM_CACHE"] or None,
+        llmCacheSize=_number(env, "LLM_CACHE_SIZE", DEFAULT_LLM_CACHE_SIZE),
+        llmCacheTTL=_number(env, "LLM_CACHE_TTL", DEFAULT_LLM_CACHE_TTL, float),
+        llmCacheMaxBytes=int(_number(env, "LLM_CACHE_MAX_MB", DEFAULT_LLM_CACHE_MAX_MB, float) * 1024 * 1024),
+        llmMaxConcurrency=_number(env, "LLM_MAX_CONCURRENCY", DEFAULT_LLM_MAX_CONCURRENCY, minimum=1),
+        llmRPM=_number(env, "LLM_RPM", DEFAULT_LLM_RPM, float),
+        llmDeadline=llmDeadline if llmDeadline > 0 else None,
+        metricWorkers=_number(env, "METRIC_WORKERS", DEFAULT_METRIC_WORKERS, minimum=1),
+        batchJobs=_number(env, "BATCH_JOBS", DEFAULT_BATCH_JOBS, minimum=1),
+        asyncIOThreads=_number(env, "ASYNC_IO_THREADS", DEFAULT_ASYNC_IO_THREADS, minimum=1),
+    )
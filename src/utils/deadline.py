@@ -0,0 +1,103 @@
+# deadline.py
+# Per-model latency budget (./run --deadline-ms, ScoreCard(deadlineMs=...)).
+#
+# budget(ms) puts an absolute deadline in a contextvar for the with-block. It
+# reaches the metric threads and the async engine's executor calls in the same
+# copied context as tracing and usage. Every blocking call below reads it:
+#   - http_client / resilience cap each attempt's timeout at the time left and
+#     don't sleep for a retry that would end past it,
+#   - the LLM scheduler won't keep a prompt queued past it,
+#   - ScoreCard waits for its metrics only until it. A metric still running then,
+#     or one that raised after it (guarded), is reported with FALLBACK_SCORE and
+#     listed in the record's "timed_out". Its thread is abandoned, not joined,
+#     and its next network call fails fast.
+# The budget also covers the model's setup (URL check, metadata prefetch). If it
+# runs out there, there is nothing to score and the model fails with the timeout.
+# Budgets nest: the inner one can only shorten the deadline.
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+FALLBACK_SCORE = 0.0  # score reported for a metric that missed the deadline
+TIMED_OUT = object()  # what a guarded() call returns instead of raising once the deadline has passed
+
+_deadline = contextvars.ContextVar("deadline", default=None)  # time.monotonic() value
+
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+@contextmanager
+def budget(ms: Optional[float]):
+    """Give the with-block ms milliseconds (None = no new limit); yields the seconds it has."""
+    if ms is None:
+        yield remaining()
+        return
+    deadline = time.monotonic() + ms / 1000.0
+    current = _deadline.get()
+    if current is not None:
+        deadline = min(deadline, current)
+    token = _deadline.set(deadline)
+    try:
+        yield remaining()
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left before the current deadline (may be negative), or None without one."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def expired() -> bool:
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def guarded(fn: Callable) -> Callable:
+    """
+    fn wrapped so that an exception raised once the deadline has passed (its
+    HTTP/LLM calls failing fast) returns TIMED_OUT instead: the call missed
+    the deadline, it did not fail.
+    """
+    def wrapper(*args, **kwargs):
+        try:
+            return fn(*args, **kwargs)
+        except (Exception, SystemExit):  # hfAPI exits on network errors
+            if expired():
+                return TIMED_OUT
+            raise
+    return wrapper
+
+
+def clamp(timeout):
+    """
+    timeout (seconds, (connect, read) or None) cut down to the time left.
+    Raises DeadlineExceeded when there is none left.
+    """
+    left = remaining()
+    if left is None:
+        return timeout
+    if left <= 0:
+        raise DeadlineExceeded("deadline exceeded")
+    if timeout is None:
+        return left
+    if isinstance(timeout, tuple):
+        return tuple(left if t is None else min(t, left) for t in timeout)
+    return min(timeout, left)
+
+
+_default_ms = None
+
+
+def set_default(ms: Optional[float]):
+    """Budget every model ./run scores gets (--deadline-ms); None for no limit."""
+    global _default_ms
+    _default_ms = ms
+
+
+def default_ms() -> Optional[float]:
+    return _default_ms
@@ -1,15 +1,44 @@
 # Count unique contributors from Hugging Face without cloning
 # pip install huggingface_hub
+import importlib
 import os, re
-from urllib.parse import urlparse
+from urllib.parse import quote, urlparse
 from collections import Counter
 from typing import Optional
-from huggingface_hub import HfApi, ModelCard
-from huggingface_hub.utils import HfHubHTTPError
 import statistics
-from dotenv import load_dotenv, dotenv_values
-import requests
 import base64
+import requests
+from src.utils import http_cache, http_client, logger, resilience
+from src.utils.config import load_env
+from src.utils.hf_api import hfAPI, hf_endpoint
+
+# Every Hub request here goes through http_cache / http_client (hfAPI.fetch_json
+# for the REST metadata), so recording, retries and deadlines apply to it.
+# huggingface_hub is only used for its ModelInfo / ModelCard parsers. It takes
+# ~0.3s to import, so it is loaded by the first function that needs it rather
+# than at startup. The names stay attributes of this module
+# (patch("src.utils.get_metadata.ModelCard") still works).
+_HUB_NAMES = {
+    "ModelInfo": "huggingface_hub",
+    "ModelCard": "huggingface_hub",
+}
+
+def _hub(name: str):
+    value = globals().get(name)
+    if value is None:
+        value = globals()[name] = getattr(importlib.import_module(_HUB_NAMES[name]), name)
+    return value
+
+def __getattr__(name: str):
+    if name in _HUB_NAMES:
+        return _hub(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+DEFAULT_GITHUB_API_URL = "https://api.github.com"
+
+def github_api_url() -> str:
+    """Base URL for GitHub REST calls; GITHUB_API_URL overrides it (e.g. the local stub server)."""
+    return (os.getenv("GITHUB_API_URL") or DEFAULT_GITHUB_API_URL).rstrip("/")
 
 BOT_RE = re.compile(r"(bot|ci|action|autobot|dependabot|github-actions)", re.I)
 
@@ -33,25 +62,33 @@ def getCollaborators(hf_url: str, n: int = 100, branch: str | None = None) -> in
     repo_id = _repo_id_from_url(hf_url)
 
     # Use token if available (needed for gated/private repos), else anonymous.
-    load_dotenv()
+    load_env()
     tok = os.getenv("HF_TOKEN")
-    api = HfApi(token=tok or False)
+    headers = {"Authorization": f"Bearer {tok}"} if tok else {}
 
+    # The endpoint HfApi.list_repo_commits pages through
+    url = f"{hf_endpoint()}/api/models/{repo_id}/commits/{quote(branch or 'main', safe='')}"
+    commits = []
     try:
-        commits = api.list_repo_commits(repo_id, revision=branch)[:n]
-    except HfHubHTTPError as e:
+        while url and len(commits) < n:
+            r = http_cache.get(url, headers=headers, timeout=30)
+            r.raise_for_status()
+            commits.extend(r.json())
+            url = _next_page(r)
+    except (requests.RequestException, ValueError) as e:
         # Common causes: repo is gated/private and you didn't supply HF_TOKEN,
         # or you haven't accepted the license.
        print(f"Unable to list commits for {repo_id}: {e}")
        return -1, -1, -1
+    commits = commits[:n]
 
     authors = {}
     for c in commits:
         # Prefer the first human author string if present
         author = None
-        if getattr(c, "authors", None):
-            for a in c.authors:
-                a = _normalize_author(a)
+        if c.get("authors"):
+            for a in c["authors"]:
+                a = _normalize_author(a.get("user") if isinstance(a, dict) else a)
                 if a:
                     author = a
                     break
@@ -83,33 +120,47 @@ def get_model_metadata(url: str):
     Retrieve parameter count, file sizes, and model type for a Hugging Face model.
     Returns (param_count, file_sizes, model_type).
     """
-    api = HfApi()
+    api = hfAPI()
     model_id = url.split("huggingface.co/")[-1]
 
-    info = api.model_info(model_id)
+    info = api.fetch_json(api.build_api_url("model", model_id))
 
     param_count = None
-    if hasattr(info, "cardData") and info.cardData:
-        param_count = info.cardData.get("parameters")
+    if info.get("cardData"):
+        param_count = info["cardData"].get("parameters")
 
     file_sizes = []
-    if hasattr(info, "siblings"):
-        for f in info.siblings:
-            if hasattr(f, "size") and f.size:
-                file_sizes.append(f.size)
+    for f in info.get("siblings") or []:
+        if f.get("size"):
+            file_sizes.append(f["size"])
 
     model_type = "general"
-    if hasattr(info, "pipeline_tag") and info.pipeline_tag:
-        model_type = info.pipeline_tag
+    if info.get("pipeline_tag"):
+        model_type = info["pipeline_tag"]
 
     return param_count, file_sizes, model_type
 
-def find_github_links(url):
-    api = HfApi()
+def _fetch_model_info(model_id: str):
+    """ModelInfo from the /api/models endpoint HfApi.model_info reads."""
+    api = hfAPI()
+    return _hub("ModelInfo")(**api.fetch_json(api.build_api_url("model", model_id)))
+
+def _fetch_model_card(model_id: str):
+    """ModelCard from the same README.md ModelCard.load downloads."""
+    r = http_cache.get(hfAPI().build_readme_url(model_id), timeout=30)
+    r.raise_for_status()
+    return _hub("ModelCard")(r.text)
+
+def find_github_links(url, info=None, card=None):
+    """
+    Collect GitHub links from a model's cardData and README.
+    Pass already-loaded `info`/`card` (see ModelContext) to skip refetching them.
+    """
     model_id = _repo_id_from_url(url)
 
     # 1. Get model info (includes cardData)
-    info = api.model_info(model_id)
+    if info is None:
+        info = _fetch_model_info(model_id)
     links = set()
 
     # From cardData if present
@@ -127,20 +178,27 @@ def find_github_links(url):
         links.update(walk(info.cardData))
 
     # 2. Get README text and scan for links
-    card = ModelCard.load(model_id)
+    if card is None:
+        card = _fetch_model_card(model_id)
     readme = card.text if hasattr(card, "text") else card.content
     links.update(GITHUB_URL_RE.findall(readme))
 
-    return list(links)
+    # sorted, not set order (which changes with the hash seed): links[0] picks the
+    # repo that is scored, and the list goes into the LLM prompt and its cache key
+    return sorted(links)
 
 # Regex for HF dataset links
 DATASET_URL_RE = re.compile(r"https?://huggingface\.co/datasets/[A-Za-z0-9_.\-]+/[A-Za-z0-9_.\-]+")
 
-def find_dataset_links(url: str):
-    api = HfApi()
+def find_dataset_links(url: str, info=None, card=None):
+    """
+    Collect Hugging Face dataset links from a model's cardData, API metadata and README.
+    Pass already-loaded `info`/`card` (see ModelContext) to skip refetching them.
+    """
     model_id = _repo_id_from_url(url)
 
-    info = api.model_info(model_id)
+    if info is None:
+        info = _fetch_model_info(model_id)
     links = set()
 
     # 1. From cardData if present
@@ -164,20 +222,23 @@ def find_dataset_links(url: str):
                 links.add(f"https://huggingface.co/datasets/{ds}")
 
     # 3. From README text (ModelCard)
-    card = ModelCard.load(model_id)
+    if card is None:
+        card = _fetch_model_card(model_id)
     readme = getattr(card, "text", getattr(card, "content", ""))
     links.update(DATASET_URL_RE.findall(readme))
 
-    return list(links)
+    return sorted(links)  # stable across processes, like find_github_links
 
-def get_github_readme(url: str) -> str:
+def get_github_readme(url: str, links=None) -> str:
     """
     Fetch README.md content from a GitHub repo using the GitHub REST API.
     Expects format: https://github.com/<owner>/<repo>
+    Pass `links` when the model's GitHub links are already known.
     Returns decoded README text, or "" if not found.
     """
     try:
-        links = find_github_links(url)
+        if links is None:
+            links = find_github_links(url)
         if links:
             github_url = links[0]
             m = re.match(r"^https?://(?:www\.)?github\.com/([^/]+)/([^/]+?)(?:\.git)?/?$", github_url.strip())
@@ -185,9 +246,9 @@ def get_github_readme(url: str) -> str:
                 raise ValueError(f"Bad GitHub URL: {github_url}")
             owner, repo = m.group(1), m.group(2)
 
-            url = f"https://api.github.com/repos/{owner}/{repo}/readme"
+            url = f"{github_api_url()}/repos/{owner}/{repo}/readme"
             headers = {"Accept": "application/vnd.github+json", "User-Agent": "readme-fetcher/1.0"}
-            r = requests.get(url, headers=headers, timeout=30)
+            r = http_cache.get(url, headers=headers, timeout=30)
             if r.status_code == 200:
                 content = r.json().get("content", "")
                 return base64.b64decode(content).decode("utf-8")
@@ -199,6 +260,37 @@ def get_github_readme(url: str) -> str:
         return ""
 
 
+def get_github_head(github_url: str) -> Optional[str]:
+    """
+    SHA of the newest commit on the default branch of github_url, or None when
+    it can't be read. Goes straight to the network (not the HTTP cache): it is
+    the freshness check for revision_store.
+    """
+    m = re.match(r"^https?://(?:www\.)?github\.com/([^/]+)/([^/]+?)(?:\.git)?/?$", github_url.strip())
+    if not m:
+        return None
+    owner, repo = m.group(1), m.group(2)
+    url = f"{github_api_url()}/repos/{owner}/{repo}/commits?per_page=1"
+    headers = {"Accept": "application/vnd.github+json", "User-Agent": "commit-sampler-noauth/1.0"}
+    try:
+        r = http_client.get(url, headers=headers, timeout=30)
+        if r.status_code != 200:
+            return None
+        data = r.json()
+    except Exception:
+        return None
+    if isinstance(data, list) and data and isinstance(data[0], dict):
+        return data[0].get("sha")
+    return None
+
+
+def _next_page(r) -> Optional[str]:
+    """URL of the next page from a GitHub-style Link header (GitHub and the HF Hub both use it)."""
+    for part in r.headers.get("Link", "").split(","):
+        if 'rel="next"' in part:
+            return part.split(";")[0].strip()[1:-1]  # strip <>
+    return None
+
 # --- Last-N commit authors from a GitHub repo (no token) ---
 _BOT_RE = re.compile(r"(?:\[(?:bot)\]|bot$|^dependabot|^github-actions)", re.I)
 
@@ -208,27 +300,23 @@ def get_collaborators_github(github_url: str, n: int = 100, branch: str | None =
     owner, repo = m.group(1), m.group(2)
 
     per_page = max(1, min(100, n))
-    url = f"https://api.github.com/repos/{owner}/{repo}/commits?per_page={per_page}" + (f"&sha={branch}" if branch else "")
+    url = f"{github_api_url()}/repos/{owner}/{repo}/commits?per_page={per_page}" + (f"&sha={branch}" if branch else "")
     headers = {"Accept": "application/vnd.github+json", "User-Agent": "commit-sampler-noauth/1.0"}
     commits = []
 
     # paginate until we collect n or hit rate limit
+    # (http_client already waited out any reset short enough to be worth it)
     while url and len(commits) < n:
-        r = requests.get(url, headers=headers, timeout=30)
-        if r.status_code == 403 and "rate limit" in r.text.lower():
+        r = http_cache.get(url, headers=headers, timeout=30)
+        if commits and r.status_code == 403 and (resilience.is_rate_limited(r) or "rate limit" in r.text.lower()):
+            logger.log("GitHub rate limit hit; using a partial commit history", github_url=github_url,
+                       commits=len(commits), wanted=n, retry_after=resilience.retry_after(r))
             break  # return partial results if rate-limited
         r.raise_for_status()
         data = r.json()
         if not isinstance(data, list): break
         commits.extend(data)
-        # parse Link header for next
-        link = r.headers.get("Link", "")
-        nxt = None
-        for part in link.split(","):
-            if 'rel="next"' in part:
-                nxt = part.split(";")[0].strip()[1:-1]  # strip <>
-                break
-        url = nxt
+        url = _next_page(r)
     commits = commits[:n]
 
     authors = {}
@@ -10,12 +10,88 @@ import json
 import os
 import re
 import sys
+import threading
+import time
+from collections import OrderedDict
+from types import MappingProxyType
 from urllib.parse import urlparse
-from functools import lru_cache
 
 import requests
 
+from src.utils import http_cache
+from src.utils.config import get_config
+
 HF_HOSTS = {"huggingface.co", "www.huggingface.co"}
+DEFAULT_HF_ENDPOINT = "https://huggingface.co"
+
+
+def hf_endpoint() -> str:
+    """Base URL for Hub API calls; HF_ENDPOINT overrides it (e.g. the local stub server)."""
+    return (os.getenv("HF_ENDPOINT") or DEFAULT_HF_ENDPOINT).rstrip("/")
+
+
+def freeze(obj):
+    """Read-only copy of parsed JSON: dicts become mappingproxies, lists become tuples."""
+    if isinstance(obj, dict):
+        return MappingProxyType({k: freeze(v) for k, v in obj.items()})
+    if isinstance(obj, list):
+        return tuple(freeze(v) for v in obj)
+    return obj
+
+
+def thaw(obj):
+    """Plain (mutable, json.dumps-able) copy of a frozen payload."""
+    if isinstance(obj, (dict, MappingProxyType)):
+        return {k: thaw(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [thaw(v) for v in obj]
+    return obj
+
+
+class MetadataCache():
+    """
+    Thread-safe, size- and TTL-bounded map of (kind, repo_id) -> frozen get_info payload.
+    One instance is shared by every hfAPI object in the process.
+    """
+
+    def __init__(self, maxsize: int = 512, ttl: float = 600.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, payload)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key, payload):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+METADATA_CACHE = MetadataCache(
+    maxsize=get_config().hfMetadataCacheSize,
+    ttl=get_config().hfMetadataCacheTTL,
+)
 
 class hfAPI():
     def _strip_empty(self, parts):
@@ -75,26 +151,45 @@ class hfAPI():
 
     def build_api_url(self, kind: str, repo_id: str) -> str:
         if kind == "model":
-            return f"https://huggingface.co/api/models/{repo_id}"
+            return f"{hf_endpoint()}/api/models/{repo_id}"
         elif kind == "dataset":
-            return f"https://huggingface.co/api/datasets/{repo_id}"
+            return f"{hf_endpoint()}/api/datasets/{repo_id}"
         else:
             raise ValueError(f"Unknown kind '{kind}'. Expected 'model' or 'dataset'.")
 
+    def build_readme_url(self, repo_id: str) -> str:
+        # Raw model card, the same file huggingface_hub.ModelCard.load downloads
+        return f"{hf_endpoint()}/{repo_id}/resolve/main/README.md"
+
 
     def fetch_json(self, api_url: str):
-        r = requests.get(api_url, timeout=10)  # no token headers
+        r = http_cache.get(api_url, timeout=10)  # no token headers
         r.raise_for_status()
         return r.json()
 
-    @lru_cache(maxsize=128)
     def get_info(self, url, printCLI=True):
+        """
+        Metadata for a model or dataset URL as a read-only mapping
+        {"_requested": {...}, "data": {...}}; printed as JSON instead when printCLI.
+        Payloads are shared process-wide through METADATA_CACHE, so callers must not mutate them.
+        """
         try:
             kind, repo_id = self.parse_hf_url(url)
         except ValueError as e:
             print(f"Error: {e}", file=sys.stderr)
             sys.exit(2)
 
+        record = METADATA_CACHE.get((kind, repo_id))
+        if record is None:
+            record = self._fetch_record(kind, repo_id)
+            METADATA_CACHE.put((kind, repo_id), record)
+
+        if printCLI:
+            print(json.dumps(thaw(record), indent=2, sort_keys=False))
+        else:
+            return record
+
+    def _fetch_record(self, kind, repo_id):
         api_url = self.build_api_url(kind, repo_id)
 
         try:
@@ -108,34 +203,15 @@ class hfAPI():
             print(f"Network error while fetching {api_url}: {e}", file=sys.stderr)
             sys.exit(1)
 
-        if printCLI:
-            print(json.dumps(
-                {
-                    "_requested": {
-                        "kind": kind,
-                        "repo_id": repo_id,
-                        "api_url": api_url,
-                        "host": "huggingface.co"
-                    },
-                    "data": data
-                },
-                indent=2,
-                sort_keys=False
-            ))
-        else:
-            return json.dumps(
-                {
-                    "_requested": {
-                        "kind": kind,
-                        "repo_id": repo_id,
-                        "api_url": api_url,
-                        "host": "huggingface.co"
-                    },
-                    "data": data
-                },
-                indent=2,
-                sort_keys=False
-            )
+        return freeze({
+            "_requested": {
+                "kind": kind,
+                "repo_id": repo_id,
+                "api_url": api_url,
+                "host": urlparse(api_url).netloc
+            },
+            "data": data
+        })
 
 
 if __name__ == "__main__":
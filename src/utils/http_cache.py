@@ -0,0 +1,228 @@
+# http_cache.py
+# Persistent on-disk cache for GET responses from the Hugging Face and GitHub APIs.
+#
+# Entries are keyed by method + URL + the request headers that change the
+# response (Accept, and Authorization as a hash, so one token's private repo
+# is never served to another) and stored in SQLite. A fresh entry (inside
+# its host's TTL) is served without touching the network; a stale one is
+# revalidated with If-None-Match / If-Modified-Since so an unchanged resource
+# costs a 304 instead of a full download. The file is capped in size and the
+# least recently used entries are evicted first; the total size is kept as a
+# running count, and only summed again once it goes over the cap.
+#
+# Enabled by setting HTTP_CACHE to a file path (see README "Configuration").
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from src.utils import http_client, tracing, usage
+from src.utils.config import DEFAULT_HTTP_CACHE_MAX_MB, DEFAULT_HTTP_CACHE_TTL, get_config
+
+# Seconds a stored response is served without revalidation, per host
+DEFAULT_TTLS = {
+    "huggingface.co": 6 * 3600,
+    "api.github.com": 3600,
+}
+DEFAULT_TTL = DEFAULT_HTTP_CACHE_TTL
+DEFAULT_MAX_BYTES = DEFAULT_HTTP_CACHE_MAX_MB * 1024 * 1024
+# Request headers that change the response, so they are part of the key
+KEY_HEADERS = ("Accept", "Authorization")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key           TEXT PRIMARY KEY,
+    url           TEXT NOT NULL,
+    status        INTEGER NOT NULL,
+    headers       TEXT NOT NULL,
+    body          BLOB NOT NULL,
+    etag          TEXT,
+    last_modified TEXT,
+    expires_at    REAL NOT NULL,
+    last_access   REAL NOT NULL,
+    size          INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_access ON responses(last_access);
+"""
+
+
+class CachedResponse():
+    """Just enough of requests.Response for the callers in src/utils."""
+
+    def __init__(self, url: str, status_code: int, headers, content: bytes, from_cache: bool = True):
+        self.url = url
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers or {})
+        self.content = content
+        self.from_cache = from_cache
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            err = requests.HTTPError(f"{self.status_code} error for {self.url}")
+            err.response = self
+            raise err
+
+
+def cache_key(method: str, url: str, headers=None) -> str:
+    """method + URL, plus any KEY_HEADERS sent (Authorization only as a hash)."""
+    key = f"{method} {url}"
+    headers = CaseInsensitiveDict(headers or {})
+    for name in KEY_HEADERS:
+        value = headers.get(name)
+        if value is None:
+            continue
+        if name == "Authorization":
+            value = hashlib.sha256(value.encode("utf-8")).hexdigest()[:16]
+        key += f"\n{name}: {value}"
+    return key
+
+
+class HttpCache():
+    def __init__(self, path: str, maxBytes: int = DEFAULT_MAX_BYTES,
+                 ttls: Optional[Dict[str, float]] = None, defaultTTL: float = DEFAULT_TTL):
+        self.path = path
+        self.maxBytes = maxBytes
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.defaultTTL = defaultTTL
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._total = self._size()
+
+    def ttl_for(self, url: str) -> float:
+        return self.ttls.get(urlparse(url).netloc.lower(), self.defaultTTL)
+
+    def lookup(self, method: str, url: str, headers=None):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT status, headers, body, etag, last_modified, expires_at FROM responses WHERE key = ?",
+                (cache_key(method, url, headers),),
+            ).fetchone()
+
+    def store(self, method: str, url: str, response, headers=None):
+        key = cache_key(method, url, headers)
+        stored = dict(response.headers)
+        body = response.content or b""
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, url, response.status_code, json.dumps(stored), body,
+                 response.headers.get("ETag"), response.headers.get("Last-Modified"),
+                 now + self.ttl_for(url), now, len(body)),
+            )
+            self._total += len(body) - (old[0] if old else 0)
+            if self._total > self.maxBytes:
+                self._evict()
+
+    def refresh(self, method: str, url: str, headers=None):
+        """Restart the TTL of an entry the server just confirmed with a 304."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE responses SET expires_at = ?, last_access = ? WHERE key = ?",
+                (now + self.ttl_for(url), now, cache_key(method, url, headers)),
+            )
+
+    def touch(self, method: str, url: str, headers=None):
+        with self._lock:
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?",
+                               (time.time(), cache_key(method, url, headers)))
+
+    def _size(self) -> int:
+        return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def _evict(self):
+        # Drop least recently used entries until the body total fits under maxBytes. The
+        # running total misses what other processes sharing the file did, so re-sum first.
+        total = self._total = self._size()
+        if total <= self.maxBytes:
+            return
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY last_access").fetchall():
+            if total <= self.maxBytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+        self._total = total
+
+    def get(self, url: str, headers=None, timeout=30):
+        requestHeaders = headers
+        row = self.lookup("GET", url, requestHeaders)
+        if row is not None:
+            status, stored_headers, body, etag, last_modified, expires_at = row
+            cached = CachedResponse(url, status, json.loads(stored_headers), body)
+            if expires_at > time.time():
+                self.touch("GET", url, requestHeaders)
+                usage.add(usage.HTTP_CACHE_HITS)
+                host = urlparse(url).netloc.lower()
+                with tracing.span(f"GET {host}", "http", method="GET", host=host, url=url, cache_hit=True,
+                                  status=status, bytes=len(body)):
+                    return cached
+            headers = dict(headers or {})
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        usage.add(usage.HTTP_CACHE_MISSES)
+        r = _send(url, headers, timeout)
+        if r.status_code == 304 and row is not None:
+            self.refresh("GET", url, requestHeaders)
+            return cached
+        if r.status_code == 200:
+            self.store("GET", url, r, requestHeaders)
+        return r
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._total = 0
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def _send(url, headers, timeout):
+    if headers:
+        return http_client.get(url, headers=headers, timeout=timeout)
+    return http_client.get(url, timeout=timeout)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> Optional[HttpCache]:
+    """The process-wide cache, or None when HTTP_CACHE is unset."""
+    global _cache
+    config = get_config()
+    if not config.httpCache:
+        return None
+    with _cache_lock:
+        if _cache is None or _cache.path != config.httpCache:
+            _cache = HttpCache(config.httpCache, maxBytes=config.httpCacheMaxBytes, defaultTTL=config.httpCacheTTL)
+        return _cache
+
+
+def get(url: str, headers=None, timeout=30):
+    """GET through the on-disk cache when it is enabled, else straight to the network."""
+    cache = get_cache()
+    if cache is None:
+        return _send(url, headers, timeout)
+    return cache.get(url, headers=headers, timeout=timeout)
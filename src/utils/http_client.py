@@ -0,0 +1,141 @@
+# http_client.py
+# Central HTTP client for every network call in src/utils.
+#
+# One keep-alive requests.Session per host, each with its own connection pool,
+# so the paginated GitHub calls and repeated HF/LLM calls reuse TCP + TLS
+# connections instead of handshaking on every request. Every request gets a
+# default timeout (per host) and advertises gzip.
+#
+# Because everything goes through here, this is also where ./run --record /
+# --replay capture and serve exchanges (see recorder.py), and where network
+# requests get retries, Retry-After handling and per-host circuit breakers
+# (see resilience.py). Replayed exchanges are served as recorded, without retries.
+# A caller can also cap concurrent requests per host for everything it runs
+# (limit_hosts; the async engine does this for its prefetch and metric threads).
+import contextlib
+import contextvars
+import threading
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.utils import recorder, resilience, tracing, usage
+from src.utils.config import get_config
+
+DEFAULT_TIMEOUT = 30
+# Hosts that need a different default timeout (seconds)
+HOST_TIMEOUTS = {
+    "genai.rcac.purdue.edu": 120,
+}
+DEFAULT_HEADERS = {
+    "Accept-Encoding": "gzip, deflate",
+}
+
+
+class HostLimits():
+    """At most limits[host] (else default) requests in flight to each host at once."""
+
+    def __init__(self, limits: Dict[str, int], default: int):
+        self.limits = dict(limits)
+        self.default = default
+        self._semaphores = {}
+        self._lock = threading.Lock()
+
+    def slot(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            sem = self._semaphores.get(host)
+            if sem is None:
+                sem = self._semaphores[host] = threading.BoundedSemaphore(self.limits.get(host, self.default))
+            return sem
+
+
+_host_limits = contextvars.ContextVar("host_limits", default=None)
+
+
+def limit_hosts(limits: Optional[HostLimits]):
+    """Apply limits to every request made in the current context (and contexts copied from it)."""
+    _host_limits.set(limits)
+
+
+class HttpClient():
+    def __init__(self, poolSize: Optional[int] = None, timeouts: Optional[Dict[str, float]] = None,
+                 defaultTimeout: float = DEFAULT_TIMEOUT, retrying: Optional[resilience.Resilience] = None):
+        # poolSize = max keep-alive connections kept per host
+        self.poolSize = poolSize if poolSize is not None else get_config().httpPoolSize
+        self.timeouts = dict(HOST_TIMEOUTS if timeouts is None else timeouts)
+        self.defaultTimeout = defaultTimeout
+        self.retrying = retrying if retrying is not None else resilience.from_env()
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def session_for(self, url: str) -> requests.Session:
+        p = urlparse(url)
+        key = f"{p.scheme}://{p.netloc.lower()}"
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = requests.Session()
+                # a few pools per adapter so redirects (e.g. HF -> CDN) don't churn the host's pool
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.poolSize)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update(DEFAULT_HEADERS)
+                self._sessions[key] = session
+            return session
+
+    def timeout_for(self, url: str) -> float:
+        return self.timeouts.get(urlparse(url).netloc.lower(), self.defaultTimeout)
+
+    def request(self, method: str, url: str, timeout=None, **kwargs) -> requests.Response:
+        host = urlparse(url).netloc.lower()
+        with tracing.span(f"{method} {host}", "http", method=method, host=host, url=url, cache_hit=False) as span:
+            replay = recorder.replayer()
+            if replay is not None:
+                response = replay.lookup(method, url, kwargs.get("json"))
+                span.set(replay=True)
+            else:
+                if timeout is None:
+                    timeout = self.timeout_for(url)
+                session = self.session_for(url)
+                limits = _host_limits.get()
+
+                def attempt(t):
+                    # each attempt holds a host slot; a backoff sleep between attempts doesn't
+                    with limits.slot(host) if limits is not None else contextlib.nullcontext():
+                        return session.request(method, url, timeout=t, **kwargs)
+
+                response = self.retrying.send(method, host, attempt, timeout)
+                record = recorder.recorder()
+                if record is not None:
+                    record.record(method, url, kwargs.get("json"), response)
+            nbytes = len(response.content or b"")
+            span.set(status=response.status_code, bytes=nbytes)
+            usage.count_request(url, nbytes)
+            return response
+
+    def close(self):
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
+_client = HttpClient()
+
+
+def get_client() -> HttpClient:
+    return _client
+
+
+def request(method: str, url: str, **kwargs) -> requests.Response:
+    return _client.request(method, url, **kwargs)
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return _client.request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    return _client.request("POST", url, **kwargs)
@@ -10,20 +10,32 @@ Usage:
 """
 
 import argparse
+import json
 import os
-from dotenv import load_dotenv, dotenv_values
+
 import requests
 
+from src.utils import http_client, llm_cache, recorder, tracing, usage
+from src.utils.config import load_env
+from src.utils.llm_scheduler import get_scheduler
+
+MODEL = "llama3.1:latest"
+DEFAULT_GENAI_API_URL = "https://genai.rcac.purdue.edu"
+
+def genai_api_url():
+    """Base URL of the GenAI service; GENAI_API_URL overrides it (e.g. the local stub server)."""
+    return (os.getenv("GENAI_API_URL") or DEFAULT_GENAI_API_URL).rstrip("/")
+
 class llmAPI():
 
-    def make_prompt(self, token, role, content):
-        url = "https://genai.rcac.purdue.edu/api/chat/completions"
+    def make_prompt(self, token, role, content, timeout=None):
+        url = f"{genai_api_url()}/api/chat/completions"
         headers = {
             "Authorization": f"Bearer {token}",
             "Content-Type": "application/json"
         }
         body = {
-            "model": "llama3.1:latest",
+            "model": MODEL,
             "messages": [
             {
                 "role": role,
@@ -32,23 +44,55 @@ class llmAPI():
             ],
             "stream": False
         }
-        response = requests.post(url, headers=headers, json=body)
+        # timeout=None uses the GenAI host's default; 5xx / 429 were already retried by http_client
+        response = http_client.post(url, headers=headers, json=body, timeout=timeout)
         if response.status_code == 200:
             return response.text
         else:
-            raise Exception(f"Error: {response.status_code}, {response.text}")
+            raise requests.HTTPError(f"Error: {response.status_code}, {response.text}", response=response)
 
-    def main(self, text):
-        # Get API key from env variable
-        load_dotenv()
+    def main(self, text, priority=None):
+        # Get API key from env variable (.env is read once per process)
+        load_env()
         api_key = os.environ.get("GEN_AI_STUDIO_API_KEY")
-        if not api_key:
+        replaying = recorder.replayer() is not None
+        if not api_key and not replaying:
             raise RuntimeError("Missing GENAI_STUDIO_TOKEN environment variable")
 
-        response = self.make_prompt(api_key, role="user", content=text)
+        key = llm_cache.make_key(MODEL, "user", text)
+        sent = []
+        with tracing.span("llm prompt", "llm", model=MODEL, prompt_chars=len(text)) as span:
+            def send(timeout=None):
+                sent.append(True)
+                answer = self.make_prompt(api_key, role="user", content=text, timeout=timeout)
+                count_tokens(answer)
+                return answer
 
+            if replaying:
+                # recorded answers: no service to rate limit and no key needed
+                response = llm_cache.get_cache().get_or_compute(key, send)
+            else:
+                # Identical prompts (same repo, same README) are answered from the cache;
+                # misses wait their turn in the scheduler (concurrency, rate limit, priority, deadline)
+                response = llm_cache.get_cache().get_or_compute(
+                    key, lambda: get_scheduler().run(send, priority=priority))
+            span.set(cache_hit=not sent, response_chars=len(response or ""))
+
+        usage.add(usage.LLM_CACHE_MISSES if sent else usage.LLM_CACHE_HITS)
+        usage.add(usage.PROMPT_CHARS, len(text))
+        usage.add(usage.RESPONSE_CHARS, len(response or ""))
         return response
 
+
+def count_tokens(response):
+    """Charge the token counts an OpenAI-style completion reports (if any) to the current usage scope."""
+    try:
+        reported = json.loads(response).get("usage") or {}
+    except (TypeError, ValueError, AttributeError):
+        return
+    usage.add(usage.PROMPT_TOKENS, int(reported.get("prompt_tokens") or 0))
+    usage.add(usage.COMPLETION_TOKENS, int(reported.get("completion_tokens") or 0))
+
 if __name__ == "__main__":
     apiTester = llmAPI()
     hfurl = "https://huggingface.co/google-bert/bert-base-uncased"
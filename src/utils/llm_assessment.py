@@ -0,0 +1,110 @@
+# llm_assessment.py
+# One combined LLM request per model for every LLM-judged metric.
+#
+# Instead of RampUpTime, CodeQuality, PerformanceClaims, BusFactor and License
+# each sending their own prompt, ModelContext asks all the questions a model
+# needs in a single structured-JSON prompt, parses the answer once, and every
+# metric reads its score from that. A metric whose answer is missing or
+# unparseable falls back to its own prompt.
+import json
+import os
+import re
+from typing import Dict, Optional
+
+from src.utils.llm_api import llmAPI
+
+QUESTIONS = {
+    "ramp_up_time": (
+        "RAMP-UP TIME: how quickly could a new engineer understand and use the project from its README? "
+        "1.0 = clear setup, examples, usage and dependencies; 0.5 = some instructions but incomplete or unclear; "
+        "0.0 = little or no usable information. Answer 1.0, 0.5 or 0.0."
+    ),
+    "code_quality": (
+        "CODE QUALITY of the linked GitHub repository (style & maintainability): consistency, naming, modularity, "
+        "comments/docstrings, type hints, tests/CI hints and readability. Answer 1.0, 0.5 or 0.0."
+    ),
+    "performance_claims": (
+        "PERFORMANCE CLAIMS: how trustworthy are the model's published benchmarks compared to similar models? "
+        "1.0 = accurate; 0.5 = slightly overexaggerated but the model still performs well; 0.0 = cannot be trusted. "
+        "Answer 1.0, 0.5 or 0.0."
+    ),
+    "bus_factor": (
+        "BUS FACTOR: based on the size of the organization/members and how evenly the work was likely split, "
+        "give a value from 0 to 1 (1 = no risk, 0 = one contributor did all the work)."
+    ),
+    "license": (
+        "LICENSE compatibility relative to LGPL-2.1, from 0 to 1: 1.0 = MIT, BSD-2/3, Apache-2.0, LGPL-2.1/3.0, "
+        "MPL-2.0, CC-BY-4.0, OpenRAIL-M; 0.0 = non-commercial (CC-BY-NC, RAIL-NC), AGPL-3.0 or terms restricting "
+        "commercial redistribution; 0.3 = unclear/unknown."
+    ),
+}
+
+_JSON_OBJECT = re.compile(r"\{.*\}", re.S)
+
+
+def batching_enabled() -> bool:
+    """LLM_BATCH=0 switches back to one prompt per metric."""
+    return os.getenv("LLM_BATCH", "1").strip().lower() not in {"0", "false", "no", "off"}
+
+
+def build_prompt(url: str, questions, readme: str = "", github_links=None) -> str:
+    lines = [
+        "You are assessing a Hugging Face model for several quality metrics at once.",
+        f"Model URL: {url}",
+        "Answer every question below. Respond with ONLY one JSON object whose keys are the "
+        "question ids and whose values are numbers in [0, 1].",
+        "",
+        "Questions:",
+    ]
+    for key in questions:
+        lines.append(f'- "{key}": {QUESTIONS[key]}')
+    if github_links:
+        lines += ["", "GitHub repository links:", *[f"- {link}" for link in github_links]]
+    if readme:
+        lines += ["", "README text:", "---", readme[:8000], "---"]
+    return "\n".join(lines)
+
+
+def _content(response: str) -> str:
+    # llmAPI returns the raw chat-completions body; the answer is the message content
+    try:
+        body = json.loads(response)
+    except (TypeError, ValueError):
+        return response or ""
+    if isinstance(body, dict) and body.get("choices"):
+        return ((body["choices"][0] or {}).get("message") or {}).get("content") or ""
+    return response
+
+
+def parse_answer(response: str, questions) -> Dict[str, float]:
+    """Scores for the asked questions; anything missing or non-numeric is left out."""
+    match = _JSON_OBJECT.search(_content(response))
+    if not match:
+        return {}
+    try:
+        answer = json.loads(match.group())
+    except ValueError:
+        return {}
+    if not isinstance(answer, dict):
+        return {}
+    scores = {}
+    for key in questions:
+        try:
+            value = float(answer[key])
+        except (KeyError, TypeError, ValueError):
+            continue
+        scores[key] = max(0.0, min(1.0, value))
+    return scores
+
+
+class LLMAssessment():
+    def __init__(self, llm: Optional[llmAPI] = None):
+        self.llm = llm if llm is not None else llmAPI()
+
+    def assess(self, url: str, questions, readme: str = "", github_links=None) -> Dict[str, float]:
+        """Ask every question in one request and return {question id: score}."""
+        questions = [q for q in questions if q in QUESTIONS]
+        if not questions:
+            return {}
+        response = self.llm.main(build_prompt(url, questions, readme, github_links))
+        return parse_answer(response, questions)
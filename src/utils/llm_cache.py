@@ -0,0 +1,202 @@
+# llm_cache.py
+# Content-addressed cache for GenAI chat responses.
+#
+# A response is keyed by sha256(model, role, prompt), so the same CodeQuality
+# prompt for a shared GitHub repo or the same RampUpTime prompt for a shared
+# README is only ever sent once. Two tiers:
+#   - memory: bounded LRU, always on (LLM_CACHE_SIZE entries, 0 disables)
+#   - disk:   SQLite file named by LLM_CACHE, size-capped with LRU eviction
+# Both honour LLM_CACHE_TTL (seconds). Identical prompts already in flight on
+# another thread wait for that answer instead of sending a second request.
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from src.utils.config import DEFAULT_LLM_CACHE_MAX_MB, DEFAULT_LLM_CACHE_SIZE, DEFAULT_LLM_CACHE_TTL, get_config
+
+DEFAULT_MEMORY_ENTRIES = DEFAULT_LLM_CACHE_SIZE
+DEFAULT_TTL = DEFAULT_LLM_CACHE_TTL
+DEFAULT_MAX_DISK_BYTES = DEFAULT_LLM_CACHE_MAX_MB * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_responses (
+    key         TEXT PRIMARY KEY,
+    response    TEXT NOT NULL,
+    expires_at  REAL NOT NULL,
+    last_access REAL NOT NULL,
+    size        INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS llm_responses_last_access ON llm_responses(last_access);
+"""
+
+
+def make_key(model: str, role: str, content: str) -> str:
+    h = hashlib.sha256()
+    for part in (model, role, content):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+class LLMCache():
+    def __init__(self, path: Optional[str] = None, maxEntries: int = DEFAULT_MEMORY_ENTRIES,
+                 ttl: float = DEFAULT_TTL, maxDiskBytes: int = DEFAULT_MAX_DISK_BYTES):
+        self.path = path
+        self.maxEntries = maxEntries
+        self.ttl = ttl
+        self.maxDiskBytes = maxDiskBytes
+        self.hits = 0
+        self.memoryHits = 0
+        self.diskHits = 0
+        self.misses = 0
+        self._memory = OrderedDict()  # key -> (expires_at, response)
+        self._inflight = {}           # key -> threading.Event
+        self._lock = threading.Lock()
+        self._conn = None
+        if path:
+            self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+
+    # ---- tiers ----
+
+    def _memory_get(self, key: str, now: float) -> Optional[str]:
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= now:
+            del self._memory[key]
+            return None
+        self._memory.move_to_end(key)
+        return entry[1]
+
+    def _memory_put(self, key: str, response: str, expires_at: float):
+        if self.maxEntries <= 0:
+            return
+        self._memory[key] = (expires_at, response)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxEntries:
+            self._memory.popitem(last=False)
+
+    def _disk_get(self, key: str, now: float):
+        if self._conn is None:
+            return None
+        row = self._conn.execute("SELECT response, expires_at FROM llm_responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        if row[1] <= now:
+            self._conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+            return None
+        self._conn.execute("UPDATE llm_responses SET last_access = ? WHERE key = ?", (now, key))
+        return row
+
+    def _disk_put(self, key: str, response: str, expires_at: float, now: float):
+        if self._conn is None:
+            return
+        size = len(response.encode("utf-8"))
+        self._conn.execute("INSERT OR REPLACE INTO llm_responses VALUES (?, ?, ?, ?, ?)",
+                           (key, response, expires_at, now, size))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_responses").fetchone()[0]
+        if total <= self.maxDiskBytes:
+            return
+        for old_key, old_size in self._conn.execute("SELECT key, size FROM llm_responses ORDER BY last_access").fetchall():
+            if total <= self.maxDiskBytes:
+                break
+            self._conn.execute("DELETE FROM llm_responses WHERE key = ?", (old_key,))
+            total -= old_size
+
+    # ---- public API ----
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            response = self._memory_get(key, now)
+            if response is not None:
+                self.hits += 1
+                self.memoryHits += 1
+                return response
+            row = self._disk_get(key, now)
+            if row is not None:
+                self.hits += 1
+                self.diskHits += 1
+                self._memory_put(key, row[0], row[1])
+                return row[0]
+            self.misses += 1
+            return None
+
+    def put(self, key: str, response: str):
+        now = time.time()
+        with self._lock:
+            self._memory_put(key, response, now + self.ttl)
+            self._disk_put(key, response, now + self.ttl, now)
+
+    def get_or_compute(self, key: str, compute: Callable[[], str]) -> str:
+        """Return the cached response for key, or run compute() once and cache it."""
+        while True:
+            cached = self.get(key)
+            if cached is not None:
+                return cached
+            with self._lock:
+                waiter = self._inflight.get(key)
+                if waiter is None:
+                    self._inflight[key] = threading.Event()
+                    break
+            # Someone else is already asking this exact prompt; wait for their answer
+            waiter.wait()
+            with self._lock:
+                self.misses -= 1  # that lookup was not a real miss, the retry will count
+
+        try:
+            response = compute()
+            self.put(key, response)
+            return response
+        finally:
+            with self._lock:
+                self._inflight.pop(key).set()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "memory_hits": self.memoryHits,
+                "disk_hits": self.diskHits,
+                "misses": self.misses,
+                "memory_entries": len(self._memory),
+            }
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM llm_responses")
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_cache = None
+_cache_settings = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> LLMCache:
+    """
+    The process-wide cache, configured from LLM_CACHE / LLM_CACHE_SIZE / LLM_CACHE_TTL /
+    LLM_CACHE_MAX_MB. A fresh (empty) cache replaces it whenever one of those changes,
+    so e.g. LLM_CACHE_SIZE=0 set after the first prompt still turns the memory tier off.
+    """
+    global _cache, _cache_settings
+    config = get_config()
+    settings = (config.llmCache, config.llmCacheSize, config.llmCacheTTL, config.llmCacheMaxBytes)
+    with _cache_lock:
+        if _cache is None or _cache_settings != settings:
+            path, maxEntries, ttl, maxDiskBytes = settings
+            _cache = LLMCache(path=path, maxEntries=maxEntries, ttl=ttl, maxDiskBytes=maxDiskBytes)
+            _cache_settings = settings
+        return _cache
@@ -0,0 +1,157 @@
+# llm_scheduler.py
+# Dispatch gate for every GenAI request.
+#
+# Parallel scoring would otherwise fire LLM prompts with no throttle and get
+# rate limited. Each request waits here for:
+#   - a concurrency slot (LLM_MAX_CONCURRENCY),
+#   - a token from a requests-per-minute bucket (LLM_RPM),
+#   - its turn in a priority queue: lower priority number first, then the
+#     lower input position, then FIFO. The batch runners set each model's
+#     position in the URL file (set_position), so the prompts of the model the
+#     ordered output is waiting on go ahead of those of models further down.
+#     The queue belongs to this process and does not reorder another ./run.
+# A request that cannot start before its deadline (LLM_DEADLINE seconds, or
+# the model's --deadline-ms budget if that ends sooner) raises
+# LLMDeadlineExceeded; once started it gets the remaining time as its timeout.
+import contextvars
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable, Optional
+
+from src.utils.config import DEFAULT_LLM_DEADLINE, DEFAULT_LLM_MAX_CONCURRENCY, DEFAULT_LLM_RPM, get_config
+from src.utils.deadline import DeadlineExceeded
+from src.utils.deadline import remaining as deadline_remaining
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BULK = 10
+
+DEFAULT_MAX_CONCURRENCY = DEFAULT_LLM_MAX_CONCURRENCY
+DEFAULT_RPM = DEFAULT_LLM_RPM
+DEFAULT_DEADLINE = DEFAULT_LLM_DEADLINE
+
+
+# Input position of the model being scored in this context (0 outside a batch)
+_position = contextvars.ContextVar("llm_position", default=0)
+
+
+def set_position(position: int):
+    """Queue the current context's prompts by this input position (within their priority)."""
+    _position.set(position)
+
+
+class LLMDeadlineExceeded(DeadlineExceeded):
+    pass
+
+
+class TokenBucket():
+    """Refills `rate` tokens per minute up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate / 60.0)
+        self._tokens = self.capacity
+        self._stamp = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._stamp) * self.rate / 60.0)
+        self._stamp = now
+
+    def delay(self) -> float:
+        """Seconds until a token is available (0 if one is available now)."""
+        if self.rate <= 0:
+            return 0.0
+        self._refill()
+        if self._tokens >= 1:
+            return 0.0
+        return (1 - self._tokens) * 60.0 / self.rate
+
+    def take(self):
+        if self.rate > 0:
+            self._tokens -= 1
+
+
+class LLMScheduler():
+    def __init__(self, maxConcurrency: int = DEFAULT_MAX_CONCURRENCY, requestsPerMinute: float = DEFAULT_RPM,
+                 deadline: Optional[float] = DEFAULT_DEADLINE, defaultPriority: int = PRIORITY_INTERACTIVE):
+        self.maxConcurrency = maxConcurrency
+        self.deadline = deadline
+        self.defaultPriority = defaultPriority
+        self._bucket = TokenBucket(requestsPerMinute)
+        self._queue = []  # heap of (priority, position, seq)
+        self._seq = itertools.count()
+        self._active = 0
+        self._cond = threading.Condition()
+
+    def _acquire(self, ticket, deadline: Optional[float]):
+        with self._cond:
+            heapq.heappush(self._queue, ticket)
+            try:
+                while True:
+                    wait = None
+                    if self._queue[0] == ticket and self._active < self.maxConcurrency:
+                        wait = self._bucket.delay()
+                        if wait <= 0:
+                            break
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            raise LLMDeadlineExceeded("LLM request could not start before its deadline")
+                        wait = remaining if wait is None else min(wait, remaining)
+                    self._cond.wait(wait)
+            except BaseException:
+                self._queue.remove(ticket)
+                heapq.heapify(self._queue)
+                self._cond.notify_all()
+                raise
+            heapq.heappop(self._queue)
+            self._bucket.take()
+            self._active += 1
+            self._cond.notify_all()  # the next in line may be able to start too
+
+    def _release(self):
+        with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+
+    def run(self, fn: Callable[[Optional[float]], object], priority: Optional[int] = None,
+            timeout: Optional[float] = None):
+        """
+        Wait for a slot, then call fn(remaining_seconds) and return its result.
+        timeout overrides the scheduler's default deadline (None = scheduler default).
+        """
+        priority = self.defaultPriority if priority is None else priority
+        budget = self.deadline if timeout is None else timeout
+        left = deadline_remaining()  # the model's own deadline (--deadline-ms) can only shorten it
+        if left is not None:
+            budget = left if budget is None else min(budget, left)
+        deadline = time.monotonic() + budget if budget is not None else None
+
+        self._acquire((priority, _position.get(), next(self._seq)), deadline)
+        try:
+            remaining = None if deadline is None else max(0.001, deadline - time.monotonic())
+            return fn(remaining)
+        finally:
+            self._release()
+
+    def queued(self) -> int:
+        with self._cond:
+            return len(self._queue)
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> LLMScheduler:
+    """The process-wide scheduler, configured from LLM_MAX_CONCURRENCY / LLM_RPM / LLM_DEADLINE."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            config = get_config()
+            _scheduler = LLMScheduler(maxConcurrency=config.llmMaxConcurrency,
+                                      requestsPerMinute=config.llmRPM, deadline=config.llmDeadline)
+        return _scheduler
+
@@ -0,0 +1,226 @@
+# logger.py
+# Structured JSON-lines logging to LOG_FILE that stays off the scoring path.
+#
+# log() and log_exception() only put a small tuple on a queue. A background
+# writer thread formats the records and appends them in batches: one write()
+# and one flush per batch, with the file kept open. Lines from parallel models
+# therefore never interleave, and there is no open/close per call. The file
+# rotates by size (run.log -> run.log.1 -> ... -> run.log.N). Every record
+# written while a model is being scored carries that model's correlation id
+# ("cid") and URL. batch_runner and the async engine open a correlation(url)
+# scope per model, and contextvars carry it to the metric threads.
+#
+# A failed write (disk full, rotation blocked) is reported once on stderr and
+# that batch is dropped; the writer keeps draining the queue and reopens the
+# file for the next batch, so logging can never stall or grow without bound.
+#
+# Nothing starts (no file, no thread) when LOG_LEVEL is 0.
+import atexit
+import contextvars
+import datetime
+import itertools
+import json
+import os
+import queue
+import sys
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from typing import Optional
+
+from src.utils.config import DEFAULT_LOG_BACKUPS, DEFAULT_LOG_MAX_KB, get_config
+
+INFO = 1
+DEBUG = 2
+
+BATCH_SIZE = 512
+
+_STOP = object()
+
+
+def _utc_iso(ts: float) -> str:
+    return datetime.datetime.fromtimestamp(ts, datetime.timezone.utc).isoformat()
+
+
+class RunLogger():
+    def __init__(self, path: str, level: int = INFO, maxBytes: int = DEFAULT_LOG_MAX_KB * 1024,
+                 backups: int = DEFAULT_LOG_BACKUPS):
+        self.path = path
+        self.level = level
+        self.maxBytes = maxBytes
+        self.backups = backups
+        self._failing = False
+        self._queue = queue.SimpleQueue()
+        self._file = open(path, "a", encoding="utf-8")
+        self._size = self._file.tell()
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def log(self, msg: str, level: int = INFO, **fields):
+        if self.level >= level:
+            self._queue.put((time.time(), level, msg, _cid.get(), fields))
+
+    def record(self, record: dict, level: int = INFO):
+        """Queue an already-built record (its own keys, plus time and cid)."""
+        if self.level >= level:
+            self._queue.put((time.time(), level, None, _cid.get(), record))
+
+    # ---- writer thread ----
+
+    def _format(self, item) -> str:
+        ts, level, msg, cid, fields = item
+        record = {"time": _utc_iso(ts), "level": level}
+        if msg is not None:
+            record["msg"] = msg
+        if cid is not None:
+            record["cid"], record["url"] = cid
+        record.update(fields)
+        return json.dumps(record, ensure_ascii=False, default=str) + "\n"
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            # drain whatever else is waiting so a burst becomes one write
+            while len(batch) < BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = any(item is _STOP for item in batch)
+            try:
+                self._write([self._format(item) for item in batch if item is not _STOP])
+                self._failing = False
+            except Exception as e:
+                self._failed(e, len(batch) - stop)
+            if stop:
+                return
+
+    def _failed(self, e: Exception, dropped: int):
+        # once per run of failures, so a full disk doesn't also flood stderr
+        if not self._failing:
+            sys.stderr.write(f"{self.path}: log write failed ({e}); dropping {dropped} record(s)\n")
+        self._failing = True
+
+    def _write(self, lines):
+        """Append lines with one write() per file, rotating wherever the size limit falls."""
+        if self._file.closed:  # a rotation failed half way
+            self._file = open(self.path, "a", encoding="utf-8")
+            self._size = self._file.tell()
+        chunk, chunkSize = [], 0
+        for line in lines:
+            size = len(line.encode("utf-8"))
+            if self.maxBytes and self._size + chunkSize and self._size + chunkSize + size > self.maxBytes:
+                self._flush(chunk, chunkSize)
+                self._rotate()
+                chunk, chunkSize = [], 0
+            chunk.append(line)
+            chunkSize += size
+        self._flush(chunk, chunkSize)
+
+    def _flush(self, chunk, chunkSize: int):
+        if not chunk:
+            return
+        self._file.write("".join(chunk))
+        self._file.flush()
+        self._size += chunkSize
+
+    def _rotate(self):
+        self._file.close()
+        if self.backups > 0:
+            for i in range(self.backups - 1, 0, -1):
+                older = f"{self.path}.{i}"
+                if os.path.exists(older):
+                    os.replace(older, f"{self.path}.{i + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        self._file = open(self.path, "w", encoding="utf-8")
+        self._size = 0
+
+    def close(self):
+        """Write everything queued so far and stop the writer."""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+        self._file.close()
+
+
+# ---- correlation ids ----
+
+_cid = contextvars.ContextVar("log_correlation", default=None)  # (cid, url)
+_cid_seq = itertools.count(1)
+
+
+@contextmanager
+def correlation(url: str):
+    """Tag every record logged in the with-block with a fresh id for url; yields the id."""
+    cid = f"{os.getpid():x}-{next(_cid_seq):06d}"
+    token = _cid.set((cid, url))
+    try:
+        yield cid
+    finally:
+        _cid.reset(token)
+
+
+# ---- process-wide logger ----
+
+_logger = None
+_lock = threading.Lock()
+
+
+def get_logger() -> Optional[RunLogger]:
+    """The logger for LOG_FILE / LOG_LEVEL, started on first use; None when LOG_LEVEL is 0."""
+    global _logger
+    if _logger is not None:
+        return _logger
+    config = get_config()
+    if config.logLevel < INFO:
+        return None
+    with _lock:
+        if _logger is None:
+            _logger = RunLogger(config.logFile, level=config.logLevel,
+                                maxBytes=config.logMaxBytes, backups=config.logBackups)
+            atexit.register(stop_logging)
+        return _logger
+
+
+def stop_logging():
+    """Flush and close the process-wide logger (also runs at exit)."""
+    global _logger
+    with _lock:
+        if _logger is not None:
+            _logger.close()
+        _logger = None
+
+
+def log(msg: str, level: int = INFO, **fields):
+    if get_config().logLevel < level:
+        return
+    logger = get_logger()
+    if logger is not None:
+        logger.log(msg, level, **fields)
+
+
+def error_record(e: BaseException, url: Optional[str] = None) -> dict:
+    tb_frames = traceback.extract_tb(e.__traceback__)
+    last = tb_frames[-1] if tb_frames else None
+    record = {
+        "error_type": e.__class__.__name__,
+        "message": str(e),
+        "filename": getattr(last, "filename", None),
+        "lineno": getattr(last, "lineno", None),
+        "function": getattr(last, "name", None),
+        "code": getattr(last, "line", None),
+        "traceback": "".join(traceback.TracebackException.from_exception(e).format()),
+    }
+    if url:
+        record["url"] = url
+    return record
+
+
+def log_exception(e: BaseException, url: Optional[str] = None):
+    """Errors are logged from LOG_LEVEL 1 (info) up."""
+    if get_config().logLevel < INFO:
+        return
+    logger = get_logger()
+    if logger is not None:
+        logger.record(error_record(e, url), INFO)
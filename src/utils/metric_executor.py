@@ -0,0 +1,47 @@
+# metric_executor.py
+# Runs the independent metrics of a ScoreCard on a bounded thread pool so a
+# model's wall time is roughly that of its slowest metric instead of the sum.
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, Dict, Optional
+
+from src.utils.config import DEFAULT_METRIC_WORKERS, get_config
+
+DEFAULT_WORKERS = DEFAULT_METRIC_WORKERS
+
+
+def default_workers() -> int:
+    """Pool size from METRIC_WORKERS (falls back to DEFAULT_WORKERS)."""
+    return get_config().metricWorkers
+
+
+class MetricExecutor():
+    def __init__(self, maxWorkers: Optional[int] = None):
+        self.maxWorkers = maxWorkers if maxWorkers is not None else default_workers()
+
+    def run(self, tasks: Dict[str, Callable[[], object]], timeout: Optional[float] = None) -> Dict[str, object]:
+        """
+        Run every task (name -> zero-arg callable) and return name -> result.
+        With one worker the tasks run inline on the calling thread. If any task
+        raises, the first failure in submission order is re-raised once all
+        tasks have finished.
+
+        With a timeout (seconds), tasks still running when it expires are left
+        out of the result and left to finish on their own: the pool is shut
+        down without waiting for them. Inline, tasks not started by then are
+        skipped.
+        """
+        if self.maxWorkers <= 1 or len(tasks) <= 1:
+            end = None if timeout is None else time.monotonic() + timeout
+            return {name: fn() for name, fn in tasks.items() if end is None or time.monotonic() < end}
+
+        workers = min(self.maxWorkers, len(tasks))
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="metric")
+        try:
+            # each task runs in a copy of the caller's context so tracing spans nest under it
+            futures = {name: pool.submit(contextvars.copy_context().run, fn) for name, fn in tasks.items()}
+            wait(futures.values(), timeout=None if timeout is None else max(0.0, timeout))
+            return {name: fut.result() for name, fut in futures.items() if fut.done()}
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
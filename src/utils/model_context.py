@@ -0,0 +1,126 @@
+# model_context.py
+# Everything the metrics need to know about one model, fetched lazily and at
+# most once, then shared by every metric of the ScoreCard (even when they run
+# on different threads).
+import threading
+
+from src.utils.get_metadata import (
+    _fetch_model_card,
+    _repo_id_from_url,
+    find_dataset_links,
+    find_github_links,
+    get_github_readme,
+)
+from src.utils.hf_api import hfAPI, thaw
+from src.utils.llm_assessment import LLMAssessment, batching_enabled
+
+
+class ModelContext():
+    def __init__(self, url: str):
+        self.url = url
+        self._values = {}
+        self._locks = {}
+        self._guard = threading.Lock()
+
+    def _once(self, key, loader):
+        """Return the cached value for key, running loader the first time only."""
+        with self._guard:
+            if key in self._values:
+                return self._values[key]
+            lock = self._locks.setdefault(key, threading.Lock())
+        # Concurrent callers wait for the first load instead of repeating it;
+        # a failed load is not cached, so the next caller retries.
+        with lock:
+            if key not in self._values:
+                self._values[key] = loader()
+        return self._values[key]
+
+    @property
+    def modelId(self) -> str:
+        return _repo_id_from_url(self.url)
+
+    @property
+    def hf_info(self):
+        """hfAPI.get_info payload for the model (read-only REST metadata)."""
+        return self._once("hf_info", lambda: hfAPI().get_info(self.url, printCLI=False))
+
+    @property
+    def info(self):
+        """
+        huggingface_hub ModelInfo (includes cardData). Built from the hf_info
+        payload, which comes from the same /api/models endpoint HfApi.model_info uses.
+        """
+        from huggingface_hub import ModelInfo  # slow import, deferred to the first model scored
+
+        return self._once("info", lambda: ModelInfo(**thaw(self.hf_info.get("data", {}))))
+
+    @property
+    def card(self):
+        return self._once("card", self._load_card)
+
+    def _load_card(self):
+        return _fetch_model_card(self.modelId)
+
+    @property
+    def readme(self) -> str:
+        card = self.card
+        return getattr(card, "text", getattr(card, "content", "")) or ""
+
+    @property
+    def github_links(self) -> list:
+        return self._once("github_links", lambda: find_github_links(self.url, info=self.info, card=self.card))
+
+    @property
+    def dataset_links(self) -> list:
+        return self._once("dataset_links", lambda: find_dataset_links(self.url, info=self.info, card=self.card))
+
+    @property
+    def github_readme(self) -> str:
+        return self._once("github_readme", self._load_github_readme)
+
+    def _load_github_readme(self) -> str:
+        try:
+            links = self.github_links
+        except Exception:
+            return ""  # get_github_readme treats a failed link lookup as "no README" too
+        return get_github_readme(self.url, links=links)
+
+    @property
+    def assessment(self) -> dict:
+        """Scores from the single combined LLM request covering every LLM-judged metric."""
+        return self._once("assessment", self._load_assessment)
+
+    def _load_assessment(self) -> dict:
+        # Ask exactly the questions whose metric would otherwise prompt on its own
+        data = self.hf_info.get("data", {})
+        try:
+            links = self.github_links
+        except Exception:
+            links = None  # the link-based metrics fail on their own in that case
+        readme = self.github_readme
+
+        questions = []
+        if readme:
+            questions.append("ramp_up_time")
+        if links:
+            questions.append("code_quality")
+        elif links is not None:
+            questions.append("bus_factor")
+        if not data.get("model-index"):
+            questions.append("performance_claims")
+        if not (data.get("cardData") or {}).get("license"):
+            questions.append("license")
+        return LLMAssessment().assess(self.url, questions, readme=readme, github_links=links)
+
+    def assessed(self, metric: str):
+        """
+        metric's score from the combined assessment, or None when batching is
+        off, the question wasn't asked, or the request failed; the metric then
+        sends its own prompt.
+        """
+        if not batching_enabled():
+            return None
+        try:
+            return self.assessment.get(metric)
+        except Exception:
+            return None
@@ -0,0 +1,93 @@
+# profiler.py
+# ./run URL_FILE --profile DIR [--profile-memory]
+#
+# Each model is scored under its own cProfile.Profile. The result is written
+# to DIR/<nnnnn>-<owner>_<model>.pstats and also merged into
+# DIR/aggregate.pstats; a top-N by cumulative time is printed to stderr at the
+# end. cProfile only sees the thread it was enabled on, and Python 3.12+
+# raises ValueError for a second profiler while one is active, so ./run
+# scores one model at a time (--jobs 1) with its metrics run serially
+# (METRIC_WORKERS=1) while profiling.
+#
+# --profile-memory also traces allocations with tracemalloc and reports the
+# top allocation sites and the peak traced memory at the end.
+import cProfile
+import io
+import itertools
+import os
+import pstats
+import re
+import sys
+import threading
+import tracemalloc
+from typing import Callable, Optional
+from urllib.parse import urlparse
+
+DEFAULT_TOP = 25
+AGGREGATE_FILE = "aggregate.pstats"
+
+
+def _slug(url: str) -> str:
+    path = urlparse(url).path.strip("/") or url
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", path)[:80]
+
+
+class RunProfiler():
+    def __init__(self, directory: str, memory: bool = False, top: int = DEFAULT_TOP):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.memory = memory
+        self.top = top
+        self.aggregate: Optional[pstats.Stats] = None
+        self._seq = itertools.count(1)
+        self._lock = threading.Lock()
+        if memory:
+            tracemalloc.start()
+
+    def wrap(self, scorer: Callable) -> Callable:
+        """scorer(url, ...) profiled per call; for batch_runner.run_ordered(scorer=...)."""
+        def profiled(url, *args):
+            return self.profile(url, scorer, url, *args)
+        return profiled
+
+    def profile(self, url: str, fn: Callable, *args):
+        prof = cProfile.Profile()
+        prof.enable()
+        try:
+            return fn(*args)
+        finally:
+            prof.disable()
+            self._save(url, prof)
+
+    def _save(self, url: str, prof: cProfile.Profile):
+        with self._lock:
+            path = os.path.join(self.directory, f"{next(self._seq):05d}-{_slug(url)}.pstats")
+            prof.dump_stats(path)
+            if self.aggregate is None:
+                self.aggregate = pstats.Stats(prof)
+            else:
+                self.aggregate.add(prof)
+
+    def finish(self, stream=None):
+        """Write aggregate.pstats and print the summaries (stderr by default)."""
+        stream = stream if stream is not None else sys.stderr
+        with self._lock:
+            if self.aggregate is not None:
+                self.aggregate.dump_stats(os.path.join(self.directory, AGGREGATE_FILE))
+                out = io.StringIO()
+                self.aggregate.stream = out
+                self.aggregate.sort_stats("cumulative").print_stats(self.top)
+                print(f"== cProfile: top {self.top} by cumulative time "
+                      f"(all models, {os.path.join(self.directory, AGGREGATE_FILE)}) ==", file=stream)
+                print(out.getvalue(), file=stream)
+        if self.memory and tracemalloc.is_tracing():
+            # leave out what the profilers themselves allocate
+            snapshot = tracemalloc.take_snapshot().filter_traces([
+                tracemalloc.Filter(False, mod.__file__) for mod in (cProfile, pstats, tracemalloc)
+            ])
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"== tracemalloc: peak {peak / 1024 / 1024:.1f} MiB, "
+                  f"still allocated {current / 1024 / 1024:.1f} MiB; top {self.top} sites ==", file=stream)
+            for stat in snapshot.statistics("lineno")[:self.top]:
+                print(f"{stat.size / 1024:10.1f} KiB {stat.count:8d} blocks  {stat.traceback}", file=stream)
@@ -0,0 +1,122 @@
+# recorder.py
+# Record / replay of every HTTP exchange made through http_client.
+#
+#   ./run URL_FILE --record DIR   saves each request + response to DIR/exchanges.ndjson
+#   ./run URL_FILE --replay DIR   serves those responses back with no network at all
+#
+# Exchanges are keyed by method, URL and a hash of the JSON body (so each LLM
+# prompt is its own entry); request headers such as Authorization are not
+# part of the key or the file. Replay loads the file once into a dict, so a
+# lookup is a hash + dict get and the pipeline's own CPU cost can be measured.
+import base64
+import hashlib
+import json
+import os
+import threading
+from typing import Optional
+
+import requests
+
+from src.utils import http_cache
+
+EXCHANGES_FILE = "exchanges.ndjson"
+# Headers that describe the wire encoding, not the (already decoded) body we store
+_DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+
+class ReplayMiss(requests.ConnectionError):
+    """No recorded exchange for this request; treated like a network failure."""
+
+
+def exchange_key(method: str, url: str, body=None) -> str:
+    key = f"{method.upper()} {url}"
+    if body is not None:
+        digest = hashlib.sha256(json.dumps(body, sort_keys=True).encode("utf-8")).hexdigest()
+        key += f" {digest}"
+    return key
+
+
+class Recorder():
+    def __init__(self, directory: str):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, EXCHANGES_FILE)
+        self._lock = threading.Lock()
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def record(self, method: str, url: str, body, response):
+        content = response.content or b""
+        try:
+            payload = {"text": content.decode("utf-8")}
+        except UnicodeDecodeError:
+            payload = {"b64": base64.b64encode(content).decode("ascii")}
+        entry = {
+            "key": exchange_key(method, url, body),
+            "url": url,
+            "status": response.status_code,
+            "headers": {k: v for k, v in response.headers.items() if k.lower() not in _DROP_HEADERS},
+            **payload,
+        }
+        line = json.dumps(entry, ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class Replayer():
+    def __init__(self, directory: str):
+        self.path = os.path.join(directory, EXCHANGES_FILE)
+        self._entries = {}
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._entries[entry["key"]] = entry  # last recording wins
+
+    def __len__(self):
+        return len(self._entries)
+
+    def lookup(self, method: str, url: str, body=None) -> "http_cache.CachedResponse":
+        entry = self._entries.get(exchange_key(method, url, body))
+        if entry is None:
+            raise ReplayMiss(f"No recorded response for {method} {url}")
+        if "text" in entry:
+            content = entry["text"].encode("utf-8")
+        else:
+            content = base64.b64decode(entry["b64"])
+        return http_cache.CachedResponse(entry["url"], entry["status"], entry["headers"], content)
+
+
+_recorder: Optional[Recorder] = None
+_replayer: Optional[Replayer] = None
+
+
+def start_recording(directory: str) -> Recorder:
+    global _recorder
+    _recorder = Recorder(directory)
+    return _recorder
+
+
+def start_replay(directory: str) -> Replayer:
+    global _replayer
+    _replayer = Replayer(directory)
+    return _replayer
+
+
+def stop():
+    global _recorder, _replayer
+    if _recorder is not None:
+        _recorder.close()
+    _recorder = None
+    _replayer = None
+
+
+def recorder() -> Optional[Recorder]:
+    return _recorder
+
+
+def replayer() -> Optional[Replayer]:
+    return _replayer
@@ -0,0 +1,237 @@
+# resilience.py
+# Retries, backoff and circuit breakers for every request made through http_client.
+#
+# Each host has a RetryPolicy (HOST_POLICIES, falling back to DEFAULT_POLICY):
+#   - Connection errors and retryable statuses (408/425/429/5xx, and GitHub's
+#     403 rate limit) are retried up to `retries` more times. Read timeouts are
+#     also retried, but only for GET/HEAD: a POST that timed out may already
+#     be running on the server. Between attempts there is exponential backoff
+#     with jitter.
+#   - Retry-After (seconds or an HTTP date) and X-RateLimit-Reset (when
+#     X-RateLimit-Remaining is 0) replace the backoff. If the server asks for
+#     more than `maxWait`, no retry is made and the caller gets the response,
+#     e.g. get_collaborators_github keeps the pages it already has.
+#   - Connecting is capped at `connectTimeout`, whatever the read timeout is.
+#     An unreachable host fails in seconds, not after the full 120s LLM timeout.
+#   - A circuit breaker per host opens after `failureThreshold` consecutive
+#     failures (connection errors, timeouts, 5xx). While it is open, calls
+#     fail at once with CircuitOpenError. After `resetTimeout` seconds one
+#     probe request is let through, and its result closes or re-opens it. A
+#     probe that ends any other way (another exception) hands the probe back.
+#
+# Under a per-model deadline (deadline.py) every attempt's timeout is cut to
+# the time left, and a retry that would start after the deadline is not made.
+#
+# Each retry is charged to usage.RETRIES and logged at LOG_LEVEL 2.
+# HTTP_RETRIES overrides `retries` for every host (0 turns retrying off).
+import email.utils
+import random
+import threading
+import time
+from typing import Callable, Dict, NamedTuple, Optional
+
+import requests
+
+from src.utils import deadline, logger, usage
+from src.utils.config import get_config
+
+TRANSIENT_STATUS = {408, 425, 429, 500, 502, 503, 504}
+SERVER_ERRORS = {500, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class RetryPolicy(NamedTuple):
+    retries: int = 2  # attempts after the first
+    backoff: float = 0.5  # first delay (seconds), doubled each attempt
+    maxBackoff: float = 8.0
+    maxWait: float = 30.0  # longest Retry-After / rate-limit reset worth sleeping for
+    connectTimeout: float = 5.0
+    failureThreshold: int = 5  # consecutive failures that open the host's circuit
+    resetTimeout: float = 30.0  # seconds an open circuit fails fast before one probe
+
+
+DEFAULT_POLICY = RetryPolicy()
+HOST_POLICIES = {
+    "api.github.com": RetryPolicy(maxWait=60.0),
+    # one retry: a prompt is expensive, and the scheduler's deadline bounds the wait anyway
+    "genai.rcac.purdue.edu": RetryPolicy(retries=1, backoff=1.0, failureThreshold=3, resetTimeout=60.0),
+}
+
+_sleep = time.sleep  # patched in tests
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised instead of sending a request to a host whose circuit is open."""
+
+
+def is_rate_limited(response) -> bool:
+    """A 429, or GitHub's 403 with no rate limit left."""
+    if response.status_code == 429:
+        return True
+    return response.status_code == 403 and (
+        response.headers.get("X-RateLimit-Remaining") == "0" or "Retry-After" in response.headers)
+
+
+def retry_after(response, now: Optional[float] = None) -> Optional[float]:
+    """Seconds the server asked us to wait (Retry-After, X-RateLimit-Reset), or None."""
+    now = time.time() if now is None else now
+    value = response.headers.get("Retry-After")
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            try:
+                return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - now)
+            except (TypeError, ValueError):
+                pass
+    reset = response.headers.get("X-RateLimit-Reset")
+    if reset and response.headers.get("X-RateLimit-Remaining") == "0":
+        try:
+            return max(0.0, float(reset) - now)
+        except ValueError:
+            pass
+    return None
+
+
+def backoff(policy: RetryPolicy, attempt: int) -> float:
+    """Delay before retry number attempt + 1: exponential, capped, jittered."""
+    return min(policy.maxBackoff, policy.backoff * 2 ** attempt) * random.uniform(0.5, 1.0)
+
+
+class CircuitBreaker():
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failureThreshold: int, resetTimeout: float):
+        self.failureThreshold = failureThreshold
+        self.resetTimeout = resetTimeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self._openedAt = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """True if a request may go out now (closed, or the single half-open probe)."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self._openedAt >= self.resetTimeout:
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failureThreshold:
+                self.state = self.OPEN
+                self._openedAt = time.monotonic()
+
+    def release(self):
+        """Give back a half-open probe that ended without an answer: the next caller probes instead."""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.OPEN
+
+    def retry_in(self) -> float:
+        with self._lock:
+            return max(0.0, self.resetTimeout - (time.monotonic() - self._openedAt))
+
+
+class Resilience():
+    def __init__(self, policies: Optional[Dict[str, RetryPolicy]] = None,
+                 default: RetryPolicy = DEFAULT_POLICY, retries: Optional[int] = None):
+        # retries, when given, overrides every policy's retry count
+        self.policies = dict(HOST_POLICIES if policies is None else policies)
+        self.default = default
+        self.retries = retries
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def policy_for(self, host: str) -> RetryPolicy:
+        policy = self.policies.get(host, self.default)
+        if self.retries is not None:
+            policy = policy._replace(retries=self.retries)
+        return policy
+
+    def breaker_for(self, host: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                policy = self.policy_for(host)
+                breaker = self._breakers[host] = CircuitBreaker(policy.failureThreshold, policy.resetTimeout)
+            return breaker
+
+    def send(self, method: str, host: str, attempt: Callable[[object], requests.Response],
+             timeout) -> requests.Response:
+        """
+        Call attempt(timeout) until it gives a response worth returning, retrying per host's policy.
+        A number timeout becomes (connect, read) so connecting can't take longer than connectTimeout.
+        Each attempt's timeout is cut to the current deadline (see deadline.py), and a retry that
+        could only start after it is not made.
+        """
+        policy = self.policy_for(host)
+        breaker = self.breaker_for(host)
+        if isinstance(timeout, (int, float)):
+            timeout = (min(policy.connectTimeout, timeout), timeout)
+        retries = 0
+        while True:
+            # out of time: fail before taking the half-open probe, not while holding it
+            capped = deadline.clamp(timeout)
+            if not breaker.allow():
+                raise CircuitOpenError(f"{host} is failing; not sending requests for another {breaker.retry_in():.0f}s")
+            final = retries >= policy.retries
+            try:
+                response = attempt(capped)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                breaker.failure()
+                sent = isinstance(e, requests.Timeout) and not isinstance(e, requests.ConnectTimeout)
+                if final or (sent and method.upper() not in IDEMPOTENT_METHODS):
+                    raise
+                delay, reason = backoff(policy, retries), e.__class__.__name__
+                if not _fits(delay):
+                    raise
+            except BaseException:
+                # e.g. ChunkedEncodingError, TooManyRedirects: no verdict on the host, but a
+                # half-open probe must not be left holding the circuit shut for good
+                breaker.release()
+                raise
+            else:
+                if response.status_code in SERVER_ERRORS:
+                    breaker.failure()
+                else:
+                    breaker.success()
+                delay = None if final else self._retry_delay(response, policy, retries)
+                if delay is None or not _fits(delay):
+                    return response
+                reason = response.status_code
+            retries += 1
+            usage.add(usage.RETRIES)
+            logger.log("Retrying request", logger.DEBUG, method=method, host=host, reason=reason,
+                       retry=retries, delay=round(delay, 3))
+            _sleep(delay)
+
+    def _retry_delay(self, response, policy: RetryPolicy, retries: int) -> Optional[float]:
+        """Seconds to wait before retrying response, or None to hand it back as is."""
+        if response.status_code not in TRANSIENT_STATUS and not is_rate_limited(response):
+            return None
+        wait = retry_after(response)
+        if wait is None:
+            return backoff(policy, retries)
+        return wait if wait <= policy.maxWait else None
+
+
+def _fits(delay: float) -> bool:
+    """True if a retry after delay seconds would still start before the deadline."""
+    left = deadline.remaining()
+    return left is None or delay < left
+
+
+def from_env() -> Resilience:
+    return Resilience(retries=get_config().httpRetries)
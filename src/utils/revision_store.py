@@ -0,0 +1,166 @@
+# revision_store.py
+# ./run URL_FILE --incremental DB
+#
+# Keeps every model's metric results in a SQLite file together with the
+# revisions of the inputs they were computed from:
+#   model   - sha (or lastModified) of the Hugging Face repo
+#   github  - head commit of the GitHub repo linked from the model card,
+#             with the repo's URL (the first link in sorted order)
+#   dataset - sha of every dataset linked from the model card
+# On the next run ScoreCard asks the store first. It recomputes only the
+# metrics whose inputs moved. For example, when only the GitHub repo has new
+# commits, BusFactor, CodeQuality and RampUpTime run again and the rest are
+# restored. A model whose inputs are all unchanged is emitted without running
+# any metric.
+#
+# Checking the revisions costs the HF metadata request (which scoring needs
+# anyway), one commits?per_page=1 request, and the dataset metadata. A
+# revision that can't be read counts as changed.
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+from src.utils.get_metadata import get_github_head
+from src.utils.hf_api import hfAPI
+
+# Bump when a metric's scoring changes, so results stored by older code are recomputed
+SCORER_VERSION = 1
+
+MODEL = "model"
+GITHUB = "github"
+DATASET = "dataset"
+
+# Which inputs each metric reads; a metric is recomputed when any of them moved
+METRIC_INPUTS = {
+    "bus_factor": (MODEL, GITHUB),
+    "dataset_quality": (MODEL, DATASET),
+    "size_score": (MODEL,),
+    "license": (MODEL,),
+    "ramp_up_time": (MODEL, GITHUB),
+    "performance_claims": (MODEL,),
+    "code_quality": (MODEL, GITHUB),
+    "dataset_and_code_score": (MODEL, DATASET, GITHUB),
+}
+
+# Metric attributes that make up a result (Size also keeps its per-device scores)
+STATE_FIELDS = ("metricScore", "metricLatency", "device_dict")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS metric_results (
+    model_id   TEXT NOT NULL,
+    metric     TEXT NOT NULL,
+    inputs     TEXT NOT NULL,
+    state      TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (model_id, metric)
+);
+"""
+
+
+def _revision(data) -> Optional[str]:
+    return data.get("sha") or data.get("lastModified")
+
+
+def revisions(context) -> Dict[str, Optional[str]]:
+    """Current revision of each input of context's model; None where it couldn't be read."""
+    revs = {MODEL: _revision(context.hf_info.get("data", {})), GITHUB: None, DATASET: None}
+    try:
+        links = context.github_links
+    except Exception:
+        links = None
+    if links:
+        # the same repo get_github_readme and BusFactor use (the first in sorted order),
+        # stored with its sha so a different linked repo counts as a change too
+        repo = sorted(links)[0]
+        sha = get_github_head(repo)
+        revs[GITHUB] = json.dumps({repo: sha}) if sha else None
+    elif links is not None:
+        revs[GITHUB] = ""
+
+    try:
+        datasets = sorted(context.dataset_links)
+        api = hfAPI()
+        # hfAPI.get_info exits on HTTP errors; that only means "unknown" here
+        shas = [_revision(api.get_info(link, printCLI=False).get("data", {})) for link in datasets]
+    except (Exception, SystemExit):
+        return revs
+    if all(shas):
+        revs[DATASET] = json.dumps(dict(zip(datasets, shas)), sort_keys=True)
+    return revs
+
+
+def metric_state(metric) -> dict:
+    return {field: getattr(metric, field) for field in STATE_FIELDS if hasattr(metric, field)}
+
+
+def restore_state(metric, state: dict):
+    for field, value in state.items():
+        setattr(metric, field, value)
+
+
+class RevisionStore():
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    @staticmethod
+    def inputs_for(metric: str, revs: Dict[str, Optional[str]]) -> Optional[str]:
+        """The key a result of metric is stored under; None when one of its inputs is unknown."""
+        deps = {dep: revs.get(dep) for dep in METRIC_INPUTS[metric]}
+        if any(value is None for value in deps.values()):
+            return None
+        return json.dumps({"version": SCORER_VERSION, **deps}, sort_keys=True)
+
+    def lookup(self, modelId: str, revs: Dict[str, Optional[str]]) -> Dict[str, dict]:
+        """metric -> stored state for every metric whose inputs are unchanged."""
+        with self._lock:
+            rows = self._conn.execute("SELECT metric, inputs, state FROM metric_results WHERE model_id = ?",
+                                      (modelId,)).fetchall()
+        found = {}
+        for metric, inputs, state in rows:
+            if metric in METRIC_INPUTS and inputs == self.inputs_for(metric, revs):
+                found[metric] = json.loads(state)
+        return found
+
+    def save(self, modelId: str, revs: Dict[str, Optional[str]], states: Dict[str, dict]):
+        now = time.time()
+        rows = []
+        for metric, state in states.items():
+            inputs = self.inputs_for(metric, revs)
+            if inputs is not None:
+                rows.append((modelId, metric, inputs, json.dumps(state), now))
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO metric_results VALUES (?, ?, ?, ?, ?)", rows)
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_store = None
+
+
+def open_store(path: str) -> RevisionStore:
+    """Make path the store ./run scores against (--incremental)."""
+    global _store
+    close_store()
+    _store = RevisionStore(path)
+    return _store
+
+
+def close_store():
+    global _store
+    if _store is not None:
+        _store.close()
+    _store = None
+
+
+def active() -> Optional[RevisionStore]:
+    return _store
@@ -0,0 +1,165 @@
+# score_store.py
+# Every NDJSON record ./run prints, kept in an indexed SQLite file so
+# dashboards and gates can read past scores without re-running the scorer.
+#
+#   SCORE_DB=scores.db ./run urls.txt     # score as usual; each record is also stored
+#   ./run query --top 10                  # best models by their latest net_score
+#   ./run query --name bert --min-score 0.5 --since 2025-01-01
+#   ./run query --history https://huggingface.co/google-bert/bert-base-uncased
+#
+# Two tables: `scores` keeps every record ever stored (history), and
+# `latest` points at the newest record of each URL (top-K and filters). Both
+# are indexed on name, net_score and time. Storing is off unless SCORE_DB
+# names a file.
+import datetime
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Iterator, Optional
+
+DEFAULT_DB = "scores.db"
+COMMIT_EVERY = 100
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id        INTEGER PRIMARY KEY AUTOINCREMENT,
+    url       TEXT NOT NULL,
+    name      TEXT NOT NULL,
+    net_score REAL NOT NULL,
+    scored_at REAL NOT NULL,
+    record    TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scores_url_time ON scores(url, scored_at);
+CREATE INDEX IF NOT EXISTS scores_name_time ON scores(name, scored_at);
+CREATE INDEX IF NOT EXISTS scores_net_score ON scores(net_score);
+CREATE INDEX IF NOT EXISTS scores_scored_at ON scores(scored_at);
+
+CREATE TABLE IF NOT EXISTS latest (
+    url       TEXT PRIMARY KEY,
+    score_id  INTEGER NOT NULL REFERENCES scores(id),
+    name      TEXT NOT NULL,
+    net_score REAL NOT NULL,
+    scored_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS latest_name ON latest(name);
+CREATE INDEX IF NOT EXISTS latest_net_score ON latest(net_score);
+CREATE INDEX IF NOT EXISTS latest_scored_at ON latest(scored_at);
+"""
+
+
+def parse_time(value: str) -> float:
+    """Epoch seconds from an ISO date/datetime (naive means UTC) or a plain number."""
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    dt = datetime.datetime.fromisoformat(value)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=datetime.timezone.utc)
+    return dt.timestamp()
+
+
+def _format_time(ts: float) -> str:
+    return datetime.datetime.fromtimestamp(ts, datetime.timezone.utc).isoformat(timespec="seconds")
+
+
+class ScoreStore():
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._unsaved = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def add(self, url: str, line: str, scoredAt: Optional[float] = None):
+        """Store one NDJSON record (as printed) for url."""
+        record = json.loads(line)
+        scoredAt = time.time() if scoredAt is None else scoredAt
+        name, net = record.get("name", ""), float(record.get("net_score", 0.0))
+        with self._lock:
+            cur = self._conn.execute(
+                "INSERT INTO scores (url, name, net_score, scored_at, record) VALUES (?, ?, ?, ?, ?)",
+                (url, name, net, scoredAt, line))
+            # an older record stored late (a backfill, a slow worker) must not replace a newer one
+            self._conn.execute(
+                "INSERT INTO latest VALUES (?, ?, ?, ?, ?) ON CONFLICT(url) DO UPDATE SET "
+                "score_id = excluded.score_id, name = excluded.name, net_score = excluded.net_score, "
+                "scored_at = excluded.scored_at WHERE excluded.scored_at >= latest.scored_at",
+                (url, cur.lastrowid, name, net, scoredAt))
+            # a batch commits in chunks rather than once per model
+            self._unsaved += 1
+            if self._unsaved >= COMMIT_EVERY:
+                self._commit()
+
+    def _commit(self):
+        self._conn.commit()
+        self._unsaved = 0
+
+    def flush(self):
+        with self._lock:
+            self._commit()
+
+    def _rows(self, sql: str, params) -> Iterator[dict]:
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        for url, scoredAt, line in rows:
+            yield {**json.loads(line), "url": url, "scored_at": _format_time(scoredAt)}
+
+    def query(self, top: Optional[int] = None, name: Optional[str] = None,
+              minScore: Optional[float] = None, maxScore: Optional[float] = None,
+              since: Optional[float] = None, until: Optional[float] = None) -> Iterator[dict]:
+        """
+        Latest record of every URL that passes the filters, best net_score
+        first. name matches the model name as a glob when it has * or ?,
+        otherwise as a substring; top caps the number of rows.
+        """
+        where, params = [], []
+        if name:
+            if any(c in name for c in "*?["):
+                where.append("l.name GLOB ?")
+                params.append(name)
+            else:
+                where.append("instr(l.name, ?) > 0")
+                params.append(name)
+        for column, op, value in (("net_score", ">=", minScore), ("net_score", "<=", maxScore),
+                                  ("scored_at", ">=", since), ("scored_at", "<", until)):
+            if value is not None:
+                where.append(f"l.{column} {op} ?")
+                params.append(value)
+        sql = ("SELECT l.url, l.scored_at, s.record FROM latest l JOIN scores s ON s.id = l.score_id"
+               + (" WHERE " + " AND ".join(where) if where else "")
+               + " ORDER BY l.net_score DESC, l.url")
+        if top is not None:
+            sql += " LIMIT ?"
+            params.append(top)
+        return self._rows(sql, params)
+
+    def history(self, key: str, limit: Optional[int] = None) -> Iterator[dict]:
+        """Every stored record for a model URL (or model name), oldest first; limit keeps the newest."""
+        sql = "SELECT url, scored_at, record FROM scores WHERE url = ? OR name = ? ORDER BY scored_at DESC, id DESC"
+        params = [key, key]
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return reversed(list(self._rows(sql, params)))
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._commit()
+                self._conn.close()
+                self._conn = None
+
+
+def db_path() -> Optional[str]:
+    """Where ./run stores records: SCORE_DB, or None when storing is off."""
+    return os.getenv("SCORE_DB") or None
+
+
+def query_path() -> str:
+    """Where ./run query reads from: SCORE_DB, else DEFAULT_DB."""
+    return os.getenv("SCORE_DB") or DEFAULT_DB
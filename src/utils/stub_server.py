@@ -0,0 +1,373 @@
+# stub_server.py
+# Local stand-in for the Hugging Face Hub, GitHub and GenAI endpoints the CLI calls.
+#
+# Every model/dataset/repo "exists": responses are synthesized deterministically
+# from the requested id, so any URL file can be scored against it. Latency,
+# 5xx errors and 429 rate limiting can be injected to load-test concurrency,
+# caching and retry behaviour without touching the real services.
+#
+#   python -m src.utils.stub_server --port 8080 --latency-ms 50 --error-rate 0.01
+#
+# then point the CLI at it with the printed HF_ENDPOINT / GITHUB_API_URL /
+# GENAI_API_URL variables. Routes:
+#   GET  /api/models/{owner}/{name}                  HF model metadata
+#   GET  /api/models/{owner}/{name}/commits/{branch} HF commit history (p, Link header)
+#   GET  /api/datasets/{owner}/{name}                HF dataset metadata
+#   GET  /{owner}/{name}/resolve/main/README.md      model card
+#        (HF ids may also be a single segment, e.g. /api/models/gpt2)
+#   GET  /github/repos/{owner}/{repo}/commits        paginated (per_page, page, Link header)
+#   GET  /github/repos/{owner}/{repo}/readme         base64 README, GitHub style
+#   POST /genai/api/chat/completions                 OpenAI-style chat completion
+import argparse
+import base64
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+LICENSES = ["apache-2.0", "mit", "bsd-3-clause", "cc-by-nc-4.0", "llama3.1", "other"]
+PIPELINES = ["text-generation", "text-classification", "fill-mask", "image-classification"]
+DEFAULT_COMMITS = 30
+HF_COMMITS_PAGE = 50  # commits per page of /api/models/{id}/commits/{branch}, like the Hub
+
+_QUESTION_RE = re.compile(r'^- "([a-z_]+)":', re.M)
+
+
+def _seed(name: str) -> int:
+    return zlib.crc32(name.encode("utf-8"))
+
+
+def _split(repo_id: str):
+    """(owner, name); a single-segment id ("gpt2") is its own owner for the synthesized links."""
+    owner, _, name = repo_id.partition("/")
+    return owner, name or owner
+
+
+def model_payload(repo_id: str) -> dict:
+    s = _seed(repo_id)
+    owner, name = _split(repo_id)
+    params = (s % 13 + 1) * 10 ** (8 + s % 3)
+    payload = {
+        "_id": f"{s:024x}",
+        "id": repo_id,
+        "modelId": repo_id,
+        "author": owner,
+        "sha": f"{s:040x}",
+        "private": False,
+        "disabled": False,
+        "gated": False,
+        "downloads": s % 500000,
+        "likes": s % 3000,
+        "pipeline_tag": PIPELINES[s % len(PIPELINES)],
+        "library_name": "transformers",
+        "tags": ["transformers", "safetensors", f"license:{LICENSES[s % len(LICENSES)]}"],
+        "cardData": {"license": LICENSES[s % len(LICENSES)], "datasets": [f"{owner}/{name}-data"]},
+        "siblings": [{"rfilename": "README.md"}, {"rfilename": "config.json"},
+                     {"rfilename": "model.safetensors"}],
+        "safetensors": {"parameters": {"F32": params}, "total": params},
+    }
+    if s % 2:
+        payload["model-index"] = [{
+            "name": name,
+            "results": [{
+                "task": {"type": payload["pipeline_tag"]},
+                "dataset": {"name": f"{name}-data", "type": f"{owner}/{name}-data"},
+                "metrics": [{"type": "accuracy", "value": round(0.5 + (s % 50) / 100, 2)}],
+            }],
+        }]
+    return payload
+
+
+def dataset_payload(repo_id: str) -> dict:
+    s = _seed(repo_id)
+    return {
+        "_id": f"{s:024x}",
+        "id": repo_id,
+        "author": repo_id.partition("/")[0],
+        "sha": f"{s:040x}",
+        "private": False,
+        "downloads": s % 200000,
+        "likes": s % 800,
+        "license": LICENSES[s % len(LICENSES)],
+        "cardData": {"license": LICENSES[s % len(LICENSES)], "task_categories": ["text-classification"]},
+        "tags": ["size_categories:10K<n<100K"],
+    }
+
+
+def model_card(repo_id: str) -> str:
+    owner, name = _split(repo_id)
+    return "\n".join([
+        "---",
+        f"license: {LICENSES[_seed(repo_id) % len(LICENSES)]}",
+        "---",
+        f"# {name}",
+        "",
+        f"{name} is a synthetic model served by the local stub server.",
+        "",
+        "## Usage",
+        "```python",
+        "from transformers import pipeline",
+        f'pipe = pipeline(model="{repo_id}")',
+        "```",
+        "",
+        "Code:",
+        f"https://github.com/{owner}/{name}",
+        "",
+        "Training data:",
+        f"https://huggingface.co/datasets/{owner}/{name}-data",
+        "",
+    ])
+
+
+def github_readme(owner: str, repo: str) -> str:
+    return f"# {repo}\n\nInstall with `pip install {repo}` and see examples/ for usage.\n"
+
+
+def commits(owner: str, repo: str, total: int) -> list:
+    s = _seed(f"{owner}/{repo}")
+    authors = 1 + s % 6
+    out = []
+    for i in range(total):
+        who = f"dev{(i * 7 + s) % authors}"
+        out.append({
+            "sha": f"{zlib.crc32(f'{owner}/{repo}/{i}'.encode()):040x}",
+            "commit": {"author": {"name": who, "email": f"{who}@example.com"}, "message": f"commit {i}"},
+            "author": {"login": who},
+        })
+    return out
+
+
+def hf_commits(repo_id: str, total: int) -> list:
+    """Hub-style commit history (what HfApi.list_repo_commits pages through), newest first."""
+    s = _seed(repo_id)
+    authors = 1 + s % 6
+    out = []
+    for i in range(total):
+        who = f"dev{(i * 7 + s) % authors}"
+        out.append({
+            "id": f"{zlib.crc32(f'{repo_id}/{i}'.encode()):040x}",
+            "title": f"commit {i}",
+            "message": f"commit {i}\n",
+            "authors": [{"user": who}],
+            "date": f"2024-01-{28 - i % 28:02d}T00:00:00.000Z",
+        })
+    return out
+
+
+def chat_answer(prompt: str) -> str:
+    """Scores for every question id in a combined prompt, else a single number."""
+    ids = _QUESTION_RE.findall(prompt)
+    choices = (0.0, 0.5, 1.0)
+    if ids:
+        return json.dumps({k: choices[_seed(prompt + k) % 3] for k in ids})
+    return str(choices[_seed(prompt) % 3])
+
+
+class StubServer():
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0, jitter: float = 0.0,
+                 errorRate: float = 0.0, rateLimitRate: float = 0.0, commitsPerRepo: int = DEFAULT_COMMITS,
+                 seed: int = 0):
+        # latency/jitter in seconds; errorRate/rateLimitRate are per-request probabilities
+        self.latency = latency
+        self.jitter = jitter
+        self.errorRate = errorRate
+        self.rateLimitRate = rateLimitRate
+        self.commitsPerRepo = commitsPerRepo
+        self.counts = Counter()  # requests served per route
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._httpd = ThreadingHTTPServer((host, port), _handler_for(self))
+        self._httpd.daemon_threads = True
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def env(self) -> dict:
+        """Environment variables that point the CLI at this server."""
+        return {
+            "HF_ENDPOINT": self.base_url,
+            "GITHUB_API_URL": f"{self.base_url}/github",
+            "GENAI_API_URL": f"{self.base_url}/genai",
+        }
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="stub-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _fault(self):
+        """(delay seconds, injected status or None) for the next request."""
+        with self._lock:
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+            roll = self._random.random()
+        if roll < self.rateLimitRate:
+            return delay, 429
+        if roll < self.rateLimitRate + self.errorRate:
+            return delay, 500
+        return delay, None
+
+    def _count(self, route: str):
+        with self._lock:
+            self.counts[route] += 1
+
+
+def _handler_for(server: StubServer):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like the real services
+        disable_nagle_algorithm = True  # headers and body are separate writes; don't stall on delayed ACKs
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status: int, body, contentType: str = "application/json", headers=None):
+            if not isinstance(body, (bytes, str)):
+                body = json.dumps(body)
+            if isinstance(body, str):
+                body = body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", contentType)
+            self.send_header("Content-Length", str(len(body)))
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _injected(self) -> bool:
+            delay, status = server._fault()
+            if delay:
+                time.sleep(delay)
+            if status == 429:
+                self._send(429, {"error": "rate limited"}, headers={"Retry-After": "1"})
+                return True
+            if status is not None:
+                self._send(status, {"error": "injected failure"})
+                return True
+            return False
+
+        def do_GET(self):
+            parsed = urlparse(self.path)
+            path, query = parsed.path, parse_qs(parsed.query)
+            parts = [p for p in path.split("/") if p]
+
+            # HF repo ids are "owner/name" or a single segment ("gpt2")
+            if parts[:2] == ["api", "models"] and len(parts) in (5, 6) and parts[-2] == "commits":
+                route, handler = "hf_commits", lambda: self._hf_commits("/".join(parts[2:-2]), parts[-1], query)
+            elif parts[:2] == ["api", "models"] and len(parts) in (3, 4):
+                route, handler = "hf_model", lambda: self._send(200, model_payload("/".join(parts[2:])))
+            elif parts[:2] == ["api", "datasets"] and len(parts) in (3, 4):
+                route, handler = "hf_dataset", lambda: self._send(200, dataset_payload("/".join(parts[2:])))
+            elif len(parts) in (4, 5) and parts[-3:] == ["resolve", "main", "README.md"]:
+                route, handler = "hf_readme", lambda: self._send(
+                    200, model_card("/".join(parts[:-3])), "text/plain; charset=utf-8")
+            elif parts[:2] == ["github", "repos"] and len(parts) == 5 and parts[4] == "commits":
+                route, handler = "github_commits", lambda: self._commits(parts[2], parts[3], query)
+            elif parts[:2] == ["github", "repos"] and len(parts) == 5 and parts[4] == "readme":
+                content = base64.b64encode(github_readme(parts[2], parts[3]).encode("utf-8")).decode("ascii")
+                route, handler = "github_readme", lambda: self._send(
+                    200, {"name": "README.md", "encoding": "base64", "content": content})
+            else:
+                self._send(404, {"error": "not found"})
+                return
+
+            server._count(route)
+            if not self._injected():
+                handler()
+
+        def _commits(self, owner: str, repo: str, query):
+            perPage = max(1, min(100, int(query.get("per_page", ["30"])[0])))
+            page = max(1, int(query.get("page", ["1"])[0]))
+            everything = commits(owner, repo, server.commitsPerRepo)
+            chunk = everything[(page - 1) * perPage: page * perPage]
+            headers = {}
+            if page * perPage < len(everything):
+                nxt = f"{server.base_url}/github/repos/{owner}/{repo}/commits?per_page={perPage}&page={page + 1}"
+                headers["Link"] = f'<{nxt}>; rel="next"'
+            self._send(200, chunk, headers=headers)
+
+        def _hf_commits(self, repoId: str, branch: str, query):
+            page = max(0, int(query.get("p", ["0"])[0]))  # the Hub's pages start at 0
+            everything = hf_commits(f"{repoId}@{branch}", server.commitsPerRepo)
+            chunk = everything[page * HF_COMMITS_PAGE: (page + 1) * HF_COMMITS_PAGE]
+            headers = {}
+            if (page + 1) * HF_COMMITS_PAGE < len(everything):
+                headers["Link"] = f'<{server.base_url}/api/models/{repoId}/commits/{branch}?p={page + 1}>; rel="next"'
+            self._send(200, chunk, headers=headers)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length) if length else b""
+            if urlparse(self.path).path != "/genai/api/chat/completions":
+                self._send(404, {"error": "not found"})
+                return
+
+            server._count("genai_chat")
+            if self._injected():
+                return
+            try:
+                body = json.loads(raw or b"{}")
+                prompt = "\n".join(m.get("content", "") for m in body.get("messages", []))
+            except (ValueError, AttributeError):
+                self._send(400, {"error": "invalid JSON"})
+                return
+            answer = chat_answer(prompt)
+            self._send(200, {
+                "id": f"chatcmpl-{_seed(prompt):08x}",
+                "object": "chat.completion",
+                "model": body.get("model"),
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": answer}}],
+                # rough 4-characters-per-token estimate, like the real service reports
+                "usage": {"prompt_tokens": len(prompt) // 4 + 1, "completion_tokens": len(answer) // 4 + 1},
+            })
+
+    return Handler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stand-in HF Hub / GitHub / GenAI server for load testing.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="added to every response")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="extra random latency, uniform in [0, jitter]")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with a 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction of requests answered with a 429")
+    parser.add_argument("--commits", type=int, default=DEFAULT_COMMITS, help="commits per GitHub repo")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    server = StubServer(args.host, args.port, latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000,
+                        errorRate=args.error_rate, rateLimitRate=args.rate_limit_rate,
+                        commitsPerRepo=args.commits, seed=args.seed)
+    for k, v in server.env().items():
+        print(f"export {k}={v}")
+    print("export GEN_AI_STUDIO_API_KEY=stub", flush=True)
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
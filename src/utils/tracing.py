@@ -0,0 +1,193 @@
+# tracing.py
+# Hierarchical timing spans: URL -> metric -> HTTP request / LLM prompt.
+#
+#   with tracing.span("GET huggingface.co", "http", host=...) as s:
+#       ...
+#       s.set(status=200, bytes=1234)
+#
+# The current span lives in a contextvar, so nesting follows the call stack.
+# Work handed to another thread must run inside contextvars.copy_context() to
+# stay under its parent (MetricExecutor, batch_runner and AsyncEngine do that).
+# Tracing is off unless start_tracing() was called (./run --trace FILE); then
+# span() is a no-op costing one global lookup. Finished spans can be written as
+# Chrome trace-event JSON (chrome://tracing, Perfetto) or OTLP/JSON.
+import contextvars
+import json
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, List, Optional
+
+SERVICE_NAME = "ece461-cli"
+
+
+class Span():
+    __slots__ = ("name", "category", "attrs", "traceId", "spanId", "parentId", "start", "end",
+                 "threadId", "threadName")
+
+    def __init__(self, name: str, category: str, attrs: dict, parent: Optional["Span"]):
+        self.name = name
+        self.category = category
+        self.attrs = attrs
+        self.spanId = random.getrandbits(64) or 1
+        self.parentId = parent.spanId if parent is not None else None
+        self.traceId = parent.traceId if parent is not None else random.getrandbits(128) or 1
+        thread = threading.current_thread()
+        self.threadId = thread.ident
+        self.threadName = thread.name
+        self.start = time.perf_counter_ns()
+        self.end = None
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    @property
+    def duration(self) -> int:
+        return (self.end or time.perf_counter_ns()) - self.start
+
+
+class _NoopSpan():
+    def set(self, **attrs):
+        pass
+
+
+_NOOP = _NoopSpan()
+_current = contextvars.ContextVar("tracing_span", default=None)
+
+
+class Tracer():
+    def __init__(self):
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+        # perf_counter_ns is monotonic but has no epoch; anchor it once for wall-clock exports
+        self._epoch = time.time_ns() - time.perf_counter_ns()
+
+    def finish(self, span: Span):
+        span.end = time.perf_counter_ns()
+        with self._lock:
+            self.spans.append(span)
+
+    def finished(self) -> List[Span]:
+        with self._lock:
+            return sorted(self.spans, key=lambda s: s.start)
+
+    def to_chrome(self) -> dict:
+        """Chrome trace-event format: one complete ("X") event per span, one row per thread."""
+        pid = os.getpid()
+        spans = self.finished()
+        t0 = spans[0].start if spans else 0
+        events = []
+        threads = {}
+        for s in spans:
+            threads[s.threadId] = s.threadName
+            args = dict(s.attrs, span_id=f"{s.spanId:016x}")
+            if s.parentId is not None:
+                args["parent_id"] = f"{s.parentId:016x}"
+            events.append({
+                "name": s.name, "cat": s.category, "ph": "X", "pid": pid, "tid": s.threadId,
+                "ts": (s.start - t0) / 1000, "dur": (s.end - s.start) / 1000, "args": args,
+            })
+        for tid, name in threads.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def to_otel(self) -> dict:
+        """OTLP/JSON (the body of an OTLP HTTP trace export)."""
+        spans = []
+        for s in self.finished():
+            span = {
+                "traceId": f"{s.traceId:032x}",
+                "spanId": f"{s.spanId:016x}",
+                "name": s.name,
+                "kind": 3 if s.category in ("http", "llm") else 1,  # CLIENT / INTERNAL
+                "startTimeUnixNano": str(self._epoch + s.start),
+                "endTimeUnixNano": str(self._epoch + s.end),
+                "attributes": [_otel_attr("category", s.category), _otel_attr("thread.name", s.threadName)]
+                              + [_otel_attr(k, v) for k, v in s.attrs.items()],
+            }
+            if s.parentId is not None:
+                span["parentSpanId"] = f"{s.parentId:016x}"
+            spans.append(span)
+        return {"resourceSpans": [{
+            "resource": {"attributes": [_otel_attr("service.name", SERVICE_NAME)]},
+            "scopeSpans": [{"scope": {"name": "src.utils.tracing"}, "spans": spans}],
+        }]}
+
+
+def _otel_attr(key: str, value) -> dict:
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+
+_tracer: Optional[Tracer] = None
+
+
+def start_tracing() -> Tracer:
+    global _tracer
+    _tracer = Tracer()
+    return _tracer
+
+
+def stop_tracing() -> Optional[Tracer]:
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+
+def get_tracer() -> Optional[Tracer]:
+    return _tracer
+
+
+def enabled() -> bool:
+    return _tracer is not None
+
+
+@contextmanager
+def span(name: str, category: str = "internal", **attrs):
+    """Time the with-block as a child of the current span; yields the span for set()."""
+    tracer = _tracer
+    if tracer is None:
+        yield _NOOP
+        return
+    s = Span(name, category, attrs, _current.get())
+    token = _current.set(s)
+    try:
+        yield s
+    except BaseException as e:
+        s.set(error=type(e).__name__)
+        raise
+    finally:
+        _current.reset(token)
+        tracer.finish(s)
+
+
+def traced(name: str, category: str, fn: Callable, **attrs) -> Callable:
+    """fn wrapped so each call runs inside its own span."""
+    def wrapper(*args, **kwargs):
+        with span(name, category, **attrs):
+            return fn(*args, **kwargs)
+    return wrapper
+
+
+def write_trace(path: str, tracer: Optional[Tracer] = None):
+    """
+    Write the Chrome trace to path and the OTLP/JSON export next to it
+    (trace.json -> trace.otel.json).
+    """
+    tracer = tracer or _tracer
+    if tracer is None:
+        return
+    root, ext = os.path.splitext(path)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(tracer.to_chrome(), f)
+    with open(f"{root}.otel{ext or '.json'}", "w", encoding="utf-8") as f:
+        json.dump(tracer.to_otel(), f)
@@ -0,0 +1,152 @@
+# usage.py
+# Per-URL, per-metric cost counters: requests per service, bytes, LLM prompt /
+# response size and tokens, cache hits and misses, retries.
+#
+# batch_runner opens a UsageRecord per model (usage.scope) and ScoreCard runs
+# each metric under usage.attributed(name, ...), so an add() anywhere below is
+# charged to the right model and metric through contextvars. Work done before
+# the metrics start (URL check, metadata prefetch) is charged to "setup".
+# Collection is off unless ./run is given --usage (counters embedded in each
+# NDJSON record as "usage") or --stats FILE (one JSON line per model in FILE).
+import contextvars
+import json
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from typing import Callable, Optional
+from urllib.parse import urlparse
+
+SETUP = "setup"
+
+# Counter names
+HF_REQUESTS = "hf_requests"
+GITHUB_REQUESTS = "github_requests"
+LLM_REQUESTS = "llm_requests"
+OTHER_REQUESTS = "other_requests"
+BYTES_DOWNLOADED = "bytes_downloaded"
+HTTP_CACHE_HITS = "http_cache_hits"
+HTTP_CACHE_MISSES = "http_cache_misses"
+LLM_CACHE_HITS = "llm_cache_hits"
+LLM_CACHE_MISSES = "llm_cache_misses"
+PROMPT_CHARS = "prompt_chars"
+RESPONSE_CHARS = "response_chars"
+PROMPT_TOKENS = "prompt_tokens"
+COMPLETION_TOKENS = "completion_tokens"
+RETRIES = "retries"
+
+
+class UsageRecord():
+    def __init__(self, url: str):
+        self.url = url
+        self.metrics = {}  # metric name -> Counter
+        self._lock = threading.Lock()
+
+    def add(self, metric: str, key: str, n: int = 1):
+        with self._lock:
+            self.metrics.setdefault(metric, Counter())[key] += n
+
+    def total(self) -> Counter:
+        with self._lock:
+            return sum(self.metrics.values(), Counter())
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            metrics = {name: dict(sorted(c.items())) for name, c in sorted(self.metrics.items())}
+        return {"total": dict(sorted(sum((Counter(c) for c in metrics.values()), Counter()).items())),
+                "metrics": metrics}
+
+
+_record = contextvars.ContextVar("usage_record", default=None)
+_metric = contextvars.ContextVar("usage_metric", default=SETUP)
+
+_enabled = False
+_embed = False
+_stats_file = None
+_stats_lock = threading.Lock()
+
+
+def start_usage(embed: bool = False, statsPath: Optional[str] = None):
+    """Turn collection on; embed puts counters in the NDJSON, statsPath writes them to a side file."""
+    global _enabled, _embed, _stats_file
+    stop_usage()
+    _enabled = True
+    _embed = embed
+    if statsPath:
+        _stats_file = open(statsPath, "w", encoding="utf-8")
+
+
+def stop_usage():
+    global _enabled, _embed, _stats_file
+    with _stats_lock:
+        if _stats_file is not None:
+            _stats_file.close()
+        _stats_file = None
+    _enabled = False
+    _embed = False
+
+
+def embedding() -> bool:
+    return _embed
+
+
+@contextmanager
+def scope(url: str):
+    """Charge everything in the with-block to url; yields its UsageRecord (None when off)."""
+    if not _enabled:
+        yield None
+        return
+    record = UsageRecord(url)
+    token = _record.set(record)
+    try:
+        yield record
+    finally:
+        _record.reset(token)
+        _write_stats(record)
+
+
+def attributed(metric: str, fn: Callable) -> Callable:
+    """fn wrapped so usage inside each call is charged to metric."""
+    def wrapper(*args, **kwargs):
+        token = _metric.set(metric)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _metric.reset(token)
+    return wrapper
+
+
+def add(key: str, n: int = 1):
+    record = _record.get()
+    if record is not None and n:
+        record.add(_metric.get(), key, n)
+
+
+def service_for(url: str) -> str:
+    """Request counter for url: HF Hub, GitHub API, GenAI, or other."""
+    from src.utils.get_metadata import github_api_url
+    from src.utils.hf_api import hf_endpoint
+    from src.utils.llm_api import genai_api_url
+
+    # most specific first: the stub server serves all three under one host
+    if url.startswith(genai_api_url()):
+        return LLM_REQUESTS
+    if url.startswith(github_api_url()):
+        return GITHUB_REQUESTS
+    if url.startswith(hf_endpoint()) or urlparse(url).netloc.lower().endswith("huggingface.co"):
+        return HF_REQUESTS
+    return OTHER_REQUESTS
+
+
+def count_request(url: str, nbytes: int):
+    if _record.get() is None:
+        return
+    add(service_for(url))
+    add(BYTES_DOWNLOADED, nbytes)
+
+
+def _write_stats(record: UsageRecord):
+    with _stats_lock:
+        if _stats_file is None:
+            return
+        _stats_file.write(json.dumps({"url": record.url, **record.to_dict()}, separators=(",", ":")) + "\n")
+        _stats_file.flush()
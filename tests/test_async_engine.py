@@ -0,0 +1,158 @@
+import asyncio
+import sys
+import threading
+import time
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.utils import http_client
+from src.utils.async_engine import AsyncEngine
+
+
+class _Ctx:
+    """Stand-in ModelContext that records which fields were loaded."""
+    def __init__(self):
+        self.loaded = []
+
+    @property
+    def hf_info(self):
+        self.loaded.append("hf_info")
+        return {"data": {}}
+
+    @property
+    def card(self):
+        self.loaded.append("card")
+        return "card"
+
+    @property
+    def dataset_links(self):
+        return ["https://huggingface.co/datasets/org/d"]
+
+    @property
+    def github_readme(self):
+        self.loaded.append("github_readme")
+        return "# readme"
+
+
+class TestAsyncEngine(unittest.TestCase):
+    def test_host_semaphore_caps_concurrency(self):
+        engine = AsyncEngine(hostLimits={"h": 2}, ioThreads=8)
+        lock = threading.Lock()
+        state = {"now": 0, "peak": 0}
+
+        def blocking():
+            with lock:
+                state["now"] += 1
+                state["peak"] = max(state["peak"], state["now"])
+            time.sleep(0.03)
+            with lock:
+                state["now"] -= 1
+
+        async def main():
+            await asyncio.gather(*(engine.call("h", blocking) for _ in range(6)))
+
+        asyncio.run(main())
+        engine.close()
+        self.assertEqual(state["peak"], 2)
+
+    @patch("requests.Session.request")
+    def test_metric_requests_share_the_host_limits(self, mreq):
+        lock = threading.Lock()
+        state = {"now": 0, "peak": 0}
+
+        def request(*_args, **_kwargs):
+            with lock:
+                state["now"] += 1
+                state["peak"] = max(state["peak"], state["now"])
+            time.sleep(0.03)
+            with lock:
+                state["now"] -= 1
+            return MagicMock(status_code=200, content=b"{}")
+
+        mreq.side_effect = request
+        engine = AsyncEngine(hostLimits={"api.github.com": 2}, ioThreads=8)
+        # metric tasks run unsemaphored on the executor; their requests still wait for a host slot
+        tasks = {f"m{i}": lambda: http_client.get("https://api.github.com/repos/o/r/commits") for i in range(6)}
+        asyncio.run(engine.run_metrics(tasks))
+        engine.close()
+        self.assertEqual(state["peak"], 2)
+        http_client.get("https://api.github.com/repos/o/r/commits")  # outside the engine: no limit to take
+
+    @patch("src.utils.async_engine.hfAPI")
+    def test_prefetch_warms_context_and_datasets(self, mhf):
+        engine = AsyncEngine()
+        ctx = _Ctx()
+        asyncio.run(engine.prefetch(ctx))
+        engine.close()
+        self.assertEqual(sorted(ctx.loaded), ["card", "github_readme", "hf_info"])
+        mhf.return_value.get_info.assert_called_once_with("https://huggingface.co/datasets/org/d", False)
+
+    def test_score_ordered_emits_in_input_order(self):
+        class _Engine(AsyncEngine):
+            async def score_line(self, url, delay, _gh):
+                await asyncio.sleep(delay)
+                return url
+
+        engine = _Engine()
+        out = []
+        items = [(f"m{i}", 0.01 * (5 - i), None) for i in range(6)]
+        asyncio.run(engine.score_ordered(items, inFlight=3, emit=lambda url, task: out.append(task.result())))
+        engine.close()
+        self.assertEqual(out, [f"m{i}" for i in range(6)])
+
+    def test_finished_models_are_emitted_while_the_input_blocks(self):
+        class _Engine(AsyncEngine):
+            async def score_line(self, url, _ds, _gh):
+                return url
+
+        more = threading.Event()
+        threading.Timer(2.0, more.set).start()
+
+        def items():
+            yield ("m0", None, None)
+            more.wait()
+            yield ("m1", None, None)
+
+        engine = _Engine()
+        t0 = time.perf_counter()
+        emitted = {}
+
+        def emit(url, task):
+            emitted[url] = time.perf_counter() - t0
+            more.set()
+
+        asyncio.run(engine.score_ordered(items(), inFlight=4, emit=emit))
+        engine.close()
+        self.assertEqual(list(emitted), ["m0", "m1"])
+        self.assertLess(emitted["m0"], 1.0)
+
+    def test_sys_exit_in_a_blocking_call_fails_only_that_call(self):
+        def exits():
+            try:
+                raise ValueError("404 for model")
+            except ValueError:
+                sys.exit(1)  # what hfAPI.get_info does on HTTP errors
+
+        engine = AsyncEngine()
+        with self.assertRaises(RuntimeError) as ctx:
+            asyncio.run(engine.call(None, exits))
+        engine.close()
+        self.assertIsInstance(ctx.exception.__cause__, SystemExit)
+        self.assertIn("404 for model", str(ctx.exception))
+
+    @patch("src.classes.ScoreCard.ScoreCard.score", new_callable=AsyncMock)
+    @patch("src.utils.check_url.checkURL", return_value=True)
+    def test_score_line_passes_dataset_and_github_to_scorecard(self, _mcheck, mscore):
+        mscore.return_value = MagicMock()
+        engine = AsyncEngine()
+        asyncio.run(engine.score_line("https://huggingface.co/org/m", "https://huggingface.co/datasets/org/d",
+                                      "https://github.com/org/c"))
+        engine.close()
+        kwargs = mscore.call_args.kwargs
+        self.assertEqual(kwargs["datasetURL"], "https://huggingface.co/datasets/org/d")
+        self.assertEqual(kwargs["githubURL"], "https://github.com/org/c")
+        mscore.return_value.setGithubURL.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import io
+import json
+import unittest
+from unittest.mock import MagicMock
+
+import requests
+
+from src.utils.batch_errors import EXIT_FAILED, EXIT_OK, EXIT_PARTIAL, BatchReport, is_transient
+from src.utils.batch_runner import run_ordered
+from src.utils.recorder import ReplayMiss
+from src.utils.resilience import CircuitOpenError
+
+
+def http_error(status, headers=None):
+    err = requests.HTTPError(f"{status} error")
+    err.response = MagicMock(status_code=status, headers=headers or {})
+    return err
+
+
+def exited_after(exc):
+    """A SystemExit raised while handling exc, like hfAPI.get_info's."""
+    try:
+        raise exc
+    except Exception:
+        try:
+            raise SystemExit(1)
+        except SystemExit as e:
+            return e
+
+
+class TestIsTransient(unittest.TestCase):
+    def test_classification(self):
+        self.assertTrue(is_transient(requests.ConnectionError("reset")))
+        self.assertTrue(is_transient(requests.Timeout()))
+        self.assertTrue(is_transient(http_error(503)))
+        self.assertTrue(is_transient(http_error(429)))
+        self.assertFalse(is_transient(http_error(404)))
+        self.assertTrue(is_transient(http_error(403, {"X-RateLimit-Remaining": "0"})))
+        self.assertFalse(is_transient(http_error(403)))
+        self.assertTrue(is_transient(CircuitOpenError("host down")))
+        self.assertFalse(is_transient(ValueError("bad url")))
+        self.assertFalse(is_transient(ReplayMiss("not recorded")))
+        self.assertTrue(is_transient(exited_after(http_error(502))))
+        self.assertFalse(is_transient(exited_after(http_error(401))))
+
+
+class TestBatchReport(unittest.TestCase):
+    def setUp(self):
+        self.printed = []
+        self.calls = {}
+
+    def _scorer(self, url, failures, _gh):
+        """Raises the first len(failures) calls for url, then scores it."""
+        n = self.calls[url] = self.calls.get(url, 0) + 1
+        if n <= len(failures):
+            raise failures[n - 1]
+        return json.dumps({"name": url})
+
+    def _run(self, items, retries=2, jobs=2):
+        self.errors = io.StringIO()
+        report = BatchReport(lambda url, line: self.printed.append(url), stream=self.errors,
+                             retries=retries, backoff=0)
+        for url, fut in run_ordered(report.track(items), jobs=jobs, scorer=self._scorer):
+            report.emit(url, fut)
+        while report.pending_retries():
+            for url, fut in run_ordered(report.next_round(), jobs=jobs, scorer=self._scorer):
+                report.emit(url, fut)
+        code = report.finish()
+        records = [json.loads(line) for line in self.errors.getvalue().splitlines()]
+        return code, records[:-1], records[-1]["summary"]
+
+    def test_failures_are_reported_and_transient_ones_retried(self):
+        items = [("a", [], None), ("flaky", [requests.ConnectionError("reset")], None),
+                 ("bad", [ValueError("no such model")], None), ("c", [], None)]
+        code, errors, summary = self._run(items)
+
+        self.assertEqual(code, EXIT_PARTIAL)
+        self.assertEqual(self.printed, ["a", "c", "flaky"])  # the retried model comes after the main pass
+        self.assertEqual([(e["url"], e["transient"], e["will_retry"]) for e in errors],
+                         [("flaky", True, True), ("bad", False, False)])
+        self.assertEqual(summary, {"models": 4, "scored": 3, "failed": 1, "retried": 1, "recovered": 1})
+
+    def test_retries_are_bounded(self):
+        down = [requests.ConnectionError("down")] * 5
+        code, errors, summary = self._run([("x", down, None), ("y", [], None)], retries=2)
+        self.assertEqual([e["attempt"] for e in errors], [1, 2, 3])
+        self.assertFalse(errors[-1]["will_retry"])
+        self.assertEqual(self.calls["x"], 3)
+        self.assertEqual((code, summary["failed"]), (EXIT_PARTIAL, 1))
+
+    def test_exit_status(self):
+        self.assertEqual(self._run([("a", [], None)])[0], EXIT_OK)
+        self.assertEqual(self._run([("z", [ValueError()], None)], jobs=1)[0], EXIT_FAILED)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+import gzip
+import io
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from src.utils import llm_scheduler
+from src.utils.batch_runner import iter_models, iter_urls, open_url_file, run_ordered, score_model
+
+URL_TEXT = "https://github.com/org/code,https://huggingface.co/datasets/org/data,https://huggingface.co/org/a\n,,https://huggingface.co/org/b\n"
+
+
+class IterModelsTests(unittest.TestCase):
+    def test_recent_dataset_and_github_become_context(self):
+        urls = [
+            "https://github.com/org/code",
+            "https://huggingface.co/datasets/org/data",
+            "https://huggingface.co/org/model-a",
+            "",
+            "https://huggingface.co/org/model-b",
+            "https://github.com/org/other",
+            "https://huggingface.co/org/model-c",
+        ]
+        self.assertEqual(list(iter_models(urls)), [
+            ("https://huggingface.co/org/model-a", "https://huggingface.co/datasets/org/data", "https://github.com/org/code"),
+            ("https://huggingface.co/org/model-b", "https://huggingface.co/datasets/org/data", "https://github.com/org/code"),
+            ("https://huggingface.co/org/model-c", "https://huggingface.co/datasets/org/data", "https://github.com/org/other"),
+        ])
+
+    def test_model_without_context(self):
+        self.assertEqual(list(iter_models(["https://huggingface.co/org/m"])),
+                         [("https://huggingface.co/org/m", None, None)])
+
+    @patch("src.classes.ScoreCard.ScoreCard")
+    @patch("src.utils.check_url.checkURL", return_value=False)
+    def test_model_rejected_by_check_url_is_not_scored(self, mcheck, mcard):
+        with self.assertRaises(ValueError):
+            score_model("https://huggingface.co/org/m", None, None)
+        mcheck.assert_called_once()
+        mcard.assert_not_called()
+
+    @patch("src.classes.ScoreCard.ScoreCard")
+    @patch("src.utils.check_url.checkURL", return_value=True)
+    def test_dataset_and_github_reach_scorecard_before_metrics_run(self, _mcheck, mcard):
+        score_model("https://huggingface.co/org/m", "https://huggingface.co/datasets/org/d", "https://github.com/org/c")
+        kwargs = mcard.call_args.kwargs
+        self.assertEqual(kwargs["datasetURL"], "https://huggingface.co/datasets/org/d")
+        self.assertEqual(kwargs["githubURL"], "https://github.com/org/c")
+        mcard.return_value.setDatasetURL.assert_not_called()
+        mcard.return_value.setGithubURL.assert_not_called()
+
+
+class UrlFileTests(unittest.TestCase):
+    def _models(self, stream):
+        with stream:
+            return [m for m, _ds, _gh in iter_models(iter_urls(stream))]
+
+    def test_plain_and_gzip_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            plain = os.path.join(tmp, "urls.txt")
+            packed = os.path.join(tmp, "urls.txt.gz")  # detected by content, not the name
+            with open(plain, "w") as f:
+                f.write(URL_TEXT)
+            with gzip.open(packed, "wt") as f:
+                f.write(URL_TEXT)
+            expected = ["https://huggingface.co/org/a", "https://huggingface.co/org/b"]
+            self.assertEqual(self._models(open_url_file(plain)), expected)
+            self.assertEqual(self._models(open_url_file(packed)), expected)
+
+    def test_stdin(self):
+        fake = io.TextIOWrapper(io.BufferedReader(io.BytesIO(gzip.compress(URL_TEXT.encode()))))
+        with patch("sys.stdin", fake):
+            self.assertEqual(len(self._models(open_url_file("-"))), 2)
+
+    def test_missing_file_fails_up_front(self):
+        with self.assertRaises(FileNotFoundError):
+            open_url_file("/nonexistent/urls.txt")
+
+    def test_entries_are_split_and_stripped(self):
+        self.assertEqual(list(iter_urls([" a , b\n", "\n"])), ["a", "b", ""])
+
+
+class RunOrderedTests(unittest.TestCase):
+    @staticmethod
+    def _scorer(url, delay, _gh):
+        time.sleep(delay)
+        return url
+
+    def test_output_keeps_input_order(self):
+        # Later items finish first; the reorder buffer must still emit in input order
+        items = [(f"m{i}", 0.05 * (5 - i), None) for i in range(6)]
+        out = [fut.result() for _url, fut in run_ordered(items, jobs=4, scorer=self._scorer)]
+        self.assertEqual(out, [f"m{i}" for i in range(6)])
+
+    def test_each_model_queues_llm_prompts_by_input_position(self):
+        items = [(f"m{i}", 0, None) for i in range(5)]
+        scorer = lambda url, _ds, _gh: (url, llm_scheduler._position.get())
+        out = [fut.result() for _url, fut in run_ordered(items, jobs=3, scorer=scorer)]
+        self.assertEqual(out, [(f"m{i}", i) for i in range(5)])
+
+    def test_parallel_is_faster_than_serial(self):
+        items = [(f"m{i}", 0.1, None) for i in range(8)]
+        t0 = time.perf_counter()
+        list(run_ordered(items, jobs=8, scorer=self._scorer))
+        self.assertLess(time.perf_counter() - t0, 0.5)
+
+    def test_serial_mode_matches(self):
+        items = [(f"m{i}", 0, None) for i in range(3)]
+        urls = [url for url, fut in run_ordered(items, jobs=1, scorer=self._scorer)]
+        self.assertEqual(urls, ["m0", "m1", "m2"])
+
+    def test_results_stream_before_the_input_is_exhausted(self):
+        consumed = []
+
+        def items():
+            for i in range(1000):
+                consumed.append(i)
+                yield (f"m{i}", 0, None)
+
+        first = next(iter(run_ordered(items(), jobs=2, scorer=self._scorer)))
+        self.assertEqual(first[0], "m0")
+        self.assertLessEqual(len(consumed), 4)  # at most the 2 * jobs reorder window was read
+
+    def test_finished_results_do_not_wait_for_a_blocked_input(self):
+        more = threading.Event()
+        threading.Timer(2.0, more.set).start()
+
+        def items():  # a pipe that delivers one URL and then goes quiet
+            yield ("m0", 0, None)
+            more.wait()
+            yield ("m1", 0, None)
+
+        t0 = time.perf_counter()
+        first = next(iter(run_ordered(items(), jobs=2, scorer=self._scorer)))
+        self.assertEqual(first[0], "m0")
+        self.assertLess(time.perf_counter() - t0, 1.0)
+        more.set()
+
+    def test_failure_is_reported_in_position(self):
+        def scorer(url, _ds, _gh):
+            if url == "bad":
+                raise RuntimeError("boom")
+            return url
+
+        items = [("a", None, None), ("bad", None, None), ("c", None, None)]
+        results = list(run_ordered(items, jobs=2, scorer=scorer))
+        self.assertEqual([u for u, _ in results], ["a", "bad", "c"])
+        self.assertIsInstance(results[1][1].exception(), RuntimeError)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+
+from benchmarks import e2e, micro
+from benchmarks.common import compare, percentile, summarize, synthetic_urls
+from src.utils.batch_runner import iter_models
+
+
+class TestBenchmarkHelpers(unittest.TestCase):
+    def test_percentile_nearest_rank(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 95), 95)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([], 50), 0.0)
+        self.assertEqual(summarize([3, 1, 2])["max"], 3.0)
+
+    def test_synthetic_urls_yield_n_models_with_context(self):
+        urls = [u.strip() for line in synthetic_urls(25) for u in line.split(",")]
+        models = list(iter_models(urls))
+        self.assertEqual(len(models), 25)
+        self.assertIn("github.com", models[0][2])
+        self.assertIn("/datasets/", models[0][1])
+
+    def test_compare_flags_regressions_in_the_right_direction(self):
+        baseline = {"s": {"models_per_sec": 100, "latency_ms": {"net_score": {"p95": 10}}}}
+        checks = {"models_per_sec": "higher", "latency_ms.net_score.p95": "lower"}
+        ok = {"s": {"models_per_sec": 90, "latency_ms": {"net_score": {"p95": 12}}}}
+        self.assertEqual(compare(ok, baseline, checks, tolerance=0.25), [])
+        bad = {"s": {"models_per_sec": 50, "latency_ms": {"net_score": {"p95": 20}}}, "new": {}}
+        self.assertEqual(len(compare(bad, baseline, checks, tolerance=0.25)), 2)
+
+
+class TestMicrobenchmarks(unittest.TestCase):
+    def test_measure_reports_time_and_allocations(self):
+        result = micro.measure(micro.Case("alloc", lambda: [0] * 10000, 10000), repeat=1)
+        self.assertGreater(result["ns_per_op"], 0)
+        self.assertGreater(result["peak_alloc_kb"], 50)
+        self.assertLess(result["retained_kb"], 1)
+
+    def test_filtered_run(self):
+        results = micro.run(repeat=1, pattern="license._norm")
+        self.assertEqual(list(results), ["License._norm"])
+
+
+class TestEndToEndSmoke(unittest.TestCase):
+    def test_scorecard_run_against_stub(self):
+        results = e2e.run([3], jobs=2, modes=("scorecard",))
+        result = results["scorecard-3"]
+        self.assertEqual(result["models"], 3)
+        self.assertEqual(result["failures"], 0)
+        self.assertGreater(result["http_calls"]["total"], 0)
+        self.assertIn("net_score", result["latency_ms"])
+
+
+if __name__ == "__main__":
+    unittest.main()
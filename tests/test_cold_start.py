@@ -0,0 +1,50 @@
+import os
+import subprocess
+import sys
+import unittest
+from unittest.mock import patch
+
+from src.utils import config
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cumulative -X importtime budget for `import src.run` (measured ~25ms; generous for slow CI boxes)
+IMPORT_BUDGET_US = 150_000
+# Only the command that needs them may import these
+HEAVY = {"huggingface_hub", "requests", "unittest", "coverage", "sqlite3"}
+
+
+def import_times(statement: str) -> dict:
+    """module -> cumulative import time (us) for statement run in a fresh interpreter."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", statement], cwd=ROOT,
+                          capture_output=True, text=True, check=True)
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _self, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestColdStart(unittest.TestCase):
+    def test_cli_import_stays_light(self):
+        times = import_times("import src.run")
+        self.assertFalse(HEAVY & set(times), "heavy modules imported at startup")
+        self.assertLess(times["src.run"], IMPORT_BUDGET_US)
+
+    def test_scoring_modules_defer_huggingface_hub(self):
+        times = import_times("import src.classes.ScoreCard, src.utils.batch_runner, src.utils.async_engine")
+        self.assertNotIn("huggingface_hub", times)
+
+    def test_env_file_is_loaded_once(self):
+        config.load_env.cache_clear()
+        with patch("dotenv.load_dotenv", return_value=False) as mload:
+            for _ in range(3):
+                config.load_env()
+        self.assertEqual(mload.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
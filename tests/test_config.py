@@ -0,0 +1,41 @@
+import os
+import unittest
+from unittest.mock import patch
+
+from src.utils import config
+from src.utils.config import get_config
+
+
+class TestConfig(unittest.TestCase):
+    @patch("src.utils.config.load_env")
+    def test_defaults_when_unset(self, _load):
+        with patch.dict(os.environ, {}, clear=True):
+            cfg = get_config()
+        self.assertEqual(cfg, config.Config())
+        self.assertIsNone(cfg.httpRetries)
+        self.assertIsNone(cfg.httpCache)
+
+    @patch("src.utils.config.load_env")
+    def test_parses_and_clamps(self, _load):
+        env = {"HTTP_POOL_SIZE": "0", "HTTP_RETRIES": "-2", "LLM_CACHE_MAX_MB": "0.5",
+               "LLM_DEADLINE": "0", "METRIC_WORKERS": "three", "HTTP_CACHE": "c.sqlite"}
+        with patch.dict(os.environ, env, clear=True):
+            cfg = get_config()
+        self.assertEqual(cfg.httpPoolSize, 1)
+        self.assertEqual(cfg.httpRetries, 0)
+        self.assertEqual(cfg.llmCacheMaxBytes, 512 * 1024)
+        self.assertIsNone(cfg.llmDeadline)
+        self.assertEqual(cfg.metricWorkers, config.DEFAULT_METRIC_WORKERS)
+        self.assertEqual(cfg.httpCache, "c.sqlite")
+
+    @patch("src.utils.config.load_env")
+    def test_rebuilt_when_a_variable_changes(self, _load):
+        with patch.dict(os.environ, {"BATCH_JOBS": "2"}, clear=True):
+            first = get_config()
+            self.assertIs(get_config(), first)
+            os.environ["BATCH_JOBS"] = "6"
+            self.assertEqual(get_config().batchJobs, 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,14 +4,14 @@ import json
 
 from src.classes.DatasetQuality import DatasetQuality
 
-# A tiny fake HF API client that returns JSON strings like hfAPI.get_info()
+# A tiny fake HF API client that returns parsed payloads like hfAPI.get_info()
 class FakeHFAPI:
     def __init__(self, payloads_by_url):
         self.payloads = payloads_by_url  # {url: dict_for_data_key}
 
-    def get_info(self, url: str, printCLI: bool = False) -> str:
+    def get_info(self, url: str, printCLI: bool = False) -> dict:
         data = self.payloads.get(url, {})
-        return json.dumps({"data": data})
+        return {"data": data}
 
 
 class TestDatasetQuality(unittest.TestCase):
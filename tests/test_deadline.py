@@ -0,0 +1,134 @@
+import asyncio
+import json
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.classes.ScoreCard import ScoreCard
+from src.utils import deadline
+from src.utils.async_engine import AsyncEngine
+
+URL = "https://huggingface.co/org/model"
+
+
+class TestBudget(unittest.TestCase):
+    def test_nested_budgets_only_shorten(self):
+        self.assertIsNone(deadline.remaining())
+        with deadline.budget(1000):
+            with deadline.budget(50000) as left:
+                self.assertLessEqual(left, 1.0)
+            with deadline.budget(None) as left:
+                self.assertLessEqual(left, 1.0)
+            with deadline.budget(10):
+                self.assertLessEqual(deadline.remaining(), 0.01)
+        self.assertIsNone(deadline.remaining())
+
+    def test_clamp(self):
+        self.assertEqual(deadline.clamp(30), 30)
+        with deadline.budget(500):
+            self.assertLessEqual(deadline.clamp(30), 0.5)
+            self.assertEqual(deadline.clamp(0.1), 0.1)
+            connect, read = deadline.clamp((5, 120))
+            self.assertLessEqual(max(connect, read), 0.5)
+        with deadline.budget(1):
+            time.sleep(0.005)
+            with self.assertRaises(deadline.DeadlineExceeded):
+                deadline.clamp(30)
+
+    def test_guarded_turns_late_failures_into_timeouts(self):
+        def fails():
+            raise TimeoutError("read timed out")
+
+        with self.assertRaises(TimeoutError):
+            deadline.guarded(fails)()  # no deadline: a real failure
+        with deadline.budget(1):
+            time.sleep(0.005)
+            self.assertIs(deadline.guarded(fails)(), deadline.TIMED_OUT)
+
+
+def patched_metrics(test, release):
+    """Real metric classes with their work stubbed: bus_factor hangs, code_quality overruns and then fails fast."""
+    def hang(*_args, **_kwargs):
+        release.wait(5)
+
+    def fail_fast(*_args, **_kwargs):
+        time.sleep(0.3)
+        deadline.clamp(30)  # what an HTTP call made after the deadline does
+        return 1.0, 1
+
+    patches = [
+        patch("src.classes.BusFactor.BusFactor.setNumContributors", side_effect=hang),
+        patch("src.classes.CodeQuality.CodeQuality.evaluate", side_effect=fail_fast),
+        patch("src.classes.DatasetQuality.DatasetQuality.computeDatasetQuality", return_value=(0.5, 1)),
+        patch("src.classes.Size.Size.setSize"),
+        patch("src.classes.License.License.evaluate", return_value=(1.0, 1)),
+        patch("src.classes.RampUpTime.RampUpTime.setRampUpTime"),
+        patch("src.classes.PerformanceClaims.PerformanceClaims.evaluate", return_value=(0.5, 1)),
+        patch("src.classes.AvailableDatasetAndCode.AvailableDatasetAndCode.score_dataset_and_code_availability",
+              return_value=(1.0, 1)),
+    ]
+    for p in patches:
+        p.start()
+        test.addCleanup(p.stop)
+
+
+class TestScoreCardDeadline(unittest.TestCase):
+    def setUp(self):
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+        patched_metrics(self, self.release)
+        self.context = MagicMock(github_readme="")
+        self.context.dataset_links = []
+
+    def assert_timed_out(self, card, elapsed):
+        self.assertLess(elapsed, 1.0)  # not waiting on the hung metric
+        self.assertEqual(card.timedOut, ["bus_factor", "code_quality"])
+        card.setTotalScore()
+        record = json.loads(card.toNDJSON())
+        self.assertEqual(record["timed_out"], ["bus_factor", "code_quality"])
+        self.assertEqual(record["bus_factor"], deadline.FALLBACK_SCORE)
+        self.assertEqual(record["code_quality"], deadline.FALLBACK_SCORE)
+        self.assertGreaterEqual(record["bus_factor_latency"], 150)
+        self.assertEqual(record["license"], 1.0)
+
+    def test_metrics_past_the_deadline_get_the_fallback(self):
+        t0 = time.monotonic()
+        card = ScoreCard(URL, context=self.context, deadlineMs=200)
+        self.assert_timed_out(card, time.monotonic() - t0)
+
+        # the abandoned thread finishing later doesn't touch the card
+        hung = card.busFactor
+        self.release.set()
+        time.sleep(0.05)
+        self.assertIs(card.busFactor, hung)
+        self.assertEqual(card.busFactor.metricScore, deadline.FALLBACK_SCORE)
+
+    def test_async_score_honours_the_deadline(self):
+        engine = AsyncEngine()
+        self.addCleanup(engine.close)
+        t0 = time.monotonic()
+        card = asyncio.run(ScoreCard.score(URL, context=self.context, engine=engine, deadlineMs=200))
+        self.assert_timed_out(card, time.monotonic() - t0)
+
+    def test_inline_metrics_stop_at_the_deadline(self):
+        def slow_then_fail_fast(*_args, **_kwargs):
+            time.sleep(0.25)
+            deadline.clamp(30)
+
+        # one worker (as under --profile): the first metric overruns and fails fast, the rest never start
+        with patch("src.classes.BusFactor.BusFactor.setNumContributors", side_effect=slow_then_fail_fast):
+            card = ScoreCard(URL, maxWorkers=1, context=self.context, deadlineMs=200)
+        self.assertEqual(len(card.timedOut), 8)
+        self.assertLess(card.getLatency(), 1000)
+
+    def test_no_deadline_no_timed_out_field(self):
+        self.release.set()
+        with patch("src.classes.CodeQuality.CodeQuality.evaluate", return_value=(1.0, 1)):
+            card = ScoreCard(URL, context=self.context)
+        card.setTotalScore()
+        self.assertNotIn("timed_out", card.getRecord())
+
+
+if __name__ == "__main__":
+    unittest.main()
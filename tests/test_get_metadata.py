@@ -54,31 +54,43 @@ class NormalizeAuthorTests(unittest.TestCase):
 # -----------------------------
 
 class FindGithubLinksTests(unittest.TestCase):
-    @patch("src.utils.get_metadata.ModelCard")
-    @patch("src.utils.get_metadata.HfApi")
-    def test_finds_links_in_cardData_and_readme(self, mHfApi, mModelCard):
-        # Mock model_info().cardData with nested github URL
-        info = MagicMock()
-        info.cardData = {
-            "code_repository": "https://github.com/org/repo",
-            "nested": {"other": ["x", "https://github.com/another/repo/issues/1"]},
+    @patch("src.utils.http_cache.get")
+    def test_fetches_info_and_card_through_the_http_cache(self, mget):
+        # /api/models payload (parsed into a huggingface_hub ModelInfo)
+        info = MagicMock(status_code=200)
+        info.json.return_value = {
+            "id": "org/model",
+            "cardData": {
+                "code_repository": "https://github.com/org/repo",
+                "nested": {"other": ["x", "https://github.com/another/repo/issues/1"]},
+            },
         }
-        api = MagicMock()
-        api.model_info.return_value = info
-        mHfApi.return_value = api
 
-        # Mock ModelCard.load(...).text
-        card = MagicMock()
+        # README.md of the model card
+        card = MagicMock(status_code=200)
         card.text = """
         # Title
         Some text with https://github.com/foo/bar and also not-a-link.com
         """
-        mModelCard.load.return_value = card
+        mget.side_effect = lambda url, **_kw: card if url.endswith("README.md") else info
 
         out = find_github_links("https://huggingface.co/org/model")
-        self.assertIn("https://github.com/org/repo", out)
-        self.assertIn("https://github.com/another/repo/issues/1", out)
+        self.assertEqual(out, sorted(out))
         self.assertIn("https://github.com/foo/bar", out)
+        self.assertEqual(sorted(c[0][0].split("huggingface.co")[-1] for c in mget.call_args_list),
+                         ["/api/models/org/model", "/org/model/resolve/main/README.md"])
+
+    def test_finds_links_in_cardData_and_readme(self):
+        info = MagicMock()
+        info.cardData = {
+            "code_repository": "https://github.com/org/repo",
+            "nested": {"other": ["x", "https://github.com/another/repo/issues/1"]},
+        }
+        card = MagicMock(text="Some text with https://github.com/foo/bar and also not-a-link.com")
+
+        out = find_github_links("https://huggingface.co/org/model", info=info, card=card)
+        self.assertEqual(out, ["https://github.com/another/repo/issues/1", "https://github.com/foo/bar",
+                               "https://github.com/org/repo"])
 
 
 # -----------------------------
@@ -86,27 +98,27 @@ class FindGithubLinksTests(unittest.TestCase):
 # -----------------------------
 
 class GetCollaboratorsHFTests(unittest.TestCase):
-    @patch("src.utils.get_metadata.HfApi")
-    def test_get_collaborators_hf_success(self, mHfApi):
-        # Create fake commit objects with 'authors' attribute (list of strings)
-        class Commit:
-            def __init__(self, authors):
-                self.authors = authors
-
-        # 4 commits total; first human author picked from authors list
-        commits = [
-            Commit(["Alice <a@x.org>", "build-bot"]),  # Alice
-            Commit(["Alice <a@x.org>"]),               # Alice
-            Commit(["Bob <b@x.org>", "bot"]),          # Bob
-            Commit(["Alice <a@x.org>", "ci"])          # Alice
-        ]  # => Alice:3, Bob:1
+    @patch("src.utils.get_metadata.http_cache.get")
+    def test_get_collaborators_hf_success(self, mget):
+        def commit(*authors):
+            return {"id": "c", "title": "t", "authors": [{"user": a} for a in authors]}
 
-        api = MagicMock()
-        api.list_repo_commits.return_value = commits
-        mHfApi.return_value = api
+        # 4 commits over two pages; first human author picked from authors list
+        r1 = MagicMock(status_code=200, headers={"Link": '<https://huggingface.co/api/models/org/model/commits/main?p=1>; rel="next"'})
+        r1.json.return_value = [
+            commit("Alice <a@x.org>", "build-bot"),  # Alice
+            commit("Alice <a@x.org>"),               # Alice
+        ]
+        r2 = MagicMock(status_code=200, headers={})
+        r2.json.return_value = [
+            commit("Bob <b@x.org>", "bot"),          # Bob
+            commit("Alice <a@x.org>", "ci"),         # Alice
+        ]  # => Alice:3, Bob:1
+        mget.side_effect = [r1, r2]
 
         avg, std, authors = getCollaborators("https://huggingface.co/org/model", n=4)
 
+        self.assertTrue(mget.call_args_list[0][0][0].endswith("/api/models/org/model/commits/main"))
         # avg = sum(counts)/n = 4/4 = 1.0
         self.assertAlmostEqual(avg, 1.0, places=6)
         # proportions = [3/4, 1/4] -> sample stdev:
@@ -115,13 +127,13 @@ class GetCollaboratorsHFTests(unittest.TestCase):
         self.assertEqual(authors["Alice"], 3)
         self.assertEqual(authors["Bob"], 1)
 
-    @patch("src.utils.get_metadata.HfApi")
-    def test_get_collaborators_hf_handles_hub_error(self, mHfApi):
-        from huggingface_hub.utils import HfHubHTTPError
+    @patch("src.utils.get_metadata.http_cache.get")
+    def test_get_collaborators_hf_handles_hub_error(self, mget):
+        import requests
 
-        api = MagicMock()
-        api.list_repo_commits.side_effect = HfHubHTTPError("no access")
-        mHfApi.return_value = api
+        r = MagicMock(status_code=401)
+        r.raise_for_status.side_effect = requests.HTTPError("401 no access")
+        mget.return_value = r
 
         avg, std, authors = getCollaborators("https://huggingface.co/org/model", n=10)
         self.assertEqual((avg, std, authors), (-1, -1, -1))
@@ -132,7 +144,7 @@ class GetCollaboratorsHFTests(unittest.TestCase):
 # -----------------------------
 
 class GetCollaboratorsGithubTests(unittest.TestCase):
-    @patch("src.utils.get_metadata.requests.get")
+    @patch("src.utils.http_client.get")
     def test_github_collectors_paginates_and_filters_bots(self, mget):
         # Page 1
         r1 = MagicMock()
@@ -165,7 +177,7 @@ class GetCollaboratorsGithubTests(unittest.TestCase):
         # std with proportions [2/4, 1/4] (one author omitted if bot-only)
         self.assertAlmostEqual(std, statistics.stdev([0.5, 0.25]), places=6)
 
-    @patch("src.utils.get_metadata.requests.get")
+    @patch("src.utils.http_client.get")
     def test_github_rate_limit_returns_partial(self, mget):
         # First page ok, second page rate-limited (403 with hint text)
         r1 = MagicMock()
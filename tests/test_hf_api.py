@@ -6,7 +6,7 @@ from unittest.mock import patch
 
 import requests
 
-from src.utils.hf_api import hfAPI
+from src.utils.hf_api import METADATA_CACHE, MetadataCache, hfAPI
 
 hf_api = hfAPI()
 
@@ -86,7 +86,7 @@ class FetchJsonTests(unittest.TestCase):
                 err.response = self
                 raise err
 
-    @patch("requests.get")
+    @patch("src.utils.http_client.get")
     def test_fetch_json_ok(self, mget):
         resp = self._Resp(200, {"ok": True}, url="https://huggingface.co/api/models/bert-base-uncased")
         mget.return_value = resp
@@ -98,7 +98,7 @@ class FetchJsonTests(unittest.TestCase):
         self.assertIn("timeout", kwargs)
         self.assertNotIn("headers", kwargs)
 
-    @patch("requests.get")
+    @patch("src.utils.http_client.get")
     def test_fetch_json_raises_http_error(self, mget):
         bad = self._Resp(status_code=500, text="boom", url="https://huggingface.co/api/models/x")
         mget.return_value = bad
@@ -107,8 +107,11 @@ class FetchJsonTests(unittest.TestCase):
 
 
 class GetInfoTests(unittest.TestCase):
+    def setUp(self):
+        METADATA_CACHE.clear()
+
     @patch("builtins.print")
-    @patch("requests.get")
+    @patch("src.utils.http_client.get")
     def test_get_info_prints_json_when_printCLI_true(self, mget, mprint):
         class _R(FetchJsonTests._Resp):
             pass
@@ -125,16 +128,31 @@ class GetInfoTests(unittest.TestCase):
         self.assertEqual(blob["_requested"]["kind"], "model")
         self.assertEqual(blob["_requested"]["repo_id"], "bert-base-uncased")
 
-    @patch("requests.get")
-    def test_get_info_returns_json_string_when_printCLI_false(self, mget):
+    @patch("src.utils.http_client.get")
+    def test_get_info_returns_parsed_mapping_when_printCLI_false(self, mget):
         class _R(FetchJsonTests._Resp):
             pass
 
-        mget.return_value = _R(200, {"ok": True}, url="https://huggingface.co/api/models/someuser/somerepo")
-        out = hf_api.get_info("https://huggingface.co/someuser/somerepo", printCLI=False)
-        blob = json.loads(out)
+        mget.return_value = _R(200, {"ok": True, "siblings": [{"rfilename": "a"}]},
+                               url="https://huggingface.co/api/models/someuser/somerepo")
+        blob = hf_api.get_info("https://huggingface.co/someuser/somerepo", printCLI=False)
         self.assertEqual(blob["_requested"]["repo_id"], "someuser/somerepo")
-        self.assertEqual(blob["data"], {"ok": True})
+        self.assertEqual(blob["data"]["ok"], True)
+        self.assertEqual(blob["data"]["siblings"][0]["rfilename"], "a")
+        # shared payloads are read-only
+        with self.assertRaises(TypeError):
+            blob["data"]["ok"] = False
+
+    @patch("src.utils.http_client.get")
+    def test_get_info_is_cached_across_instances(self, mget):
+        class _R(FetchJsonTests._Resp):
+            pass
+
+        mget.return_value = _R(200, {"ok": True}, url="https://huggingface.co/api/models/org/m")
+        first = hfAPI().get_info("https://huggingface.co/org/m", printCLI=False)
+        second = hfAPI().get_info("https://huggingface.co/org/m/tree/main", printCLI=False)
+        self.assertIs(first, second)
+        self.assertEqual(mget.call_count, 1)
 
     def test_get_info_bad_url_exits_2(self):
         # parse_hf_url raises -> get_info sys.exit(2)
@@ -143,7 +161,7 @@ class GetInfoTests(unittest.TestCase):
                 hf_api.get_info("https://example.com/not-hf", printCLI=False)
         self.assertEqual(ctx.exception.code, 2)
 
-    @patch("requests.get")
+    @patch("src.utils.http_client.get")
     def test_get_info_http_error_exits_1(self, mget):
         # fetch_json raises HTTPError -> get_info sys.exit(1)
         class _R(FetchJsonTests._Resp):
@@ -155,7 +173,7 @@ class GetInfoTests(unittest.TestCase):
                 hf_api.get_info("https://huggingface.co/x", printCLI=False)
         self.assertEqual(ctx.exception.code, 1)
 
-    @patch("requests.get", side_effect=requests.RequestException("no internet"))
+    @patch("src.utils.http_client.get", side_effect=requests.RequestException("no internet"))
     def test_get_info_network_error_exits_1(self, _mget):
         with patch.object(sys, "stderr"):
             with self.assertRaises(SystemExit) as ctx:
@@ -163,5 +181,20 @@ class GetInfoTests(unittest.TestCase):
         self.assertEqual(ctx.exception.code, 1)
 
 
+class MetadataCacheTests(unittest.TestCase):
+    def test_bounded_size_evicts_oldest(self):
+        cache = MetadataCache(maxsize=2)
+        for key in ("a", "b", "c"):
+            cache.put(("model", key), key)
+        self.assertIsNone(cache.get(("model", "a")))
+        self.assertEqual(cache.get(("model", "c")), "c")
+        self.assertEqual(len(cache), 2)
+
+    def test_expired_entries_miss(self):
+        cache = MetadataCache(ttl=0)
+        cache.put(("model", "a"), "a")
+        self.assertIsNone(cache.get(("model", "a")))
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
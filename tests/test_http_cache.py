@@ -0,0 +1,109 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.utils import http_cache
+from src.utils.http_cache import HttpCache
+
+
+def _resp(status=200, body=b'{"ok": true}', headers=None):
+    r = MagicMock()
+    r.status_code = status
+    r.content = body
+    r.headers = headers or {}
+    return r
+
+
+class TestHttpCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "http.sqlite")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    @patch("src.utils.http_client.get")
+    def test_fresh_entry_served_without_network(self, mget):
+        mget.return_value = _resp()
+        cache = HttpCache(self.path)
+        first = cache.get("https://huggingface.co/api/models/a/b")
+        second = cache.get("https://huggingface.co/api/models/a/b")
+        self.assertEqual(mget.call_count, 1)
+        self.assertEqual(second.json(), {"ok": True})
+        self.assertTrue(second.from_cache)
+        self.assertEqual(first.status_code, 200)
+        cache.close()
+
+    @patch("src.utils.http_client.get")
+    def test_stale_entry_revalidates_with_etag(self, mget):
+        mget.return_value = _resp(headers={"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"})
+        cache = HttpCache(self.path, ttls={}, defaultTTL=0)
+        cache.get("https://api.github.com/repos/o/r/readme", headers={"Accept": "x"})
+
+        mget.return_value = _resp(status=304, body=b"")
+        out = cache.get("https://api.github.com/repos/o/r/readme", headers={"Accept": "x"})
+        sent = mget.call_args[1]["headers"]
+        self.assertEqual(sent["If-None-Match"], '"v1"')
+        self.assertEqual(sent["If-Modified-Since"], "Mon, 01 Jan 2024 00:00:00 GMT")
+        self.assertEqual(out.status_code, 200)
+        self.assertEqual(out.json(), {"ok": True})
+        cache.close()
+
+    @patch("src.utils.http_client.get")
+    def test_errors_are_not_cached(self, mget):
+        mget.return_value = _resp(status=500, body=b"boom")
+        cache = HttpCache(self.path)
+        cache.get("https://huggingface.co/api/models/x")
+        cache.get("https://huggingface.co/api/models/x")
+        self.assertEqual(mget.call_count, 2)
+        cache.close()
+
+    @patch("src.utils.http_client.get")
+    def test_lru_eviction_respects_size_cap(self, mget):
+        cache = HttpCache(self.path, maxBytes=25)
+        for name in ("a", "b", "c"):
+            mget.return_value = _resp(body=b"x" * 10)
+            cache.get(f"https://huggingface.co/api/models/{name}")
+            time.sleep(0.01)
+        self.assertIsNone(cache.lookup("GET", "https://huggingface.co/api/models/a"))
+        self.assertIsNotNone(cache.lookup("GET", "https://huggingface.co/api/models/c"))
+        cache.close()
+
+    @patch("src.utils.http_client.get")
+    def test_key_includes_accept_and_authorization(self, mget):
+        cache = HttpCache(self.path)
+        url = "https://api.github.com/repos/o/r/readme"
+        for headers in ({"Authorization": "token A"}, {"Authorization": "token B"},
+                        {"Authorization": "token A", "Accept": "application/vnd.github.raw"}):
+            mget.return_value = _resp()
+            cache.get(url, headers=headers)
+            cache.get(url, headers=headers)
+        self.assertEqual(mget.call_count, 3)
+        self.assertIsNone(cache.lookup("GET", url))
+        keys = [k for (k,) in cache._conn.execute("SELECT key FROM responses")]
+        self.assertFalse(any("token" in k for k in keys))
+        cache.close()
+
+    @patch("src.utils.http_client.get")
+    def test_store_under_cap_does_not_sum_sizes(self, mget):
+        cache = HttpCache(self.path, maxBytes=1000)
+        mget.return_value = _resp(body=b"x" * 10)
+        with patch.object(cache, "_size", wraps=cache._size) as size:
+            for name in ("a", "b", "c"):
+                cache.get(f"https://huggingface.co/api/models/{name}")
+            self.assertEqual(size.call_count, 0)
+        self.assertEqual(cache._total, 30)
+        cache.close()
+
+    @patch.dict(os.environ, {}, clear=True)
+    @patch("src.utils.http_client.get")
+    def test_module_get_passes_through_when_disabled(self, mget):
+        mget.return_value = _resp()
+        http_cache.get("https://huggingface.co/api/models/x", timeout=5)
+        mget.assert_called_once_with("https://huggingface.co/api/models/x", timeout=5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+import unittest
+from unittest.mock import patch
+
+from src.utils.http_client import HttpClient
+
+
+class TestHttpClient(unittest.TestCase):
+    def test_one_session_per_host(self):
+        client = HttpClient()
+        a = client.session_for("https://api.github.com/repos/o/r/commits")
+        b = client.session_for("https://api.github.com/repos/o/r/readme")
+        c = client.session_for("https://huggingface.co/api/models/x")
+        self.assertIs(a, b)
+        self.assertIsNot(a, c)
+        self.assertIn("gzip", a.headers["Accept-Encoding"])
+        client.close()
+
+    def test_pool_size_is_configurable(self):
+        client = HttpClient(poolSize=3)
+        adapter = client.session_for("https://huggingface.co/").get_adapter("https://huggingface.co/")
+        self.assertEqual(adapter._pool_maxsize, 3)
+        client.close()
+
+    @patch("requests.Session.request")
+    def test_default_and_per_host_timeouts(self, mreq):
+        client = HttpClient(timeouts={"slow.example": 99}, defaultTimeout=7)
+        # (connect, read): connecting is capped by the host's retry policy whatever the read timeout
+        client.request("GET", "https://fast.example/x")
+        self.assertEqual(mreq.call_args[1]["timeout"], (5, 7))
+        client.request("POST", "https://slow.example/y", json={})
+        self.assertEqual(mreq.call_args[1]["timeout"], (5, 99))
+        client.request("GET", "https://fast.example/x", timeout=1)
+        self.assertEqual(mreq.call_args[1]["timeout"], (1, 1))
+        client.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
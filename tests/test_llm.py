@@ -4,6 +4,7 @@ import unittest
 from unittest.mock import patch, MagicMock
 
 import requests
+from src.utils import llm_cache
 from src.utils.llm_api import llmAPI
 
 
@@ -14,7 +15,7 @@ class MakePromptTests(unittest.TestCase):
         self.role = "user"
         self.content = "Hello, world!"
 
-    @patch("requests.post")
+    @patch("src.utils.http_client.post")
     def test_make_prompt_success(self, mpost):
         mock_resp = MagicMock()
         mock_resp.status_code = 200
@@ -34,25 +35,29 @@ class MakePromptTests(unittest.TestCase):
         self.assertEqual(called_json["messages"][0]["role"], self.role)
         self.assertEqual(called_json["messages"][0]["content"], self.content)
 
-    @patch("requests.post")
+    @patch("src.utils.http_client.post")
     def test_make_prompt_failure_raises(self, mpost):
         mock_resp = MagicMock()
         mock_resp.status_code = 500
         mock_resp.text = "server error"
         mpost.return_value = mock_resp
 
-        with self.assertRaises(Exception) as ctx:
+        with self.assertRaises(requests.HTTPError) as ctx:
             self.api.make_prompt(self.fake_token, self.role, self.content)
 
         self.assertIn("Error: 500", str(ctx.exception))
+        self.assertIs(ctx.exception.response, mock_resp)  # so --continue-on-error can classify it
 
 
 class MainTests(unittest.TestCase):
     def setUp(self):
         self.api = llmAPI()
+        # the in-memory LLM cache is process-wide: an answer cached by another test must not stand in for a POST
+        llm_cache.get_cache().clear()
+        self.addCleanup(lambda: llm_cache.get_cache().clear())
 
     @patch.dict(os.environ, {"GEN_AI_STUDIO_API_KEY": "ENV_TOKEN"}, clear=True)
-    @patch("requests.post")
+    @patch("src.utils.http_client.post")
     def test_main_uses_env_key_and_calls_api(self, mpost):
         mock_resp = MagicMock()
         mock_resp.status_code = 200
@@ -66,9 +71,9 @@ class MainTests(unittest.TestCase):
         called_headers = mpost.call_args[1]["headers"]
         self.assertEqual(called_headers.get("Authorization"), "Bearer ENV_TOKEN")
 
-    @patch("src.utils.llm_api.load_dotenv", return_value=False)  # prevent loading local .env
+    @patch("src.utils.llm_api.load_env", return_value=False)  # prevent loading local .env
     @patch.dict(os.environ, {}, clear=True)                      # ensure env is empty
-    @patch("requests.post")                                      # guard against any accidental network call
+    @patch("src.utils.http_client.post")                                      # guard against any accidental network call
     def test_main_raises_if_no_key(self, mpost, _noop_loadenv):
         with self.assertRaises(RuntimeError) as ctx:
             self.api.main("hello")
@@ -0,0 +1,90 @@
+import json
+import os
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.classes.CodeQuality import CodeQuality
+from src.classes.RampUpTime import RampUpTime
+from src.utils.llm_assessment import LLMAssessment, build_prompt, parse_answer
+from src.utils.model_context import ModelContext
+
+
+def _chat(content):
+    return json.dumps({"choices": [{"message": {"role": "assistant", "content": content}}]})
+
+
+class FakeContext:
+    def __init__(self, scores):
+        self.scores = scores
+
+    def assessed(self, metric):
+        return self.scores.get(metric)
+
+
+class TestParseAndPrompt(unittest.TestCase):
+    def test_prompt_only_lists_asked_questions(self):
+        prompt = build_prompt("https://huggingface.co/o/m", ["ramp_up_time", "license"], readme="# Hi")
+        self.assertIn('"ramp_up_time"', prompt)
+        self.assertIn('"license"', prompt)
+        self.assertNotIn('"code_quality"', prompt)
+        self.assertIn("# Hi", prompt)
+
+    def test_parses_chat_completion_body(self):
+        resp = _chat('Sure! {"ramp_up_time": 1.0, "license": 0.3, "code_quality": "n/a"}')
+        self.assertEqual(parse_answer(resp, ["ramp_up_time", "license", "code_quality"]),
+                         {"ramp_up_time": 1.0, "license": 0.3})
+
+    def test_clamps_and_ignores_garbage(self):
+        self.assertEqual(parse_answer('{"bus_factor": 7}', ["bus_factor"]), {"bus_factor": 1.0})
+        self.assertEqual(parse_answer("no json here", ["bus_factor"]), {})
+
+    def test_one_request_for_all_questions(self):
+        llm = MagicMock()
+        llm.main.return_value = _chat('{"ramp_up_time": 0.5, "performance_claims": 1.0}')
+        out = LLMAssessment(llm).assess("u", ["ramp_up_time", "performance_claims"])
+        self.assertEqual(out, {"ramp_up_time": 0.5, "performance_claims": 1.0})
+        llm.main.assert_called_once()
+
+
+class TestContextAssessment(unittest.TestCase):
+    @patch("src.utils.model_context.LLMAssessment")
+    def test_questions_follow_available_data(self, mAssessment):
+        mAssessment.return_value.assess.return_value = {"ramp_up_time": 1.0}
+        ctx = ModelContext("https://huggingface.co/o/m")
+        ctx._values.update({
+            "hf_info": {"data": {"cardData": {"license": "mit"}}},
+            "github_links": ["https://github.com/o/r"],
+            "github_readme": "# Readme",
+        })
+        self.assertEqual(ctx.assessed("ramp_up_time"), 1.0)
+        self.assertIsNone(ctx.assessed("license"))
+        questions = mAssessment.return_value.assess.call_args[0][1]
+        self.assertEqual(questions, ["ramp_up_time", "code_quality", "performance_claims"])
+        mAssessment.return_value.assess.assert_called_once()
+
+    @patch.dict(os.environ, {"LLM_BATCH": "0"})
+    def test_batching_can_be_disabled(self):
+        ctx = ModelContext("https://huggingface.co/o/m")
+        ctx._values["assessment"] = {"ramp_up_time": 1.0}
+        self.assertIsNone(ctx.assessed("ramp_up_time"))
+
+
+class TestMetricsUseAssessment(unittest.TestCase):
+    def test_ramp_up_uses_batched_score(self):
+        m = RampUpTime()
+        m.llm = MagicMock()
+        m.setRampUpTime("# readme", context=FakeContext({"ramp_up_time": 0.5}))
+        self.assertEqual(m.getRampUpTime(), 0.5)
+        m.llm.main.assert_not_called()
+
+    def test_code_quality_falls_back_without_answer(self):
+        m = CodeQuality()
+        m.llm = MagicMock()
+        m.llm.main.return_value = "1.0"
+        score, _ = m.evaluate("u", "https://github.com/o/r", context=FakeContext({}))
+        self.assertEqual(score, 1.0)
+        m.llm.main.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.utils import llm_cache
+from src.utils.llm_api import llmAPI
+from src.utils.llm_cache import LLMCache, make_key
+
+
+class TestLLMCache(unittest.TestCase):
+    def test_key_depends_on_model_role_and_content(self):
+        base = make_key("m", "user", "hi")
+        self.assertEqual(base, make_key("m", "user", "hi"))
+        self.assertNotEqual(base, make_key("m2", "user", "hi"))
+        self.assertNotEqual(base, make_key("m", "system", "hi"))
+        self.assertNotEqual(base, make_key("m", "user", "hi!"))
+
+    def test_memory_hit_and_counters(self):
+        cache = LLMCache()
+        compute = MagicMock(return_value="1.0")
+        self.assertEqual(cache.get_or_compute("k", compute), "1.0")
+        self.assertEqual(cache.get_or_compute("k", compute), "1.0")
+        compute.assert_called_once()
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+
+    def test_memory_tier_is_bounded(self):
+        cache = LLMCache(maxEntries=2)
+        for k in ("a", "b", "c"):
+            cache.put(k, k)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("c"), "c")
+
+    def test_expired_entries_are_dropped(self):
+        cache = LLMCache(ttl=0)
+        cache.put("k", "v")
+        self.assertIsNone(cache.get("k"))
+
+    def test_disk_tier_survives_new_instance(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "llm.sqlite")
+            first = LLMCache(path=path)
+            first.put("k", "0.5")
+            first.close()
+
+            second = LLMCache(path=path)
+            self.assertEqual(second.get("k"), "0.5")
+            self.assertEqual(second.stats()["disk_hits"], 1)
+            second.close()
+
+    def test_concurrent_identical_prompts_send_once(self):
+        cache = LLMCache()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.05)
+            return "1.0"
+
+        threads = [threading.Thread(target=cache.get_or_compute, args=("k", compute)) for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(calls), 1)
+
+    def test_failures_are_not_cached(self):
+        cache = LLMCache()
+        with self.assertRaises(RuntimeError):
+            cache.get_or_compute("k", MagicMock(side_effect=RuntimeError("down")))
+        self.assertEqual(cache.get_or_compute("k", lambda: "ok"), "ok")
+
+
+class TestLLMApiUsesCache(unittest.TestCase):
+    @patch.dict(os.environ, {"GEN_AI_STUDIO_API_KEY": "T"}, clear=True)
+    @patch("src.utils.http_client.post")
+    def test_same_prompt_posts_once(self, mpost):
+        llm_cache._cache = None  # fresh process-wide cache
+        mpost.return_value = MagicMock(status_code=200, text="0.5")
+        api = llmAPI()
+        self.assertEqual(api.main("same prompt"), "0.5")
+        self.assertEqual(api.main("same prompt"), "0.5")
+        self.assertEqual(mpost.call_count, 1)
+        llm_cache._cache = None
+
+    @patch.dict(os.environ, {"GEN_AI_STUDIO_API_KEY": "T", "LLM_CACHE_SIZE": "16"}, clear=True)
+    @patch("src.utils.http_client.post")
+    def test_changed_settings_take_effect_after_first_use(self, mpost):
+        mpost.return_value = MagicMock(status_code=200, text="0.5")
+        llmAPI().main("settings prompt")
+        with patch.dict(os.environ, {"LLM_CACHE_SIZE": "0"}):
+            llmAPI().main("settings prompt")  # memory tier now off: sent again
+            self.assertEqual(llm_cache.get_cache().maxEntries, 0)
+        self.assertEqual(mpost.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+import threading
+import time
+import unittest
+
+from src.utils.deadline import budget
+from src.utils.llm_scheduler import (
+    PRIORITY_BULK,
+    PRIORITY_INTERACTIVE,
+    LLMDeadlineExceeded,
+    LLMScheduler,
+    TokenBucket,
+    set_position,
+)
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_empty_bucket_reports_delay(self):
+        bucket = TokenBucket(rate=60, capacity=1)  # one token per second
+        self.assertEqual(bucket.delay(), 0.0)
+        bucket.take()
+        self.assertGreater(bucket.delay(), 0.5)
+
+
+class TestLLMScheduler(unittest.TestCase):
+    def test_concurrency_is_capped(self):
+        sched = LLMScheduler(maxConcurrency=2, requestsPerMinute=0)
+        lock = threading.Lock()
+        state = {"now": 0, "peak": 0}
+
+        def call(_remaining):
+            with lock:
+                state["now"] += 1
+                state["peak"] = max(state["peak"], state["now"])
+            time.sleep(0.03)
+            with lock:
+                state["now"] -= 1
+
+        threads = [threading.Thread(target=sched.run, args=(call,)) for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(state["peak"], 2)
+
+    def test_interactive_jumps_ahead_of_bulk(self):
+        sched = LLMScheduler(maxConcurrency=1, requestsPerMinute=0)
+        release = threading.Event()
+        order = []
+
+        blocker = threading.Thread(target=sched.run, args=(lambda _r: release.wait(),))
+        blocker.start()
+        time.sleep(0.02)
+        threads = []
+        for name, prio in [("bulk1", PRIORITY_BULK), ("bulk2", PRIORITY_BULK), ("interactive", PRIORITY_INTERACTIVE)]:
+            t = threading.Thread(target=sched.run, args=(lambda _r, n=name: order.append(n),), kwargs={"priority": prio})
+            t.start()
+            threads.append(t)
+            time.sleep(0.02)
+        release.set()
+        for t in [blocker] + threads:
+            t.join()
+        self.assertEqual(order, ["interactive", "bulk1", "bulk2"])
+
+    def test_earlier_input_position_goes_first(self):
+        sched = LLMScheduler(maxConcurrency=1, requestsPerMinute=0)
+        release = threading.Event()
+        order = []
+
+        def prompt(position):
+            set_position(position)  # what the batch runners do for each model
+            sched.run(lambda _r: order.append(position))
+
+        blocker = threading.Thread(target=sched.run, args=(lambda _r: release.wait(),))
+        blocker.start()
+        time.sleep(0.02)
+        threads = []
+        for position in (2, 0, 1):
+            t = threading.Thread(target=prompt, args=(position,))
+            t.start()
+            threads.append(t)
+            time.sleep(0.02)
+        release.set()
+        for t in [blocker] + threads:
+            t.join()
+        self.assertEqual(order, [0, 1, 2])
+
+    def test_rate_limit_spaces_requests(self):
+        sched = LLMScheduler(maxConcurrency=4, requestsPerMinute=600)  # one every 0.1 s, burst of 10
+        sched._bucket = TokenBucket(rate=600, capacity=1)
+        t0 = time.monotonic()
+        for _ in range(3):
+            sched.run(lambda _r: None)
+        self.assertGreaterEqual(time.monotonic() - t0, 0.18)
+
+    def test_deadline_while_queued(self):
+        sched = LLMScheduler(maxConcurrency=1, requestsPerMinute=0)
+        release = threading.Event()
+        blocker = threading.Thread(target=sched.run, args=(lambda _r: release.wait(),))
+        blocker.start()
+        time.sleep(0.02)
+        with self.assertRaises(LLMDeadlineExceeded):
+            sched.run(lambda _r: None, timeout=0.05)
+        self.assertEqual(sched.queued(), 0)
+        release.set()
+        blocker.join()
+
+    def test_remaining_time_passed_to_call(self):
+        sched = LLMScheduler(requestsPerMinute=0, deadline=5)
+        remaining = sched.run(lambda r: r)
+        self.assertTrue(0 < remaining <= 5)
+
+    def test_model_deadline_shortens_the_budget(self):
+        sched = LLMScheduler(requestsPerMinute=0, deadline=5)
+        with budget(100):
+            self.assertLessEqual(sched.run(lambda r: r), 0.1)
+
+
+if __name__ == "__main__":
+    unittest.main()
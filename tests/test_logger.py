@@ -0,0 +1,101 @@
+import io
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.utils import logger
+from src.utils.config import Config
+from src.utils.metric_executor import MetricExecutor
+
+
+def read_lines(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+class TestRunLogger(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "run.log")
+
+    def tearDown(self):
+        logger.stop_logging()
+        self.tmp.cleanup()
+
+    def test_records_carry_the_models_correlation_id_across_metric_threads(self):
+        log = logger.RunLogger(self.path, level=logger.DEBUG)
+        with logger.correlation("https://huggingface.co/a/m") as cid:
+            MetricExecutor(4).run({name: (lambda n=name: log.log("metric", logger.DEBUG, metric=n))
+                                   for name in "abcd"})
+        log.log("outside")
+        log.close()
+
+        lines = read_lines(self.path)
+        self.assertEqual(len(lines), 5)
+        inside = [r for r in lines if r["msg"] == "metric"]
+        self.assertEqual({r["cid"] for r in inside}, {cid})
+        self.assertEqual({r["url"] for r in inside}, {"https://huggingface.co/a/m"})
+        self.assertEqual(sorted(r["metric"] for r in inside), list("abcd"))
+        self.assertNotIn("cid", lines[-1])
+        self.assertTrue(lines[-1]["time"].endswith("+00:00"))
+
+    def test_debug_is_dropped_below_level_2(self):
+        log = logger.RunLogger(self.path, level=logger.INFO)
+        log.log("kept")
+        log.log("dropped", logger.DEBUG)
+        log.close()
+        self.assertEqual([r["msg"] for r in read_lines(self.path)], ["kept"])
+
+    def test_size_based_rotation_keeps_n_backups(self):
+        log = logger.RunLogger(self.path, level=logger.INFO, maxBytes=200, backups=2)
+        for i in range(40):
+            log.log(f"line {i}")
+        log.close()
+        self.assertTrue(os.path.exists(self.path + ".1"))
+        self.assertTrue(os.path.exists(self.path + ".2"))
+        self.assertFalse(os.path.exists(self.path + ".3"))
+        self.assertEqual(read_lines(self.path)[-1]["msg"], "line 39")
+
+    def test_write_errors_are_reported_and_the_writer_keeps_going(self):
+        log = logger.RunLogger(self.path, level=logger.INFO)
+        real = log._file
+        log._file = MagicMock(closed=False, write=MagicMock(side_effect=OSError(28, "No space left on device")))
+        with patch("sys.stderr", new=io.StringIO()) as err:
+            log.log("lost")
+            for _ in range(200):
+                if err.getvalue():
+                    break
+                time.sleep(0.01)
+            log._file = real
+            log.log("kept")
+            log.close()
+        self.assertIn("No space left on device", err.getvalue())
+        self.assertEqual([r["msg"] for r in read_lines(self.path)], ["kept"])
+
+    def test_level_0_starts_nothing(self):
+        with patch("src.utils.logger.get_config", return_value=Config(logFile=self.path, logLevel=0)):
+            logger.log("hello")
+            logger.log_exception(ValueError("x"))
+            self.assertIsNone(logger.get_logger())
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_cli_log_helpers_write_through_the_queue(self):
+        from src import run
+
+        with patch("src.utils.logger.get_config", return_value=Config(logFile=self.path, logLevel=1)):
+            run.log("Installing dependencies...")
+            try:
+                raise RuntimeError("boom")
+            except RuntimeError as e:
+                run.log_exception(e, "https://huggingface.co/a/m")
+            logger.stop_logging()
+        info, error = read_lines(self.path)
+        self.assertEqual(info["msg"], "Installing dependencies...")
+        self.assertEqual((error["error_type"], error["url"]), ("RuntimeError", "https://huggingface.co/a/m"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import threading
+import time
+import unittest
+
+from src.utils.metric_executor import MetricExecutor
+
+
+class TestMetricExecutor(unittest.TestCase):
+    def test_runs_tasks_in_parallel(self):
+        barrier = threading.Barrier(3, timeout=2)
+
+        def task(value):
+            def _t():
+                barrier.wait()  # only passes if all three run at once
+                return value
+            return _t
+
+        out = MetricExecutor(maxWorkers=4).run({"a": task(1), "b": task(2), "c": task(3)})
+        self.assertEqual(out, {"a": 1, "b": 2, "c": 3})
+
+    def test_wall_time_close_to_slowest_task(self):
+        tasks = {str(i): (lambda: time.sleep(0.1)) for i in range(6)}
+        t0 = time.perf_counter()
+        MetricExecutor(maxWorkers=6).run(tasks)
+        self.assertLess(time.perf_counter() - t0, 0.4)
+
+    def test_single_worker_runs_inline(self):
+        caller = threading.get_ident()
+        out = MetricExecutor(maxWorkers=1).run({"a": threading.get_ident, "b": threading.get_ident})
+        self.assertEqual(set(out.values()), {caller})
+
+    def test_failure_is_reraised(self):
+        def boom():
+            raise ValueError("bad metric")
+
+        with self.assertRaises(ValueError):
+            MetricExecutor(maxWorkers=2).run({"ok": lambda: 1, "bad": boom})
+
+    def test_timeout_leaves_slow_tasks_out_without_waiting(self):
+        release = threading.Event()
+        t0 = time.perf_counter()
+        out = MetricExecutor(maxWorkers=2).run({"fast": lambda: 1, "slow": lambda: release.wait(5)}, timeout=0.1)
+        self.assertLess(time.perf_counter() - t0, 1.0)
+        self.assertEqual(out, {"fast": 1})
+        release.set()
+
+
+if __name__ == "__main__":
+    unittest.main()
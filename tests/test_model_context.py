@@ -0,0 +1,60 @@
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from src.utils.http_cache import CachedResponse
+from src.utils.model_context import ModelContext
+
+
+class TestModelContext(unittest.TestCase):
+    @patch("src.utils.http_cache.get")
+    @patch("src.utils.model_context.hfAPI")
+    def test_info_and_card_fetched_once_for_all_links(self, mhf, mget):
+        mhf.return_value.get_info.return_value = {"data": {"id": "org/model", "sha": "abc"}}
+        mhf.return_value.build_readme_url.return_value = "https://huggingface.co/org/model/resolve/main/README.md"
+        mget.return_value = CachedResponse(
+            "readme", 200, {},
+            b"see https://github.com/foo/bar and https://huggingface.co/datasets/org/data",
+        )
+
+        ctx = ModelContext("https://huggingface.co/org/model")
+        self.assertEqual(ctx.info.sha, "abc")
+        self.assertEqual(ctx.github_links, ["https://github.com/foo/bar"])
+        self.assertEqual(ctx.dataset_links, ["https://huggingface.co/datasets/org/data"])
+        ctx.github_links
+        ctx.dataset_links
+
+        # model info and the card each cost a single request
+        mhf.return_value.get_info.assert_called_once()
+        mget.assert_called_once()
+
+    @patch("src.utils.model_context.hfAPI")
+    def test_concurrent_callers_share_one_load(self, mhf):
+        calls = []
+
+        def slow_get_info(url, printCLI=False):
+            calls.append(url)
+            time.sleep(0.05)
+            return {"data": {}}
+
+        mhf.return_value.get_info.side_effect = slow_get_info
+        ctx = ModelContext("https://huggingface.co/org/model")
+        threads = [threading.Thread(target=lambda: ctx.hf_info) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(calls), 1)
+
+    @patch("src.utils.model_context.get_github_readme", return_value="# Readme")
+    @patch("src.utils.model_context.hfAPI")
+    def test_github_readme_empty_when_links_fail(self, mhf, readme):
+        mhf.return_value.get_info.side_effect = RuntimeError("hub down")
+        ctx = ModelContext("https://huggingface.co/org/model")
+        self.assertEqual(ctx.github_readme, "")
+        readme.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
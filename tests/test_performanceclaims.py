@@ -3,11 +3,13 @@ from unittest.mock import patch
 import json
 
 from src.classes.PerformanceClaims import PerformanceClaims
+from src.utils.hf_api import freeze
+from src.utils.model_context import ModelContext
 
 # Fake HF client that returns the JSON structure evaluate() expects
 class FakeHF:
     def __init__(self, payload): self.payload = payload
-    def get_info(self, url, printCLI=False): return json.dumps(self.payload)
+    def get_info(self, url, printCLI=False): return self.payload
 
 class LLMResp:
     def __init__(self, text): self.text = text
@@ -42,6 +44,21 @@ class TestPerformanceClaims(unittest.TestCase):
         self.assertLessEqual(score, 1.0)
         self.assertIsInstance(ms, int)
 
+    @patch("src.utils.model_context.hfAPI")
+    def test_model_index_scoring_frozen_context(self, HF):
+        # hfAPI payloads are frozen (tuples/mappingproxies); ScoreCard passes them via ModelContext
+        modelinfo = freeze({"data": {"model-index": [{"results": [{
+            "task": {"type": "text-classification"},
+            "dataset": {"name": "imdb"},
+            "metrics": [{"type": "accuracy", "value": 0.90}, {"type": "f1", "value": 0.88}],
+        }]}]}})
+        HF.return_value = FakeHF(modelinfo)
+        url = "https://huggingface.co/org/model"
+        m = PerformanceClaims(); m.llm = LLMResp("0.0")
+        score, _ = m.evaluate(url, ModelContext(url))
+        self.assertGreaterEqual(score, 0.85)
+        self.assertLessEqual(score, 1.0)
+
     @patch("src.classes.PerformanceClaims.hfAPI")
     def test_llm_fallback_0_5(self, HF):
         # No model-index -> triggers LLM fallback
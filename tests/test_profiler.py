@@ -0,0 +1,59 @@
+import io
+import os
+import pstats
+import tempfile
+import unittest
+
+from src.utils.profiler import AGGREGATE_FILE, RunProfiler
+
+
+def work(url, n):
+    return sum(i * i for i in range(n)), [bytearray(1024) for _ in range(100)]
+
+
+class TestRunProfiler(unittest.TestCase):
+    def test_per_url_and_aggregate_stats(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            profiler = RunProfiler(tmp, top=5)
+            scorer = profiler.wrap(work)
+            self.assertEqual(scorer("https://huggingface.co/org/model-a", 1000)[0], sum(i * i for i in range(1000)))
+            scorer("https://huggingface.co/org/model-b", 10)
+            out = io.StringIO()
+            profiler.finish(stream=out)
+
+            files = sorted(os.listdir(tmp))
+            self.assertEqual(files, ["00001-org_model-a.pstats", "00002-org_model-b.pstats", AGGREGATE_FILE])
+            stats = pstats.Stats(os.path.join(tmp, AGGREGATE_FILE))
+            calls = {func[2]: v[0] for func, v in stats.stats.items()}
+            self.assertEqual(calls["work"], 2)
+        self.assertIn("cumulative", out.getvalue())
+        self.assertIn("work", out.getvalue())
+
+    def test_profile_still_saves_when_scoring_fails(self):
+        def boom(url):
+            raise ValueError(url)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            profiler = RunProfiler(tmp)
+            with self.assertRaises(ValueError):
+                profiler.wrap(boom)("https://huggingface.co/org/bad")
+            self.assertEqual(os.listdir(tmp), ["00001-org_bad.pstats"])
+
+    def test_memory_report(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            profiler = RunProfiler(tmp, memory=True, top=3)
+            keep = profiler.wrap(work)("https://huggingface.co/org/model", 10)
+            out = io.StringIO()
+            profiler.finish(stream=out)
+        self.assertIn("tracemalloc: peak", out.getvalue())
+        self.assertIn("test_profiler.py", out.getvalue())
+        del keep
+
+    def test_profile_forces_one_job(self):
+        from src.run import parse_batch_args
+        args = parse_batch_args(["urls.txt", "--profile", "profiles", "--jobs", "8"])
+        self.assertEqual(args.jobs, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.utils import http_client, llm_cache, recorder
+from src.utils.llm_api import llmAPI
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Builds a model's combined LLM prompt from links found in its card and sends it
+# (record: to a patched session, replay: to the recording). Run in fresh interpreters
+# so each gets its own string hash seed.
+PROMPT_RUN = '''
+import sys
+from unittest.mock import MagicMock, patch
+from src.utils import recorder
+from src.utils.get_metadata import find_dataset_links, find_github_links
+from src.utils.llm_api import llmAPI
+from src.utils.llm_assessment import LLMAssessment
+
+mode, directory = sys.argv[1:]
+url = "https://huggingface.co/org/model"
+info = MagicMock(cardData={"repos": ["https://github.com/org/%s" % n for n in "abcdef"]}, datasets=["org/d1", "org/d2"])
+card = MagicMock(text="See https://github.com/org/g and https://huggingface.co/datasets/org/d3")
+links = find_github_links(url, info=info, card=card)
+datasets = find_dataset_links(url, info=info, card=card)
+body = MagicMock(status_code=200, content=b'{"bus_factor": 0.5}', text='{"bus_factor": 0.5}', headers={})
+if mode == "record":
+    recorder.start_recording(directory)
+else:
+    recorder.start_replay(directory)
+with patch("requests.Session.request", return_value=body):
+    LLMAssessment(llmAPI()).assess(url, ["bus_factor"], readme="\\n".join(datasets), github_links=links)
+recorder.stop()
+print(links[0])
+'''
+
+
+def _response(status=200, content=b"{}", headers=None):
+    r = MagicMock()
+    r.status_code = status
+    r.content = content
+    r.headers = headers or {"Content-Type": "application/json", "Content-Encoding": "gzip"}
+    return r
+
+
+class TestRecordReplay(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = os.path.join(self.tmp.name, "run1")
+        llm_cache.get_cache().clear()  # replayed LLM answers must come from the recording, not an earlier test
+        self.addCleanup(lambda: llm_cache.get_cache().clear())
+
+    def tearDown(self):
+        recorder.stop()
+        self.tmp.cleanup()
+
+    @patch("requests.Session.request")
+    def test_recorded_exchanges_replay_without_network(self, mreq):
+        mreq.side_effect = [
+            _response(content=b'{"id": "m"}'),
+            _response(content=b"\x89PNG\x00\xff"),
+            _response(status=404, content=b"missing"),
+        ]
+        recorder.start_recording(self.dir)
+        http_client.get("https://huggingface.co/api/models/m")
+        http_client.get("https://huggingface.co/m/logo.png")
+        http_client.get("https://api.github.com/repos/o/r/readme")
+        recorder.stop()
+
+        mreq.reset_mock()
+        mreq.side_effect = AssertionError("network used during replay")
+        self.assertEqual(len(recorder.start_replay(self.dir)), 3)
+        r = http_client.get("https://huggingface.co/api/models/m")
+        self.assertEqual(r.json(), {"id": "m"})
+        self.assertNotIn("Content-Encoding", r.headers)
+        self.assertEqual(http_client.get("https://huggingface.co/m/logo.png").content, b"\x89PNG\x00\xff")
+        self.assertEqual(http_client.get("https://api.github.com/repos/o/r/readme").status_code, 404)
+        mreq.assert_not_called()
+
+    def test_unrecorded_request_is_a_connection_error(self):
+        recorder.start_recording(self.dir)
+        recorder.stop()
+        recorder.start_replay(self.dir)
+        with self.assertRaises(recorder.ReplayMiss):
+            http_client.get("https://huggingface.co/api/models/unknown")
+
+    def test_post_bodies_are_part_of_the_key(self):
+        a = recorder.exchange_key("POST", "https://x/chat", {"messages": [1]})
+        b = recorder.exchange_key("POST", "https://x/chat", {"messages": [2]})
+        self.assertNotEqual(a, b)
+        self.assertEqual(recorder.exchange_key("get", "https://x/"), "GET https://x/")
+
+    @patch.dict(os.environ, {"GEN_AI_STUDIO_API_KEY": ""})
+    @patch("src.utils.llm_api.load_env")
+    def test_llm_replay_needs_no_api_key(self, _dotenv):
+        with open(os.path.join(self.tmp.name, recorder.EXCHANGES_FILE), "w"):
+            pass
+        recorder.start_replay(self.tmp.name)
+        with patch("src.utils.llm_api.http_client.post", return_value=MagicMock(status_code=200, text="0.5")) as mpost:
+            self.assertEqual(llmAPI().main("replayed prompt"), "0.5")
+        mpost.assert_called_once()
+
+    def test_replay_matches_across_hash_seeds(self):
+        def run(mode, seed):
+            env = dict(os.environ, PYTHONHASHSEED=str(seed), GEN_AI_STUDIO_API_KEY="test", LLM_CACHE="")
+            proc = subprocess.run([sys.executable, "-c", PROMPT_RUN, mode, self.dir], cwd=ROOT, env=env,
+                                  capture_output=True, text=True)
+            self.assertEqual(proc.returncode, 0, proc.stderr)
+            return proc.stdout.strip()
+
+        first = run("record", 1)
+        for seed in (2, 3, 4, 5):  # a ReplayMiss here means the prompt (link order) changed
+            self.assertEqual(run("replay", seed), first)
+
+
+if __name__ == "__main__":
+    unittest.main()
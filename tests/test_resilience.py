@@ -0,0 +1,199 @@
+import email.utils
+import unittest
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from src.utils import deadline, usage
+from src.utils.get_metadata import get_collaborators_github
+from src.utils.resilience import (CircuitBreaker, CircuitOpenError, Resilience, RetryPolicy, is_rate_limited,
+                                  retry_after)
+
+FAST = RetryPolicy(retries=2, backoff=0.01, failureThreshold=3, resetTimeout=60.0)
+
+
+def response(status, headers=None):
+    r = MagicMock()
+    r.status_code = status
+    r.headers = headers or {}
+    return r
+
+
+def attempts(*outcomes):
+    """An attempt(timeout) callable that raises or returns each outcome in turn."""
+    def attempt(timeout):
+        outcome = next(it)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+    it = iter(outcomes)
+    return MagicMock(side_effect=attempt)
+
+
+@patch("src.utils.resilience._sleep")
+class TestRetries(unittest.TestCase):
+    def setUp(self):
+        self.retrying = Resilience(policies={}, default=FAST)
+
+    def test_connection_errors_are_retried_and_charged_to_usage(self, msleep):
+        usage.start_usage()
+        self.addCleanup(usage.stop_usage)
+        attempt = attempts(requests.ConnectionError("reset"), response(503), response(200))
+        with usage.scope("https://huggingface.co/a/m") as record:
+            r = self.retrying.send("GET", "hf.example", attempt, 10)
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(attempt.call_count, 3)
+        self.assertEqual(attempt.call_args[0][0], (5.0, 10))  # connect capped, read as asked
+        self.assertEqual(record.total()[usage.RETRIES], 2)
+        self.assertEqual(msleep.call_count, 2)
+
+    def test_last_response_is_returned_when_retries_run_out(self, msleep):
+        attempt = attempts(response(500), response(500), response(500))
+        self.assertEqual(self.retrying.send("GET", "hf.example", attempt, 10).status_code, 500)
+        self.assertEqual(attempt.call_count, 3)
+
+    def test_post_read_timeout_is_not_retried(self, msleep):
+        attempt = attempts(requests.ReadTimeout("slow"))
+        with self.assertRaises(requests.ReadTimeout):
+            self.retrying.send("POST", "llm.example", attempt, 10)
+        self.assertEqual(attempt.call_count, 1)
+        msleep.assert_not_called()
+
+    def test_retry_after_replaces_backoff_unless_too_long(self, msleep):
+        attempt = attempts(response(429, {"Retry-After": "3"}), response(200))
+        self.assertEqual(self.retrying.send("GET", "api.example", attempt, 10).status_code, 200)
+        msleep.assert_called_once_with(3.0)
+
+        msleep.reset_mock()
+        limited = response(403, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "9999999999"})
+        self.assertIs(self.retrying.send("GET", "api.example", attempts(limited), 10), limited)
+        msleep.assert_not_called()
+
+    def test_client_errors_are_returned_at_once(self, msleep):
+        attempt = attempts(response(404))
+        self.assertEqual(self.retrying.send("GET", "hf.example", attempt, 10).status_code, 404)
+        msleep.assert_not_called()
+
+    def test_deadline_caps_timeouts_and_skips_late_retries(self, msleep):
+        slow = RetryPolicy(retries=2, backoff=1.0)
+        attempt = attempts(response(503))
+        with deadline.budget(200):
+            r = Resilience(policies={}, default=slow).send("GET", "hf.example", attempt, 30)
+        self.assertEqual(r.status_code, 503)  # a 0.5-1s backoff can't start before the deadline
+        msleep.assert_not_called()
+        connect, read = attempt.call_args[0][0]
+        self.assertLessEqual(max(connect, read), 0.2)
+
+    def test_open_circuit_fails_fast(self, msleep):
+        down = attempts(*[requests.ConnectionError("refused")] * 3)
+        with self.assertRaises(requests.ConnectionError):
+            self.retrying.send("GET", "down.example", down, 10)
+        never = attempts()
+        with self.assertRaises(CircuitOpenError):
+            self.retrying.send("GET", "down.example", never, 10)
+        never.assert_not_called()
+        # other hosts are unaffected
+        self.assertEqual(self.retrying.send("GET", "up.example", attempts(response(200)), 10).status_code, 200)
+
+    @patch("src.utils.resilience.time.monotonic")
+    def test_probe_failing_with_another_error_releases_the_circuit(self, mnow, msleep):
+        mnow.return_value = 100.0
+        down = attempts(*[requests.ConnectionError("refused")] * 3)
+        with self.assertRaises(requests.ConnectionError):
+            self.retrying.send("GET", "flaky.example", down, 10)
+        mnow.return_value = 200.0  # past resetTimeout: the next call is the probe
+        with self.assertRaises(requests.exceptions.ChunkedEncodingError):
+            self.retrying.send("GET", "flaky.example", attempts(requests.exceptions.ChunkedEncodingError("cut")), 10)
+        self.assertEqual(self.retrying.breaker_for("flaky.example").state, CircuitBreaker.OPEN)
+        # the next caller gets to probe, and a good answer closes the circuit
+        self.assertEqual(self.retrying.send("GET", "flaky.example", attempts(response(200)), 10).status_code, 200)
+        self.assertEqual(self.retrying.breaker_for("flaky.example").state, CircuitBreaker.CLOSED)
+
+    @patch("src.utils.resilience.time.monotonic")
+    def test_expired_deadline_does_not_take_the_half_open_probe(self, mnow, msleep):
+        mnow.return_value = 100.0
+        down = attempts(*[requests.ConnectionError("refused")] * 3)
+        with self.assertRaises(requests.ConnectionError):
+            self.retrying.send("GET", "slow.example", down, 10)
+        mnow.return_value = 200.0
+        never = attempts()
+        with patch("src.utils.deadline.remaining", return_value=-1.0):  # --deadline-ms already spent
+            with self.assertRaises(deadline.DeadlineExceeded):
+                self.retrying.send("GET", "slow.example", never, 10)
+        never.assert_not_called()
+        breaker = self.retrying.breaker_for("slow.example")
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        # a model with time left still gets to probe
+        self.assertEqual(self.retrying.send("GET", "slow.example", attempts(response(200)), 10).status_code, 200)
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    @patch("src.utils.resilience.time.monotonic")
+    def test_half_open_lets_one_probe_through(self, mnow):
+        mnow.return_value = 100.0
+        breaker = CircuitBreaker(failureThreshold=2, resetTimeout=30)
+        breaker.failure()
+        self.assertTrue(breaker.allow())
+        breaker.failure()
+        self.assertFalse(breaker.allow())
+
+        mnow.return_value = 131.0
+        self.assertTrue(breaker.allow())  # the probe
+        self.assertFalse(breaker.allow())  # everyone else still fails fast
+        breaker.failure()  # probe failed: open again for another resetTimeout
+        mnow.return_value = 140.0
+        self.assertFalse(breaker.allow())
+
+        mnow.return_value = 162.0
+        self.assertTrue(breaker.allow())
+        breaker.success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        self.assertTrue(breaker.allow())
+
+
+class TestRateLimitHeaders(unittest.TestCase):
+    def test_retry_after_forms(self):
+        now = 1_700_000_000.0
+        self.assertEqual(retry_after(response(429, {"Retry-After": "7"}), now), 7.0)
+        date = email.utils.formatdate(now + 20, usegmt=True)
+        self.assertAlmostEqual(retry_after(response(503, {"Retry-After": date}), now), 20.0, delta=1)
+        reset = {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(int(now + 45))}
+        self.assertEqual(retry_after(response(403, reset), now), 45.0)
+        self.assertIsNone(retry_after(response(403, {"X-RateLimit-Remaining": "12", "X-RateLimit-Reset": "1"}), now))
+        self.assertIsNone(retry_after(response(500)))
+
+    def test_github_403_is_only_a_rate_limit_when_the_headers_say_so(self):
+        self.assertTrue(is_rate_limited(response(403, {"X-RateLimit-Remaining": "0"})))
+        self.assertTrue(is_rate_limited(response(429)))
+        self.assertFalse(is_rate_limited(response(403)))
+
+
+class TestGithubPagination(unittest.TestCase):
+    def page(self, names, next_url=None):
+        r = response(200, {"Link": f'<{next_url}>; rel="next"' if next_url else ""})
+        r.json.return_value = [{"commit": {"author": {"name": n, "email": f"{n}@x.org"}}} for n in names]
+        return r
+
+    @patch("src.utils.get_metadata.logger.log")
+    @patch("src.utils.http_client.get")
+    def test_rate_limit_mid_pagination_keeps_partial_and_says_so(self, mget, mlog):
+        limited = response(403, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "9999999999"})
+        limited.text = "API rate limit exceeded"
+        mget.side_effect = [self.page(["alice", "bob"], "https://api.github.com/next?page=2"), limited]
+        avg, std, authors = get_collaborators_github("https://github.com/org/repo", n=4)
+        self.assertEqual(sum(authors.values()), 2)
+        self.assertEqual(mlog.call_args[1]["commits"], 2)
+
+    @patch("src.utils.http_client.get")
+    def test_rate_limit_on_first_page_raises(self, mget):
+        limited = response(403, {"X-RateLimit-Remaining": "0"})
+        limited.text = "API rate limit exceeded"
+        limited.raise_for_status.side_effect = requests.HTTPError("403", response=limited)
+        mget.return_value = limited
+        with self.assertRaises(requests.HTTPError):
+            get_collaborators_github("https://github.com/org/repo", n=4)
+
+
+if __name__ == "__main__":
+    unittest.main()
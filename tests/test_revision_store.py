@@ -0,0 +1,111 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.classes.ScoreCard import ScoreCard
+from src.utils import revision_store
+from src.utils.hf_api import METADATA_CACHE
+from src.utils.model_context import ModelContext
+from src.utils.revision_store import DATASET, GITHUB, METRIC_INPUTS, MODEL, RevisionStore
+from src.utils.stub_server import StubServer
+
+URL = "https://huggingface.co/acme/tiny-model"
+REVS = {MODEL: "m1", GITHUB: "g1", DATASET: "{}"}
+GITHUB_METRICS = {"bus_factor", "ramp_up_time", "code_quality", "dataset_and_code_score"}
+
+
+class TestRevisionStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = RevisionStore(os.path.join(self.tmp.name, "results.db"))
+        self.states = {name: {"metricScore": 0.5, "metricLatency": 7} for name in METRIC_INPUTS}
+        self.store.save("acme/m", REVS, self.states)
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_unchanged_inputs_reuse_every_metric(self):
+        self.assertEqual(self.store.lookup("acme/m", REVS), self.states)
+        self.assertEqual(self.store.lookup("acme/other", REVS), {})
+
+    def test_only_metrics_reading_a_moved_input_are_dropped(self):
+        found = self.store.lookup("acme/m", {**REVS, GITHUB: "g2"})
+        self.assertEqual(set(METRIC_INPUTS) - set(found), GITHUB_METRICS)
+        self.assertEqual(self.store.lookup("acme/m", {**REVS, MODEL: "m2"}), {})
+
+    def test_unknown_revision_is_never_reused(self):
+        found = self.store.lookup("acme/m", {**REVS, DATASET: None})
+        self.assertNotIn("dataset_quality", found)
+        self.assertIn("size_score", found)
+
+    def test_scorer_version_invalidates_results(self):
+        with patch.object(revision_store, "SCORER_VERSION", revision_store.SCORER_VERSION + 1):
+            self.assertEqual(self.store.lookup("acme/m", REVS), {})
+
+    @patch("src.utils.revision_store.get_github_head", return_value="a" * 40)
+    def test_github_revision_names_the_repo_it_is_for(self, mhead):
+        context = MagicMock(hf_info={"data": {"sha": "m1"}}, dataset_links=[])
+        context.github_links = ["https://github.com/org/zeta", "https://github.com/org/alpha"]
+        revs = revision_store.revisions(context)
+        mhead.assert_called_once_with("https://github.com/org/alpha")
+        self.assertEqual(json.loads(revs[GITHUB]), {"https://github.com/org/alpha": "a" * 40})
+
+        context.github_links = []
+        self.assertEqual(revision_store.revisions(context)[GITHUB], "")
+
+
+class TestIncrementalScoreCard(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = StubServer().start()
+        cls.env = patch.dict(os.environ, {**cls.server.env(), "GEN_AI_STUDIO_API_KEY": "stub",
+                                          "HTTP_CACHE": "", "LLM_CACHE_SIZE": "0"})
+        cls.env.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.env.stop()
+        cls.server.stop()
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = RevisionStore(os.path.join(self.tmp.name, "results.db"))
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def _score(self):
+        METADATA_CACHE.clear()
+        card = ScoreCard(URL, context=ModelContext(URL), store=self.store)
+        card.setTotalScore()
+        record = card.getRecord()
+        del record["net_score_latency"]
+        return card, record
+
+    def test_unchanged_model_is_served_from_the_store(self):
+        first, record = self._score()
+        self.assertEqual(first.reused, [])
+        llm_calls = self.server.counts["genai_chat"]
+        commit_pages = self.server.counts["github_commits"]
+
+        second, again = self._score()
+        self.assertEqual(set(second.reused), set(METRIC_INPUTS))
+        self.assertEqual(again, record)
+        self.assertEqual(self.server.counts["genai_chat"], llm_calls)
+        self.assertEqual(self.server.counts["github_commits"], commit_pages + 1)  # just the head check
+
+    def test_new_github_commits_rerun_only_the_github_metrics(self):
+        self._score()
+        with patch("src.utils.revision_store.get_github_head", return_value="f" * 40):
+            card, _ = self._score()
+        self.assertEqual(set(METRIC_INPUTS) - set(card.reused), GITHUB_METRICS)
+        inputs = dict(self.store._conn.execute("SELECT metric, inputs FROM metric_results").fetchall())
+        self.assertEqual(list(json.loads(json.loads(inputs["bus_factor"])[GITHUB]).values()), ["f" * 40])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.run import run_query
+from src.utils.score_store import ScoreStore, parse_time
+
+DAY = 24 * 3600
+T0 = parse_time("2025-01-01")
+
+
+def line(name, score):
+    return json.dumps({"name": name, "category": "MODEL", "net_score": score})
+
+
+class TestScoreStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "scores.db")
+        self.store = ScoreStore(self.path)
+        self.store.add("https://huggingface.co/a/bert-base", line("bert-base", 0.4), scoredAt=T0)
+        self.store.add("https://huggingface.co/a/bert-base", line("bert-base", 0.9), scoredAt=T0 + DAY)
+        self.store.add("https://huggingface.co/b/bert-large", line("bert-large", 0.7), scoredAt=T0)
+        self.store.add("https://huggingface.co/c/gpt2", line("gpt2", 0.5), scoredAt=T0 + 2 * DAY)
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def _names(self, rows):
+        return [(r["name"], r["net_score"]) for r in rows]
+
+    def test_top_k_uses_each_models_latest_record(self):
+        self.assertEqual(self._names(self.store.query(top=2)), [("bert-base", 0.9), ("bert-large", 0.7)])
+
+    def test_older_record_stored_later_keeps_the_newer_one_latest(self):
+        self.store.add("https://huggingface.co/a/bert-base", line("bert-base", 0.1), scoredAt=T0 - DAY)
+        self.assertEqual(self._names(self.store.query(name="bert-base")), [("bert-base", 0.9)])
+        self.assertEqual(len(list(self.store.history("https://huggingface.co/a/bert-base"))), 3)
+
+    def test_filters(self):
+        self.assertEqual(self._names(self.store.query(name="bert")), [("bert-base", 0.9), ("bert-large", 0.7)])
+        self.assertEqual(self._names(self.store.query(name="*-large")), [("bert-large", 0.7)])
+        self.assertEqual(self._names(self.store.query(minScore=0.5, maxScore=0.8)), [("bert-large", 0.7), ("gpt2", 0.5)])
+        self.assertEqual(self._names(self.store.query(since=T0 + DAY)), [("bert-base", 0.9), ("gpt2", 0.5)])
+
+    def test_history_is_oldest_first(self):
+        rows = list(self.store.history("https://huggingface.co/a/bert-base"))
+        self.assertEqual([r["net_score"] for r in rows], [0.4, 0.9])
+        self.assertEqual(rows[0]["scored_at"], "2025-01-01T00:00:00+00:00")
+        self.assertEqual([r["net_score"] for r in self.store.history("bert-base", limit=1)], [0.9])
+
+    def test_query_subcommand(self):
+        self.store.flush()
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out), patch.dict(os.environ, {"SCORE_DB": self.path}):
+            code = run_query(["--top", "1", "--since", "2025-01-02"])
+        self.assertEqual(code, 0)
+        (row,) = [json.loads(l) for l in out.getvalue().splitlines()]
+        self.assertEqual((row["name"], row["url"]), ("bert-base", "https://huggingface.co/a/bert-base"))
+
+
+if __name__ == "__main__":
+    unittest.main()
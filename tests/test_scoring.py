@@ -7,7 +7,7 @@ from src.classes.ScoreCard import ScoreCard
 
 
 class TestScoreCard(unittest.TestCase):
-    @patch("src.classes.ScoreCard.get_github_readme", return_value="# README")
+    @patch("src.classes.ScoreCard.ModelContext")
     @patch("src.classes.ScoreCard.AvailableDatasetAndCode")
     @patch("src.classes.ScoreCard.CodeQuality")
     @patch("src.classes.ScoreCard.PerformanceClaims")
@@ -26,9 +26,10 @@ class TestScoreCard(unittest.TestCase):
         mock_performance,
         mock_code_quality,
         mock_availability,
-        _mock_readme,
+        mock_context,
     ):
         url = "https://huggingface.co/org/model"
+        mock_context.return_value.github_readme = "# README"
 
         bus = MagicMock(metricScore=0.8, metricLatency=4)
         bus.getMetricScore.return_value = 0.8
@@ -48,7 +49,7 @@ class TestScoreCard(unittest.TestCase):
         size.getWeighting.return_value = 0.1
         size.getLatency.return_value = 3
 
-        def _size_side_effect(_url):
+        def _size_side_effect(_url, _context=None):
             size.metricScore = 0.7
             size.metricLatency = 3
 
@@ -0,0 +1,107 @@
+import os
+import unittest
+from unittest.mock import patch
+
+from src.utils import http_client
+from src.utils.get_metadata import getCollaborators, get_collaborators_github, get_github_readme
+from src.utils.hf_api import hfAPI, METADATA_CACHE
+from src.utils.llm_assessment import build_prompt, parse_answer
+from src.utils.llm_api import llmAPI
+from src.utils.resilience import Resilience
+from src.utils.stub_server import StubServer
+
+
+class TestStubServer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = StubServer(commitsPerRepo=45).start()
+        cls.env = patch.dict(os.environ, {**cls.server.env(), "GEN_AI_STUDIO_API_KEY": "stub",
+                                          "HTTP_CACHE": "", "LLM_CACHE_SIZE": "0"})
+        cls.env.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.env.stop()
+        cls.server.stop()
+
+    def setUp(self):
+        METADATA_CACHE.clear()
+
+    def test_hf_metadata_and_card_come_from_the_override(self):
+        api = hfAPI()
+        record = api.get_info("https://huggingface.co/acme/tiny-model", printCLI=False)
+        self.assertEqual(record["data"]["id"], "acme/tiny-model")
+        self.assertTrue(record["_requested"]["api_url"].startswith(self.server.base_url))
+        card = http_client.get(api.build_readme_url("acme/tiny-model"))
+        self.assertIn("https://github.com/acme/tiny-model", card.text)
+        ds = api.get_info("https://huggingface.co/datasets/acme/tiny-model-data", printCLI=False)
+        self.assertIn("likes", ds["data"])
+
+    def test_github_pagination_and_readme(self):
+        average, std, authors = get_collaborators_github("https://github.com/acme/tiny-model", n=45)
+        self.assertEqual(sum(authors.values()), 45)
+        with patch("src.utils.get_metadata.http_cache.get", wraps=http_client.get) as mget:
+            get_collaborators_github("https://github.com/acme/tiny-model", n=100)
+        self.assertEqual(mget.call_count, 1)  # 45 commits fit in one page of 100
+        readme = get_github_readme("https://huggingface.co/acme/tiny-model",
+                                   links=["https://github.com/acme/tiny-model"])
+        self.assertIn("pip install tiny-model", readme)
+
+    def test_single_segment_model_ids(self):
+        api = hfAPI()
+        record = api.get_info("https://huggingface.co/gpt2", printCLI=False)
+        self.assertEqual(record["data"]["id"], "gpt2")
+        card = http_client.get(api.build_readme_url("gpt2"))
+        self.assertEqual(card.status_code, 200)
+        self.assertIn("# gpt2", card.text)
+
+    def test_hf_commits_route(self):
+        average, std, authors = getCollaborators("https://huggingface.co/acme/small-model", n=100)
+        self.assertEqual(sum(authors.values()), 45)
+        r = http_client.get(f"{self.server.base_url}/api/models/gpt2/commits/main")
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(set(r.json()[0]), {"id", "title", "message", "authors", "date"})
+
+    def test_chat_completions_answer_combined_prompts(self):
+        questions = ["ramp_up_time", "license"]
+        response = llmAPI().main(build_prompt("https://huggingface.co/acme/tiny-model", questions))
+        self.assertEqual(set(parse_answer(response, questions)), set(questions))
+
+    def test_unknown_route_is_404(self):
+        self.assertEqual(http_client.get(f"{self.server.base_url}/nope").status_code, 404)
+
+
+class TestFaultInjection(unittest.TestCase):
+    def test_rate_limit_and_error_injection(self):
+        client = http_client.HttpClient(retrying=Resilience(retries=0))
+        with StubServer(rateLimitRate=1.0) as server:
+            r = client.request("GET", f"{server.base_url}/api/models/a/b")
+            self.assertEqual(r.status_code, 429)
+            self.assertEqual(r.headers["Retry-After"], "1")
+        with StubServer(errorRate=1.0) as server:
+            self.assertEqual(client.request("GET", f"{server.base_url}/api/models/a/b").status_code, 500)
+            self.assertEqual(server.counts["hf_model"], 1)
+        client.close()
+
+    @patch("src.utils.resilience._sleep")
+    def test_shared_client_retries_injected_faults(self, msleep):
+        with StubServer(rateLimitRate=1.0) as server:
+            self.assertEqual(http_client.get(f"{server.base_url}/api/models/a/b").status_code, 429)
+            self.assertEqual(server.counts["hf_model"], 3)  # first try + 2 retries
+        self.assertEqual([c.args[0] for c in msleep.call_args_list], [1.0, 1.0])  # the stub's Retry-After
+
+    def test_hf_commits_pagination(self):
+        with StubServer(commitsPerRepo=120) as server:
+            with patch.dict(os.environ, {**server.env(), "HTTP_CACHE": ""}):
+                _avg, _std, authors = getCollaborators("https://huggingface.co/acme/small-model", n=200)
+            self.assertEqual(sum(authors.values()), 120)
+            self.assertEqual(server.counts["hf_commits"], 3)  # pages of 50
+
+    def test_latency(self):
+        with StubServer(latency=0.05) as server:
+            r = http_client.get(f"{server.base_url}/api/models/a/b")
+            self.assertGreaterEqual(r.elapsed.total_seconds(), 0.05)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.utils import http_client, tracing
+from src.utils.metric_executor import MetricExecutor
+
+
+class TestTracing(unittest.TestCase):
+    def setUp(self):
+        self.tracer = tracing.start_tracing()
+
+    def tearDown(self):
+        tracing.stop_tracing()
+
+    def test_disabled_tracing_is_a_noop(self):
+        tracing.stop_tracing()
+        with tracing.span("x") as s:
+            s.set(a=1)
+        self.assertFalse(tracing.enabled())
+
+    def test_spans_nest_across_metric_threads(self):
+        def metric():
+            with tracing.span("GET host", "http"):
+                pass
+
+        with tracing.span("url", "url") as root:
+            MetricExecutor(4).run({
+                "a": tracing.traced("a", "metric", metric),
+                "b": tracing.traced("b", "metric", metric),
+            })
+        spans = {s.name: s for s in self.tracer.finished() if s.category != "http"}
+        http = [s for s in self.tracer.finished() if s.category == "http"]
+        self.assertEqual(spans["a"].parentId, root.spanId)
+        self.assertEqual(spans["b"].parentId, root.spanId)
+        self.assertEqual({s.parentId for s in http}, {spans["a"].spanId, spans["b"].spanId})
+        self.assertEqual({s.traceId for s in self.tracer.finished()}, {root.traceId})
+
+    def test_errors_are_recorded(self):
+        with self.assertRaises(ValueError):
+            with tracing.span("boom"):
+                raise ValueError()
+        self.assertEqual(self.tracer.finished()[0].attrs["error"], "ValueError")
+
+    @patch("requests.Session.request")
+    def test_http_span_attributes(self, mreq):
+        mreq.return_value = MagicMock(status_code=200, content=b"12345")
+        http_client.get("https://huggingface.co/api/models/a/b")
+        (span,) = self.tracer.finished()
+        self.assertEqual(span.category, "http")
+        self.assertEqual(span.attrs["host"], "huggingface.co")
+        self.assertEqual(span.attrs["status"], 200)
+        self.assertEqual(span.attrs["bytes"], 5)
+        self.assertFalse(span.attrs["cache_hit"])
+
+    def test_chrome_and_otel_exports(self):
+        with tracing.span("url", "url", url="u"):
+            with tracing.span("llm prompt", "llm", prompt_chars=10):
+                pass
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "trace.json")
+            tracing.write_trace(path)
+            with open(path) as f:
+                chrome = json.load(f)
+            with open(os.path.join(tmp, "trace.otel.json")) as f:
+                otel = json.load(f)
+
+        complete = [e for e in chrome["traceEvents"] if e["ph"] == "X"]
+        self.assertEqual([e["name"] for e in complete], ["url", "llm prompt"])
+        self.assertEqual(complete[1]["args"]["parent_id"], complete[0]["args"]["span_id"])
+        spans = otel["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        self.assertEqual(len(spans), 2)
+        self.assertEqual(spans[1]["parentSpanId"], spans[0]["spanId"])
+        self.assertEqual(len(spans[0]["traceId"]), 32)
+        self.assertIn({"key": "prompt_chars", "value": {"intValue": "10"}}, spans[1]["attributes"])
+
+
+if __name__ == "__main__":
+    unittest.main()
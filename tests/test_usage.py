@@ -0,0 +1,91 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.utils import http_client, usage
+from src.utils.llm_api import llmAPI
+from src.utils.metric_executor import MetricExecutor
+
+
+class TestUsage(unittest.TestCase):
+    def tearDown(self):
+        usage.stop_usage()
+
+    def test_off_by_default(self):
+        with usage.scope("u") as record:
+            usage.add(usage.HF_REQUESTS)
+        self.assertIsNone(record)
+
+    def test_counts_are_charged_per_metric_across_threads(self):
+        usage.start_usage()
+
+        def fetch():
+            usage.add(usage.GITHUB_REQUESTS)
+            usage.add(usage.BYTES_DOWNLOADED, 100)
+
+        with usage.scope("https://huggingface.co/o/m") as record:
+            usage.add(usage.HF_REQUESTS)
+            MetricExecutor(4).run({
+                "bus_factor": usage.attributed("bus_factor", fetch),
+                "code_quality": usage.attributed("code_quality", fetch),
+            })
+        result = record.to_dict()
+        self.assertEqual(result["metrics"]["setup"], {"hf_requests": 1})
+        self.assertEqual(result["metrics"]["bus_factor"], {"bytes_downloaded": 100, "github_requests": 1})
+        self.assertEqual(result["total"]["github_requests"], 2)
+        self.assertEqual(result["total"]["bytes_downloaded"], 200)
+
+    def test_service_classification(self):
+        self.assertEqual(usage.service_for("https://huggingface.co/api/models/a/b"), usage.HF_REQUESTS)
+        self.assertEqual(usage.service_for("https://api.github.com/repos/a/b"), usage.GITHUB_REQUESTS)
+        self.assertEqual(usage.service_for("https://genai.rcac.purdue.edu/api/chat/completions"), usage.LLM_REQUESTS)
+        self.assertEqual(usage.service_for("https://example.com/"), usage.OTHER_REQUESTS)
+        with patch.dict(os.environ, {"HF_ENDPOINT": "http://127.0.0.1:9", "GITHUB_API_URL": "http://127.0.0.1:9/github"}):
+            self.assertEqual(usage.service_for("http://127.0.0.1:9/github/repos/a/b"), usage.GITHUB_REQUESTS)
+            self.assertEqual(usage.service_for("http://127.0.0.1:9/api/models/a/b"), usage.HF_REQUESTS)
+
+    @patch("requests.Session.request")
+    def test_http_requests_and_bytes(self, mreq):
+        mreq.return_value = MagicMock(status_code=200, content=b"x" * 42)
+        usage.start_usage()
+        with usage.scope("u") as record:
+            http_client.get("https://huggingface.co/api/models/a/b")
+        self.assertEqual(record.to_dict()["total"], {"bytes_downloaded": 42, "hf_requests": 1})
+
+    @patch.dict(os.environ, {"GEN_AI_STUDIO_API_KEY": "k", "LLM_CACHE_SIZE": "16"})
+    @patch("src.utils.llm_api.load_env")
+    def test_llm_chars_tokens_and_cache(self, _dotenv):
+        from src.utils import llm_cache
+        llm_cache.get_cache().clear()
+        body = json.dumps({"choices": [{"message": {"content": "0.5"}}],
+                           "usage": {"prompt_tokens": 7, "completion_tokens": 2}})
+        usage.start_usage()
+        with patch("src.utils.llm_api.http_client.post", return_value=MagicMock(status_code=200, text=body)):
+            with usage.scope("u") as record:
+                llmAPI().main("a prompt for usage")
+                llmAPI().main("a prompt for usage")
+        total = record.to_dict()["total"]
+        self.assertEqual(total["llm_cache_misses"], 1)
+        self.assertEqual(total["llm_cache_hits"], 1)
+        self.assertEqual(total["prompt_tokens"], 7)
+        self.assertEqual(total["completion_tokens"], 2)
+        self.assertEqual(total["prompt_chars"], 2 * len("a prompt for usage"))
+
+    def test_stats_file_gets_one_line_per_url(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "stats.ndjson")
+            usage.start_usage(statsPath=path)
+            for url in ("a", "b"):
+                with usage.scope(url):
+                    usage.add(usage.RETRIES)
+            usage.stop_usage()
+            with open(path) as f:
+                lines = [json.loads(line) for line in f]
+        self.assertEqual([line["url"] for line in lines], ["a", "b"])
+        self.assertEqual(lines[0]["total"], {"retries": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()